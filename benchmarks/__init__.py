@@ -0,0 +1,5 @@
+"""
+Reproducible MarkHub benchmarks: markdown rendering, publishing and views against a fake GitHub server.
+
+Run with `python -m benchmarks run --output results.json`.
+"""
@@ -0,0 +1,225 @@
+"""
+Run MarkHub benchmarks and write JSON results, or compare two result files.
+
+    python -m benchmarks run --output results.json
+    python -m benchmarks compare baseline.json results.json --threshold 0.1
+    python -m benchmarks importtime --case setup
+    python -m benchmarks differential docs/
+    python -m benchmarks sanitizer
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List
+
+from .startup import CASES
+
+SUITES = ('render', 'publish', 'views', 'pages', 'startup')
+BASE_DIR = Path(__file__).resolve().parent.parent
+STARTUP_REPEAT = 5  # fresh interpreters per startup case
+
+
+def _git_commit() -> Dict[str, object]:
+    """Get the benchmarked commit"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=BASE_DIR, capture_output=True, text=True).stdout
+        status = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=BASE_DIR,
+                                capture_output=True, text=True).stdout
+        return {'commit': commit.strip(), 'dirty': bool(status.strip())}
+    except OSError:
+        return {'commit': None, 'dirty': None}
+
+
+def run(args: argparse.Namespace) -> int:
+    """Run benchmark suites with the fake GitHub server and an isolated test database"""
+    from .corpus import get_corpus, get_corpus_repository
+    from .fake_github import FakeGitHub, FakeGitHubOptions, write_git_repository
+
+    corpus = get_corpus()
+    options = FakeGitHubOptions(latency=args.latency)
+    repository = get_corpus_repository()
+    fake = FakeGitHub([repository], options=options).start()
+    if args.backend == 'mirror':
+        # the mirror fetches from a local bare repository with the same branches
+        mirrors = Path(tempfile.mkdtemp())
+        write_git_repository(repository, mirrors / 'origin')
+        os.environ.update({
+            'MIRROR_DIR': str(mirrors / 'mirrors'),
+            'MIRROR_CLONE_URL': f'file://{mirrors}/origin/{{owner}}/{{repo}}.git',
+        })
+    os.environ.update({
+        'DJANGO_SETTINGS_MODULE': 'markhub.settings',
+        'DEBUG': 'False',
+        'ALLOWED_HOSTS': 'testserver',
+        'CACHE_URL': 'locmemcache://',
+        'GITHUB_API_URL': fake.url,
+        'GITHUB_RAW_URL': f'{fake.url}/raw',
+        'REPOSITORY_BACKEND': args.backend,
+    })
+    os.environ.setdefault('SECRET_KEY', 'benchmarks')
+    os.environ.setdefault('IMGUR_CLIENT_ID', 'benchmarks')
+    os.environ.setdefault('IMGUR_API_KEY', 'benchmarks')
+    os.environ.setdefault('SHARE_CLIENT_BURST', '1000000')  # all share page requests come from one client
+    sys.path.insert(0, str(BASE_DIR))
+
+    import django
+    django.setup()
+    from django.db import connection
+
+    database = Path(tempfile.mkdtemp()) / 'benchmarks.sqlite3'
+    connection.settings_dict['TEST']['NAME'] = str(database)
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+
+    results = {}
+    try:
+        if 'render' in args.suite:
+            from . import render
+            results['render'] = render.run(corpus, args.repeat)
+        if 'publish' in args.suite:
+            from . import publish
+            results['publish'] = publish.run(corpus['mixed-medium.md'], args.repeat)
+        if 'views' in args.suite:
+            from . import views
+            results['views'] = views.run(fake, 'mixed-medium.md', args.repeat)
+        if 'pages' in args.suite:
+            from . import pages
+            results['pages'] = pages.run('mixed-medium.md')
+        if 'startup' in args.suite:
+            from . import startup
+            results['startup'] = startup.run(min(args.repeat, STARTUP_REPEAT))
+    finally:
+        connection.creation.destroy_test_db(str(database), verbosity=0)
+        fake.stop()
+
+    output = {
+        'meta': {
+            **_git_commit(),
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'platform': platform.platform(),
+            'repeat': args.repeat,
+            'github_latency': args.latency,
+            'repository_backend': args.backend,
+        },
+        'results': results,
+    }
+    text = json.dumps(output, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + '\n')
+    else:
+        print(text)
+    return 0
+
+
+def compare(args: argparse.Namespace) -> int:
+    """Compare median times of two result files, non-zero exit code on regressions"""
+    baseline, current = (json.loads(Path(path).read_text())['results'] for path in (args.baseline, args.current))
+    regressions: List[str] = []
+    for suite, items in current.items():
+        base_items = {item['name']: item for item in baseline.get(suite, [])}
+        for item in items:
+            if not (base := base_items.get(item['name'])):
+                continue
+            change = item['median_ms'] / base['median_ms'] - 1 if base['median_ms'] else 0.0
+            line = f"{suite:8} {item['name']:32} {base['median_ms']:10.2f} -> {item['median_ms']:10.2f} ms {change:+7.1%}"
+            if change > args.threshold:
+                line += '  REGRESSION'
+                regressions.append(line)
+            print(line)
+    return 1 if regressions else 0
+
+
+def importtime(args: argparse.Namespace) -> int:
+    """Print `-X importtime` breakdown of a startup case"""
+    from .startup import importtime as get_importtime
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'markhub.settings')
+    report = get_importtime(CASES[args.case])
+    print(f"{args.case}: {report['import_ms']:.1f} ms in imports of {report['modules']} modules")
+    print('heavy packages: ' + (', '.join(f'{name} {ms:.1f} ms' for name, ms in report['heavy_packages'].items())
+                                or 'not imported'))
+    for name, ms in report['top_imports']:
+        print(f'{ms:10.1f} ms  {name}')
+    return 0
+
+
+def differential(args: argparse.Namespace) -> int:
+    """Check adaptive markdown pipelines render like all extensions and the heading extractor finds
+    the rendered anchors, non-zero exit code on differences"""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'markhub.settings')
+    sys.path.insert(0, str(BASE_DIR))
+    import django
+    django.setup()
+    from .differential import HEADING_SAMPLES, check, check_headings, get_documents
+
+    documents = get_documents(args.paths)
+    differences = check(documents)
+    for diff in differences:
+        print(diff)
+    print(f'{len(documents)} documents, {len(differences)} differ')
+    heading_differences = check_headings(documents)
+    for diff in heading_differences:
+        print(diff)
+    print(f'{len(documents) + len(HEADING_SAMPLES)} documents, {len(heading_differences)} with other heading anchors')
+    return 1 if differences or heading_differences else 0
+
+
+def sanitizer(args: argparse.Namespace) -> int:
+    """Check payloads render without script injection, non-zero exit code on unsafe markup"""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'markhub.settings')
+    os.environ.setdefault('MATH_RENDERER', 'mathml')
+    sys.path.insert(0, str(BASE_DIR))
+    import django
+    django.setup()
+    from .sanitizer import PAYLOADS, check
+
+    failures = check()
+    for failure in failures:
+        print(failure)
+    print(f'{len(PAYLOADS)} payloads, {len(failures)} render unsafe markup')
+    return 1 if failures else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+    run_parser = commands.add_parser('run', help='run benchmark suites')
+    run_parser.add_argument('--suite', action='append', choices=SUITES, help='suite to run (all by default)')
+    run_parser.add_argument('--repeat', type=int, default=20, help='measured runs per case')
+    run_parser.add_argument('--latency', type=float, default=0.0,
+                            help='fake GitHub latency per request in seconds')
+    run_parser.add_argument('--backend', choices=('api', 'mirror'), default='api',
+                            help='REPOSITORY_BACKEND of the views suite (mirror requires dulwich)')
+    run_parser.add_argument('--output', help='JSON results file (stdout by default)')
+    compare_parser = commands.add_parser('compare', help='compare two JSON result files')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float, default=0.1, help='allowed median slowdown share')
+    importtime_parser = commands.add_parser('importtime', help='print -X importtime breakdown of a startup case')
+    importtime_parser.add_argument('--case', choices=CASES, default='setup')
+    differential_parser = commands.add_parser('differential',
+                                              help='check adaptive pipelines and heading anchors against full renders')
+    differential_parser.add_argument('paths', nargs='*', help='extra markdown files and directories')
+    commands.add_parser('sanitizer', help='check payloads render without script injection')
+    args = parser.parse_args()
+    if args.command == 'run':
+        args.suite = args.suite or list(SUITES)
+        return run(args)
+    if args.command == 'importtime':
+        return importtime(args)
+    if args.command == 'differential':
+        return differential(args)
+    if args.command == 'sanitizer':
+        return sanitizer(args)
+    return compare(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
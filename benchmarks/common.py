@@ -0,0 +1,44 @@
+"""
+Timing helpers shared by benchmark suites.
+"""
+import statistics
+from time import perf_counter
+from typing import Any, Callable, Dict, List
+
+
+def measure(func: Callable[[], Any], repeat: int) -> List[float]:
+    """Measure function calls
+
+    Args:
+        func (Callable): _measured function_
+        repeat (int): _number of calls_
+
+    Returns:
+        List[float]: _call durations in seconds_
+    """
+    times = []
+    for _ in range(repeat):
+        started = perf_counter()
+        func()
+        times.append(perf_counter() - started)
+    return times
+
+
+def summarize(times: List[float]) -> Dict[str, float]:
+    """Summarize durations in milliseconds
+
+    Args:
+        times (List[float]): _durations in seconds_
+
+    Returns:
+        Dict[str, float]: _runs, mean, median, p95, min and max in milliseconds_
+    """
+    ordered = sorted(times)
+    return {
+        'runs': len(ordered),
+        'mean_ms': round(statistics.fmean(ordered) * 1000, 3),
+        'median_ms': round(statistics.median(ordered) * 1000, 3),
+        'p95_ms': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 3),
+        'min_ms': round(ordered[0] * 1000, 3),
+        'max_ms': round(ordered[-1] * 1000, 3),
+    }
@@ -0,0 +1,169 @@
+"""
+Deterministic corpus of README-like markdown documents of different sizes and features.
+"""
+import random
+from typing import Callable, Dict, List
+
+SIZES = {'small': 2_000, 'medium': 20_000, 'large': 200_000}  # approximate document size in characters
+SEED = 2023
+
+WORDS = (
+    'markdown repository branch commit render cache github file content service request response '
+    'template view session token user publish share table code math emoji heading link image list '
+    'install configure deploy update release version feature option setting default example usage'
+).split()
+EMOJI = ('smile', 'rocket', 'tada', 'warning', 'bug', 'sparkles', 'heart', 'thumbsup', 'fire', 'memo')
+LANGUAGES = {
+    'python': 'def {name}({arg}):\n    """{words}"""\n    return [{arg} * i for i in range({number})]\n',
+    'javascript': 'function {name}({arg}) {{\n  // {words}\n  return Array.from({{length: {number}}}, (_, i) => {arg} * i);\n}}\n',
+    'bash': '# {words}\nfor i in $(seq 1 {number}); do\n  echo "{name} {arg} $i"\ndone\n',
+    'json': '{{\n  "{name}": {number},\n  "{arg}": "{words}"\n}}\n',
+}
+
+
+def _words(rng: random.Random, count: int) -> str:
+    """Get random words"""
+    return ' '.join(rng.choice(WORDS) for _ in range(count))
+
+
+def _paragraph(rng: random.Random) -> str:
+    """Paragraph with inline markup"""
+    words = _words(rng, rng.randint(30, 80)).split()
+    words[rng.randrange(len(words))] = f'**{rng.choice(WORDS)}**'
+    words[rng.randrange(len(words))] = f'`{rng.choice(WORDS)}()`'
+    words[rng.randrange(len(words))] = f'[{rng.choice(WORDS)}](https://example.com/{rng.choice(WORDS)})'
+    return ' '.join(words).capitalize() + '.\n'
+
+
+def _table(rng: random.Random) -> str:
+    """Table with 5 columns"""
+    header = [rng.choice(WORDS).capitalize() for _ in range(5)]
+    rows = ['| ' + ' | '.join(header) + ' |', '|' + '---|' * 5]
+    rows += ['| ' + ' | '.join(_words(rng, rng.randint(1, 4)) for _ in range(5)) + ' |' for _ in range(rng.randint(5, 15))]
+    return '\n'.join(rows) + '\n'
+
+
+def _code(rng: random.Random) -> str:
+    """Fenced code block"""
+    language = rng.choice(list(LANGUAGES))
+    code = LANGUAGES[language].format(
+        name=f'{rng.choice(WORDS)}_{rng.randint(1, 9999)}', arg=rng.choice(WORDS),
+        words=_words(rng, 6), number=rng.randint(2, 100)
+    )
+    return f'```{language}\n{code}```\n'
+
+
+def _math(rng: random.Random) -> str:
+    """Paragraph with inline math and a math block"""
+    a, b = rng.randint(2, 9), rng.randint(2, 9)
+    return (f'{_words(rng, 12).capitalize()} $x^{a} + y_{b}$ {_words(rng, 8)} $\\frac{{{a}}}{{{b}}}$.\n\n'
+            f'$$\n\\sum_{{i=1}}^{{n}} i^{a} = \\int_0^{b} f(x)\\,dx\n$$\n')
+
+
+def _emoji(rng: random.Random) -> str:
+    """Paragraph with emoji shortcodes"""
+    words = _words(rng, rng.randint(20, 40)).split()
+    for _ in range(rng.randint(3, 8)):
+        words.insert(rng.randrange(len(words)), f':{rng.choice(EMOJI)}:')
+    return ' '.join(words).capitalize() + '\n'
+
+
+# One sample per markdown extension and near misses of their syntax, for the adaptive pipeline differential check
+SYNTAX_SAMPLES = {
+    'meta': 'title: Syntax samples\nauthor: bench\n\n# Title\n',
+    'admonition': '!!! note "Note title"\n    Admonition with **bold** text.\n',
+    'details': '??? tip "Details"\n    Collapsed details.\n\n???+ warning\n    Open details.\n',
+    'tabbed': '=== "Python"\n    ```python\n    print(1)\n    ```\n\n=== "Shell"\n    Text tab.\n',
+    'critic': 'Critic {++insert++}, {--delete--}, {~~old~>new~~}, {==mark==}{>>comment<<}.\n',
+    'inline-marks': 'H~2~O, x^2^, ^^insert^^, ~~delete~~, ==mark==, a == b, ~ home, 2 ^ 3, a ~= b.\n',
+    'keys': 'Press ++ctrl+alt+delete++ or ++"custom"++, not \\\\+ or a+b.\n',
+    'emoji': 'Emoji :smile: :+1: :rocket:, times 10:30:45 and :not_an_emoji:.\n',
+    'math': 'Inline $x^2$ and \\(y_1\\), price $5 or $6, escaped \\$7.\n\n$$\na^2 + b^2\n$$\n\n\\[\nz\n\\]\n\n'
+            '\\begin{align}\nq &= 1\n\\end{align}\n',
+    'escapes': 'Escaped \\*stars\\*, \\_under\\_, \\@at, \\^caret, \\q and a backslash \\ alone.\n',
+    'magiclink': 'Visit https://github.com/facelessuser/pymdown-extensions, www.example.com, <https://example.org>,\n'
+                 'mail bench@example.com, <bench@example.org>, @facelessuser, facelessuser/pymdown-extensions#1,\n'
+                 'issue #12 and commit 3f6b07a8eb4b0c8d8c0f2c9a1d5c6b7e8f9a0b1c.\n',
+    'smartsymbols': 'Symbols (c) (r) (tm) +/- =/= c/o --> <-- <--> 1/2 3/4, 1st 2nd 3rd 4th 11th 21st.\n',
+    'tasklist': '- [ ] todo\n- [x] done\n- [X] done too\n- plain item\n',
+    'video': 'https://www.youtube.com/watch?v=dQw4w9WgXcQ\n\nhttps://vimeo.com/123456\n',
+    'extra': 'Term\n:   Definition\n\nFootnote[^1] and HTML abbr.\n\n*[HTML]: Hyper Text Markup Language\n\n'
+             '[^1]: The footnote.\n\n| a | b |\n|---|---|\n| 1 | 2 |\n\n{: .class }\n\n<div markdown="1">*html*</div>\n',
+    'code': '```python\nx = "$5" ^ 2 ~ 3 == 4  # :smile: @user https://example.com\n```\n\n    indented = True\n\n'
+            'Inline `code` and `#!python print(1)` and ``double `tick` ``.\n',
+    'plain': 'Plain "quoted" text -- with dashes... and a\nline break.\n\n#Heading without space\n\n<!-- comment -->\n',
+}
+
+
+def _syntax(rng: random.Random) -> str:
+    """Samples of several markdown extensions"""
+    return '\n'.join(rng.sample([sample for name, sample in SYNTAX_SAMPLES.items() if name != 'meta'], 4))
+
+
+def _list(rng: random.Random) -> str:
+    """Bullet list"""
+    return ''.join(f'- {_words(rng, rng.randint(3, 10))}\n' for _ in range(rng.randint(3, 8)))
+
+
+BLOCKS: Dict[str, List[Callable[[random.Random], str]]] = {
+    'plain': [_paragraph, _paragraph, _list],
+    'tables': [_paragraph, _table],
+    'code': [_paragraph, _code, _code],
+    'math': [_paragraph, _math],
+    'emoji': [_paragraph, _emoji],
+    'mixed': [_paragraph, _list, _table, _code, _math, _emoji],
+    'syntax': [_paragraph, _syntax],
+}
+
+
+def generate_document(feature: str, size: int, seed: int = SEED) -> str:
+    """Generate markdown document with sections of the feature blocks
+
+    Args:
+        feature (str): _BLOCKS key_
+        size (int): _approximate document size in characters_
+        seed (int): _random seed_
+
+    Returns:
+        str: _markdown document_
+    """
+    rng = random.Random(f'{seed}-{feature}-{size}')
+    parts = [f'# {feature.capitalize()} benchmark\n', _paragraph(rng)]
+    length = sum(len(part) for part in parts)
+    while length < size:
+        section = [f'## {_words(rng, 3).capitalize()}\n'] + [block(rng) for block in BLOCKS[feature]]
+        parts += section
+        length += sum(len(part) for part in section)
+    return '\n'.join(parts)
+
+
+def get_corpus(seed: int = SEED) -> Dict[str, str]:
+    """Get corpus documents of all features and sizes
+
+    Args:
+        seed (int): _random seed_
+
+    Returns:
+        Dict[str, str]: _file name like code-medium.md: markdown content_
+    """
+    return {
+        f'{feature}-{size_name}.md': generate_document(feature, size, seed)
+        for feature in BLOCKS
+        for size_name, size in SIZES.items()
+    }
+
+
+def get_corpus_repository(seed: int = SEED) -> 'FakeRepository':
+    """Get the bench/docs fake GitHub repository with the corpus documents, README.md is mixed-small.md
+
+    Args:
+        seed (int): _random seed_
+
+    Returns:
+        FakeRepository: _repository with one main branch_
+    """
+    from .fake_github import FakeRepository
+
+    files = {name: content.encode('UTF-8') for name, content in get_corpus(seed).items()}
+    files['README.md'] = files['mixed-small.md']
+    return FakeRepository.from_files('bench', 'docs', files)
@@ -0,0 +1,123 @@
+"""
+Differential check of adaptive markdown pipelines: documents render the same as with a new pipeline
+of all MARTOR_MARKDOWN_EXTENSIONS, and the heading extractor finds the anchors of the rendered toc.
+
+    python -m benchmarks differential docs/ README.md
+"""
+from difflib import unified_diff
+from itertools import combinations
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+from markdown import Markdown
+
+from markhub.services.headings import TOC_MAX_LEVEL, TOC_MIN_LEVEL, extract_headings
+from markhub.services.markdown_render import get_extensions, markdownify
+from markhub.services.math_render import prerender_math
+from markhub.settings import MARTOR_MARKDOWN_EXTENSION_CONFIGS, MARTOR_MARKDOWN_EXTENSIONS
+
+from .corpus import SYNTAX_SAMPLES, get_corpus
+
+DIFF_LINES = 20
+# headings in containers, with inline markup, attr_list ids and duplicates, checked with the documents
+HEADING_SAMPLES = {
+    'emoji': '# Hello :smile:\n## :+1: Done :octocat:',
+    'code': '# Use `<div>` tag\n## ``a ` b`` and `&amp;`',
+    'html': '# A <b>raw</b> & co &copy; &amp;',
+    'attr-list': '# H {: #custom }\n# x {: .cls #id2 }\n## custom\n## H\n## Title {: .cls }',
+    'links': '# [link](https://example.com) and ![image](a.png)\n## <https://example.com> [ref][x]\n\n[x]: a.md',
+    'blockquote': '> # Quoted\n> > ## Deep\n>\n> Setext\n> ------',
+    'setext': 'Title\n=====\nNext\n----\nParagraph\nnot a heading\n---\n\n- item\nnot a heading\n---',
+    'list': '- # Listed\n1. ## Numbered\n- item\n\n    ### In item\n\n        ### Code in item',
+    'blocks': '!!! note "Title"\n    # In admonition\n\n??? tip\n    ## In details\n\n=== "Tab"\n    ## In tab',
+    'smarty': '# 1 -- 2 "quotes" ... it\'s\n## <<angled>>',
+    'duplicates': '# Same\n# Same\nSame\n====\n# Same_1',
+    'fences': '```\n# In code\n```\n\n~~~~\n# In code\n~~~\n~~~~\n\n```\n# After an unclosed fence',
+    'rules': '> # Quoted setext\n---\n- Listed setext\n---\n  # Not a heading\n\n    # Code\n# After code',
+    'tight-list': '- item\n    ## Inline text\n- # Listed\n    ## In item\n\n    ## In loose item',
+}
+
+
+def get_documents(paths: Iterable[str]) -> Dict[str, str]:
+    """Get the corpus, syntax samples alone and in pairs, and markdown files of the paths
+
+    Args:
+        paths (Iterable[str]): _markdown files and directories searched for *.md_
+
+    Returns:
+        Dict[str, str]: _document name: markdown content_
+    """
+    documents = dict(get_corpus())
+    documents.update({f'sample:{name}': sample for name, sample in SYNTAX_SAMPLES.items()})
+    documents.update({
+        f'sample:{first}+{second}': f'{SYNTAX_SAMPLES[first]}\n{SYNTAX_SAMPLES[second]}'
+        for first, second in combinations(SYNTAX_SAMPLES, 2)
+    })
+    for path in map(Path, paths):
+        for file in sorted(path.rglob('*.md')) if path.is_dir() else [path]:
+            documents[str(file)] = file.read_text(encoding='UTF-8')
+    return documents
+
+
+def _reference_markdown() -> Markdown:
+    """New Markdown object of all extensions, as used before adaptive pipelines"""
+    return Markdown(
+        extensions=MARTOR_MARKDOWN_EXTENSIONS,
+        extension_configs=MARTOR_MARKDOWN_EXTENSION_CONFIGS,
+        output_format='html5',
+    )
+
+
+def render_reference(content: str) -> tuple:
+    """Render with a new Markdown object of all extensions"""
+    markdown = _reference_markdown()
+    return prerender_math(markdown.convert(content)), markdown.toc
+
+
+def _toc_anchors(tokens: List[dict]) -> List[Tuple[int, str]]:
+    """Flatten nested toc tokens to levels and anchors"""
+    return [anchor for token in tokens for anchor in [(token['level'], token['id']), *_toc_anchors(token['children'])]]
+
+
+def check(documents: Dict[str, str]) -> List[str]:
+    """Compare adaptive and reference renders, documents are rendered twice in opposite orders,
+    so state left in reused pipelines shows up as differences
+
+    Args:
+        documents (Dict[str, str]): _document name: markdown content_
+
+    Returns:
+        List[str]: _differences as unified diffs_
+    """
+    references = {name: render_reference(content) for name, content in documents.items()}
+    differences = []
+    for name in [*documents, *reversed(documents)]:
+        rendered = markdownify(documents[name], adaptive=True)
+        if rendered != references[name] and not any(diff.startswith(f'--- {name}\n') for diff in differences):
+            skipped = sorted(set(MARTOR_MARKDOWN_EXTENSIONS) - set(get_extensions(documents[name])))
+            diff = unified_diff('\n'.join(references[name]).splitlines(), '\n'.join(rendered).splitlines(),
+                                name, f'{name} without {", ".join(skipped)}', lineterm='')
+            differences.append('\n'.join(list(diff)[:DIFF_LINES]) + '\n')
+    return differences
+
+
+def check_headings(documents: Dict[str, str]) -> List[str]:
+    """Compare anchors of the heading extractor in the toc depth with anchors of the rendered toc
+
+    Args:
+        documents (Dict[str, str]): _document name: markdown content_
+
+    Returns:
+        List[str]: _documents with different anchors and the anchors_
+    """
+    differences = []
+    samples = {f'headings:{name}': sample for name, sample in HEADING_SAMPLES.items()}
+    for name, content in {**documents, **samples}.items():
+        markdown = _reference_markdown()
+        markdown.convert(content)
+        rendered = _toc_anchors(markdown.toc_tokens)
+        extracted = [(heading.level, heading.id) for heading in extract_headings(content)
+                     if TOC_MIN_LEVEL <= heading.level <= TOC_MAX_LEVEL]
+        if rendered != extracted:
+            differences.append(f'{name}\n  rendered:  {rendered}\n  extracted: {extracted}\n')
+    return differences
@@ -0,0 +1,505 @@
+"""
+Fake GitHub API and raw content server for benchmarks, load testing and offline development.
+
+Serves repositories with the REST API subset MarkHub uses (repositories, branches, commits,
+contents, git trees and blobs, rate limit), raw files are served under /raw. Responses carry
+rate limit headers, latency and server errors can be injected.
+
+Repositories come from the benchmark corpus or from on-disk fixtures laid out as
+`<fixtures>/<owner>/<repo>/<branch>/<files>` with an optional `<fixtures>/<owner>/<repo>/repo.json`
+(`{"default_branch": "main", "private": false}`).
+
+    python -m benchmarks.fake_github --fixtures fixtures --port 8765 --latency 0.05 --error-rate 0.01
+
+Point MarkHub to it with GITHUB_API_URL=http://127.0.0.1:8765 and GITHUB_RAW_URL=http://127.0.0.1:8765/raw.
+"""
+import argparse
+import calendar
+import json
+import random
+import threading
+import time
+from base64 import b64encode
+from collections import Counter
+from dataclasses import dataclass, field
+from hashlib import sha1
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path, PurePosixPath
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlencode, urlsplit
+
+COMMIT_DATE = '2023-02-15T10:00:00Z'
+REPO_META_FILE = 'repo.json'
+RATE_LIMIT_WINDOW = 3600
+PAGINATED_ENDPOINTS = ('/user/repos', '/repos/{owner}/{repo}/branches', '/repos/{owner}/{repo}/commits')
+
+
+def git_sha(kind: str, content: bytes) -> str:
+    """Get git object SHA"""
+    return sha1(f'{kind} {len(content)}\0'.encode() + content).hexdigest()
+
+
+@dataclass
+class FakeBranch:
+    """Branch with one commit of its files"""
+
+    name: str
+    files: Dict[str, bytes]
+
+    def __post_init__(self) -> None:
+        self.blobs = {path: git_sha('blob', content) for path, content in self.files.items()}
+        self.tree_sha = git_sha('tree', json.dumps(sorted(self.blobs.items())).encode())
+        self.commit_sha = git_sha('commit', f'{self.tree_sha}\n{self.name}\n{COMMIT_DATE}'.encode())
+
+    def list_dir(self, path: str) -> Optional[List[Tuple[str, str]]]:
+        """Get directory entries (name, type) or None if the path is not a directory"""
+        prefix = f'{path}/' if path else ''
+        entries = {}
+        for item in self.files:
+            if item.startswith(prefix):
+                name, _, rest = item[len(prefix):].partition('/')
+                entries[name] = 'dir' if rest else 'file'
+        return sorted(entries.items()) if entries or not path else None
+
+
+@dataclass
+class FakeRepository:
+    """Repository with branches"""
+
+    owner: str
+    name: str
+    branches: Dict[str, FakeBranch]
+    default_branch: str = 'main'
+    private: bool = False
+
+    @classmethod
+    def from_files(cls, owner: str, name: str, files: Dict[str, bytes], branch: str = 'main',
+                   private: bool = False) -> 'FakeRepository':
+        """Create repository with one branch"""
+        return cls(owner, name, {branch: FakeBranch(branch, files)}, branch, private)
+
+    @classmethod
+    def from_directory(cls, directory: Path, owner: str, name: str) -> 'FakeRepository':
+        """Create repository from `<directory>/<branch>/<files>` and optional `<directory>/repo.json`"""
+        meta_file = directory / REPO_META_FILE
+        meta = json.loads(meta_file.read_text()) if meta_file.is_file() else {}
+        branches = {
+            branch_dir.name: FakeBranch(branch_dir.name, {
+                item.relative_to(branch_dir).as_posix(): item.read_bytes()
+                for item in sorted(branch_dir.rglob('*')) if item.is_file()
+            })
+            for branch_dir in sorted(directory.iterdir()) if branch_dir.is_dir()
+        }
+        default_branch = meta.get('default_branch', 'main' if 'main' in branches else next(iter(branches), 'main'))
+        return cls(owner, name, branches, default_branch, meta.get('private', False))
+
+    @property
+    def full_name(self) -> str:
+        return f'{self.owner}/{self.name}'
+
+    def resolve(self, ref: str) -> Optional[FakeBranch]:
+        """Get branch by name, commit SHA or tree SHA"""
+        if ref in self.branches:
+            return self.branches[ref]
+        return next((branch for branch in self.branches.values() if ref in (branch.commit_sha, branch.tree_sha)), None)
+
+
+def write_git_repository(repository: FakeRepository, directory: Path) -> Path:
+    """Write repository branches as commits to `<directory>/<owner>/<repo>.git` for the mirror backend,
+    requires dulwich
+
+    Args:
+        repository (FakeRepository): _repository_
+        directory (Path): _root directory of bare repositories_
+
+    Returns:
+        Path: _bare repository path_
+    """
+    from dulwich.index import commit_tree
+    from dulwich.objects import Blob, Commit
+    from dulwich.repo import Repo
+
+    path = directory / repository.owner / f'{repository.name}.git'
+    path.mkdir(parents=True)
+    repo = Repo.init_bare(str(path))
+    timestamp = calendar.timegm(time.strptime(COMMIT_DATE, '%Y-%m-%dT%H:%M:%SZ'))
+    for branch in repository.branches.values():
+        blobs = []
+        for file_path, content in branch.files.items():
+            blob = Blob.from_string(content)
+            repo.object_store.add_object(blob)
+            blobs.append((file_path.encode(), blob.id, 0o100644))
+        commit = Commit()
+        commit.tree = commit_tree(repo.object_store, blobs)
+        commit.author = commit.committer = b'MarkHub Benchmarks <benchmarks@example.com>'
+        commit.author_time = commit.commit_time = timestamp
+        commit.author_timezone = commit.commit_timezone = 0
+        commit.message = f'Fake commit of {branch.name}\n'.encode()
+        repo.object_store.add_object(commit)
+        repo.refs[f'refs/heads/{branch.name}'.encode()] = commit.id
+    repo.refs.set_symbolic_ref(b'HEAD', f'refs/heads/{repository.default_branch}'.encode())
+    return path
+
+
+def load_fixtures(fixtures: Path) -> List[FakeRepository]:
+    """Load repositories from `<fixtures>/<owner>/<repo>` directories
+
+    Args:
+        fixtures (Path): _fixtures directory_
+
+    Returns:
+        List[FakeRepository]: _repositories_
+    """
+    return [
+        FakeRepository.from_directory(repo_dir, owner_dir.name, repo_dir.name)
+        for owner_dir in sorted(fixtures.iterdir()) if owner_dir.is_dir()
+        for repo_dir in sorted(owner_dir.iterdir()) if repo_dir.is_dir()
+    ]
+
+
+@dataclass
+class FakeGitHubOptions:
+    """Latency, error injection and rate limit of the fake server"""
+
+    latency: float = 0.0  # seconds per request
+    jitter: float = 0.0  # max random extra seconds per request
+    error_rate: float = 0.0  # share of requests answered with error_status
+    error_status: int = 502
+    rate_limit: int = 5000  # requests per token and hour
+    seed: int = 0
+    rng: random.Random = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.rng = random.Random(self.seed)
+
+
+class FakeGitHub:
+    """Threaded fake GitHub server with request counters"""
+
+    def __init__(self, repositories: List[FakeRepository], host: str = '127.0.0.1', port: int = 0,
+                 options: Optional[FakeGitHubOptions] = None) -> None:
+        """Create server, port 0 picks a free port
+
+        Args:
+            repositories (List[FakeRepository]): _served repositories_
+            host (str): _listen address_
+            port (int): _listen port_
+            options (FakeGitHubOptions): _latency, errors and rate limit, none by default_
+        """
+        self.repositories = {repo.full_name: repo for repo in repositories}
+        self.options = options or FakeGitHubOptions()
+        self.requests: Counter = Counter()
+        self.rate_limit_used: Counter = Counter()
+        self.rate_limit_reset = int(time.time()) + RATE_LIMIT_WINDOW
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer((host, port), self._handler_class())
+        self.server.daemon_threads = True
+        self.url = f'http://{host}:{self.server.server_port}'
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> 'FakeGitHub':
+        """Start serving in a background thread"""
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving"""
+        self.server.shutdown()
+        self.server.server_close()
+
+    def count(self, endpoint: str, token: str) -> Tuple[int, bool]:
+        """Count request by endpoint and token, sleep for the configured latency
+
+        Args:
+            endpoint (str): _endpoint template_
+            token (str): _request token, '' for anonymous requests_
+
+        Returns:
+            Tuple[int, bool]: _remaining rate limit of the token and whether to answer with an injected error_
+        """
+        with self._lock:
+            self.requests[endpoint] += 1
+            if time.time() > self.rate_limit_reset:
+                self.rate_limit_used.clear()
+                self.rate_limit_reset = int(time.time()) + RATE_LIMIT_WINDOW
+            if endpoint != 'raw':
+                self.rate_limit_used[token] += 1
+            remaining = self.options.rate_limit - self.rate_limit_used[token]
+            failed = self.options.rng.random() < self.options.error_rate
+            delay = self.options.latency + self.options.rng.random() * self.options.jitter
+        if delay:
+            time.sleep(delay)
+        return remaining, failed
+
+    def _handler_class(self) -> type:
+        fake = self
+
+        class Handler(FakeGitHubHandler):
+            server_fake = fake
+
+        return Handler
+
+    # JSON representations
+
+    def repo_json(self, repo: FakeRepository) -> dict:
+        return {
+            'id': int(git_sha('repo', repo.full_name.encode())[:7], 16),
+            'name': repo.name, 'full_name': repo.full_name,
+            'owner': self.user_json(repo.owner), 'private': repo.private, 'default_branch': repo.default_branch,
+            'url': f'{self.url}/repos/{repo.full_name}', 'html_url': f'https://github.com/{repo.full_name}',
+            'pushed_at': COMMIT_DATE, 'updated_at': COMMIT_DATE,
+        }
+
+    def user_json(self, login: str) -> dict:
+        return {
+            'login': login, 'id': int(git_sha('user', login.encode())[:7], 16), 'type': 'User',
+            'url': f'{self.url}/users/{login}',
+        }
+
+    def branch_json(self, repo: FakeRepository, branch: FakeBranch) -> dict:
+        return {
+            'name': branch.name, 'protected': False,
+            'commit': {'sha': branch.commit_sha,
+                       'url': f'{self.url}/repos/{repo.full_name}/commits/{branch.commit_sha}'},
+        }
+
+    def commit_json(self, repo: FakeRepository, branch: FakeBranch, with_files: bool = False) -> dict:
+        person = {'name': repo.owner, 'email': f'{repo.owner}@example.com', 'date': COMMIT_DATE}
+        data = {
+            'sha': branch.commit_sha, 'url': f'{self.url}/repos/{repo.full_name}/commits/{branch.commit_sha}',
+            'html_url': f'https://github.com/{repo.full_name}/commit/{branch.commit_sha}',
+            'commit': {
+                'author': person, 'committer': person, 'message': f'Fake commit of {branch.name}',
+                'tree': {'sha': branch.tree_sha,
+                         'url': f'{self.url}/repos/{repo.full_name}/git/trees/{branch.tree_sha}'},
+            },
+            'author': self.user_json(repo.owner), 'committer': self.user_json(repo.owner), 'parents': [],
+        }
+        if with_files:  # the only commit adds all files
+            data['files'] = [
+                {'sha': sha, 'filename': path, 'status': 'added', 'additions': 0, 'deletions': 0, 'changes': 0}
+                for path, sha in branch.blobs.items()
+            ]
+        return data
+
+    def content_json(self, repo: FakeRepository, branch: FakeBranch, path: str, kind: str,
+                     with_content: bool) -> dict:
+        view = 'blob' if kind == 'file' else 'tree'
+        data = {
+            'type': kind, 'name': PurePosixPath(path).name, 'path': path,
+            'sha': branch.blobs.get(path, git_sha('tree', path.encode())),
+            'size': len(branch.files.get(path, b'')),
+            'url': f'{self.url}/repos/{repo.full_name}/contents/{path}?ref={branch.name}',
+            'html_url': f'https://github.com/{repo.full_name}/{view}/{branch.name}/{path}',
+            'download_url': f'{self.url}/raw/{repo.full_name}/{branch.name}/{path}' if kind == 'file' else None,
+        }
+        if with_content:
+            data.update(encoding='base64', content=b64encode(branch.files[path]).decode())
+        return data
+
+    def paginate(self, path: str, query: Dict[str, List[str]], items: list) -> Tuple[list, Optional[str]]:
+        """Get the requested page of a list endpoint and its Link header
+
+        Args:
+            path (str): _request path_
+            query (Dict[str, List[str]]): _query parameters with optional page and per_page_
+            items (list): _all items_
+
+        Returns:
+            Tuple[list, Optional[str]]: _page items and Link header or None for a single page_
+        """
+        per_page = min(int(query.get('per_page', ['30'])[0]), 100)
+        page = int(query.get('page', ['1'])[0])
+        last = max((len(items) + per_page - 1) // per_page, 1)
+        if last == 1:
+            return items, None
+        params = {key: values[0] for key, values in query.items() if key not in ('page', 'per_page')}
+
+        def link(number: int, rel: str) -> str:
+            return f'<{self.url}{path}?{urlencode({**params, "per_page": per_page, "page": number})}>; rel="{rel}"'
+
+        links = [link(page + 1, 'next'), link(last, 'last')] if page < last else []
+        if page > 1:
+            links += [link(1, 'first'), link(page - 1, 'prev')]
+        return items[(page - 1) * per_page:page * per_page], ', '.join(links) or None
+
+    def route(self, path: str, query: Dict[str, List[str]], token: str) -> Tuple[int, object, str]:
+        """Get response status, JSON body and endpoint template for the GET request
+
+        Args:
+            path (str): _request path_
+            query (Dict[str, List[str]]): _query parameters_
+            token (str): _request token, '' for anonymous requests_
+
+        Returns:
+            Tuple[int, object, str]: _status, JSON body or raw bytes, endpoint template_
+        """
+        not_found = {'message': 'Not Found'}
+        parts = [unquote(part) for part in path.strip('/').split('/')]
+        if parts[0] == 'raw' and len(parts) >= 5:
+            repo = self.repositories.get(f'{parts[1]}/{parts[2]}')
+            branch = repo.resolve(parts[3]) if repo and not repo.private else None
+            file_path = '/'.join(parts[4:])
+            if branch and file_path in branch.files:
+                return 200, branch.files[file_path], 'raw'
+            return 404, b'404: Not Found', 'raw'
+        if parts == ['rate_limit']:
+            return 200, {}, '/rate_limit'
+        if parts == ['user']:
+            return 200, self.user_json(next(iter(self.repositories.values())).owner), '/user'
+        if parts == ['user', 'repos']:
+            return 200, [self.repo_json(repo) for repo in self.repositories.values()], '/user/repos'
+        if parts[0] != 'repos' or len(parts) < 3:
+            return 404, not_found, '/' + '/'.join(parts[:2])
+        repo = self.repositories.get(f'{parts[1]}/{parts[2]}')
+        if not repo or (repo.private and not token):
+            return 404, not_found, '/repos/{owner}/{repo}'
+        rest = parts[3:]
+        endpoint = '/repos/{owner}/{repo}' + ''.join(f'/{part}' for part in rest[:2 if rest[:1] == ['git'] else 1])
+        if not rest:
+            return 200, self.repo_json(repo), endpoint
+        if rest[0] == 'branches' and len(rest) > 1:
+            branch = repo.branches.get('/'.join(rest[1:]))
+            endpoint += '/{id}'
+            return (200, self.branch_json(repo, branch), endpoint) if branch else (404, not_found, endpoint)
+        ref = query.get('ref', query.get('sha', [repo.default_branch]))[0]
+        if rest[0] == 'commits' and len(rest) > 1 or rest[0] == 'git' and len(rest) >= 3:
+            ref = '/'.join(rest[1:] if rest[0] == 'commits' else rest[2:])  # branch names may have slashes
+            endpoint += '/{id}'
+        tree_path = None
+        if rest[:2] == ['git', 'trees'] and 'recursive' not in query:
+            ref, _, tree_path = ref.partition(':')  # '<commit>:<directory>' names a directory tree
+        if rest[:2] == ['git', 'blobs']:
+            for branch in repo.branches.values():
+                if item := next((path for path, sha in branch.blobs.items() if sha == ref), None):
+                    return 200, {
+                        'sha': ref, 'size': len(branch.files[item]), 'encoding': 'base64',
+                        'content': b64encode(branch.files[item]).decode(),
+                    }, endpoint
+            return 404, not_found, endpoint
+        if not (branch := repo.resolve(ref)):
+            return 404, {'message': f'No commit found for the ref {ref}'}, endpoint
+        if rest == ['branches']:
+            return 200, [self.branch_json(repo, item) for item in repo.branches.values()], endpoint
+        if rest[0] == 'commits':
+            if len(rest) > 1:
+                return 200, self.commit_json(repo, branch, with_files=True), endpoint
+            path_filter = query.get('path', [''])[0].strip('/')
+            touched = not path_filter or any(path == path_filter or path.startswith(f'{path_filter}/')
+                                             for path in branch.files)
+            return 200, [self.commit_json(repo, branch)] if touched else [], endpoint
+        if rest[0] == 'contents':
+            item = '/'.join(rest[1:]).strip('/')
+            endpoint += '/{path}'
+            if item in branch.files:
+                return 200, self.content_json(repo, branch, item, 'file', True), endpoint
+            if (entries := branch.list_dir(item)) is not None:
+                return 200, [
+                    self.content_json(repo, branch, f'{item}/{name}' if item else name, kind, False)
+                    for name, kind in entries
+                ], endpoint
+            return 404, not_found, endpoint
+        if rest[:2] == ['git', 'trees'] and tree_path is not None:
+            if (entries := branch.list_dir(tree_path)) is None:
+                return 404, not_found, endpoint
+            return 200, {
+                'sha': git_sha('tree', tree_path.encode()), 'truncated': False,
+                'url': f'{self.url}/repos/{repo.full_name}/git/trees/{branch.commit_sha}:{tree_path}',
+                'tree': [
+                    {'path': name, 'mode': '100644' if kind == 'file' else '040000',
+                     'type': 'blob' if kind == 'file' else 'tree',
+                     'sha': branch.blobs.get(item, git_sha('tree', item.encode()))}
+                    for name, kind in entries for item in [f'{tree_path}/{name}' if tree_path else name]
+                ],
+            }, endpoint
+        if rest[:2] == ['git', 'trees']:
+            return 200, {
+                'sha': branch.tree_sha, 'url': f'{self.url}/repos/{repo.full_name}/git/trees/{branch.tree_sha}',
+                'truncated': False,
+                'tree': [
+                    {'path': item, 'mode': '100644', 'type': 'blob', 'sha': sha, 'size': len(branch.files[item])}
+                    for item, sha in sorted(branch.blobs.items())
+                ],
+            }, endpoint
+        return 404, not_found, endpoint
+
+
+class FakeGitHubHandler(BaseHTTPRequestHandler):
+    """Fake GitHub request handler"""
+
+    server_fake: FakeGitHub
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self) -> None:
+        fake = self.server_fake
+        url = urlsplit(self.path)
+        token = self.headers.get('Authorization', '').partition(' ')[2]
+        query = parse_qs(url.query)
+        status, body, endpoint = fake.route(url.path, query, token)
+        link = None
+        if endpoint in PAGINATED_ENDPOINTS and isinstance(body, list):
+            body, link = fake.paginate(url.path, query, body)
+        remaining, failed = fake.count(endpoint, token)
+        if failed:
+            status, body = fake.options.error_status, {'message': 'Injected server error'}
+        elif remaining < 0 and endpoint != 'raw':
+            status, body = 403, {'message': 'API rate limit exceeded',
+                                 'documentation_url': 'https://docs.github.com/rest/rate-limit'}
+        elif endpoint == '/rate_limit':
+            core = {'limit': fake.options.rate_limit, 'remaining': remaining,
+                    'used': fake.options.rate_limit - remaining, 'reset': fake.rate_limit_reset}
+            body = {'resources': {'core': core}, 'rate': core}
+        if isinstance(body, bytes):
+            content, content_type = body, 'text/plain; charset=utf-8'
+        else:
+            content, content_type = json.dumps(body).encode(), 'application/json; charset=utf-8'
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(content)))
+        if link and status == 200:
+            self.send_header('Link', link)
+        if endpoint != 'raw':
+            self.send_header('X-RateLimit-Limit', str(fake.options.rate_limit))
+            self.send_header('X-RateLimit-Remaining', str(max(remaining, 0)))
+            self.send_header('X-RateLimit-Used', str(fake.options.rate_limit - remaining))
+            self.send_header('X-RateLimit-Reset', str(fake.rate_limit_reset))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format: str, *args) -> None:
+        """Keep benchmark output clean"""
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.fake_github',
+                                     description='Fake GitHub server for load testing and offline development')
+    parser.add_argument('--fixtures', type=Path,
+                        help='directory of <owner>/<repo>/<branch> fixtures (the benchmark corpus by default)')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds per request')
+    parser.add_argument('--jitter', type=float, default=0.0, help='max random extra seconds per request')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='share of requests answered with errors')
+    parser.add_argument('--error-status', type=int, default=502, help='status of injected errors')
+    parser.add_argument('--rate-limit', type=int, default=5000, help='requests per token and hour')
+    parser.add_argument('--seed', type=int, default=0, help='random seed of latency jitter and errors')
+    args = parser.parse_args()
+    if args.fixtures:
+        repositories = load_fixtures(args.fixtures)
+    else:
+        from .corpus import get_corpus_repository
+        repositories = [get_corpus_repository()]
+    options = FakeGitHubOptions(args.latency, args.jitter, args.error_rate, args.error_status,
+                                args.rate_limit, args.seed)
+    fake = FakeGitHub(repositories, args.host, args.port, options)
+    print(f'Fake GitHub serves {", ".join(fake.repositories)}')
+    print(f'GITHUB_API_URL={fake.url} GITHUB_RAW_URL={fake.url}/raw')
+    try:
+        fake.server.serve_forever()
+    except KeyboardInterrupt:
+        fake.server.server_close()
+
+
+if __name__ == '__main__':
+    main()
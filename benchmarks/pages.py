@@ -0,0 +1,75 @@
+"""
+Page weight of `RepoView`, `FileView` and `ShareView`: requests and bytes of the HTML with the linked scripts
+and stylesheets, as they are and gzipped.
+"""
+import gzip
+import re
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.exceptions import ImproperlyConfigured
+
+from markhub.settings import STATIC_BUNDLES
+
+from .views import get_page_cases
+
+ASSET = re.compile(r'<(?:script\b[^>]*\bsrc|link\b[^>]*\bhref)="([^"?#]+\.(?:js|css))[^"]*"')
+
+
+def read_static(url: str) -> Tuple[Optional[bytes], List[str]]:
+    """Read static file by url, bundles which can't be built are read from their available sources
+
+    Args:
+        url (str): _STATIC_URL url_
+
+    Returns:
+        Tuple[Optional[bytes], List[str]]: _content or None if not found, missing bundle sources_
+    """
+    name = url[len(settings.STATIC_URL):]
+    try:
+        path = finders.find(name)
+    except ImproperlyConfigured:  # vendored sources are not downloaded
+        sources = [(source, finders.find(source)) for source in STATIC_BUNDLES[name]]
+        content = b'\n'.join(Path(path).read_bytes() for _, path in sources if path)
+        return content, [source for source, path in sources if not path]
+    return (Path(path).read_bytes() if path else None), []
+
+
+def run(file_name: str) -> List[dict]:
+    """Measure the weight of repository, file and share pages
+
+    Args:
+        file_name (str): _markdown file of the repository to open_
+
+    Returns:
+        List[dict]: _results per page_
+    """
+    results = []
+    for name, client, url in get_page_cases(file_name):
+        response = client.get(url, secure=True)
+        assert response.status_code == 200, f'{url} - {response.status_code}'
+        html = response.content
+        scripts, styles, external, missing = [], [], [], []
+        for asset in ASSET.findall(html.decode()):
+            if not asset.startswith(settings.STATIC_URL):
+                external.append(asset)
+                continue
+            content, missing_sources = read_static(asset)
+            missing += missing_sources if content is not None else [asset]
+            (scripts if asset.endswith('.js') else styles).append(content or b'')
+        script = b'\n'.join(scripts)
+        style = b'\n'.join(styles)
+        results.append({
+            'name': name,
+            'url': url,
+            'requests': len(scripts) + len(styles) + len(external),
+            'external_requests': external,
+            'missing': missing,
+            'html_bytes': len(html),
+            'script_bytes': len(script),
+            'style_bytes': len(style),
+            'gzip_bytes': sum(len(gzip.compress(content)) for content in [html, *scripts, *styles]),
+        })
+    return results
@@ -0,0 +1,75 @@
+"""
+`PrivatePublish.publish_file`, `lookup_published_file` and `lookup_published_files` latency under concurrency.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from django.contrib.auth.models import User
+from django.db import DatabaseError, connection
+
+from markhub.models import PrivatePublish
+
+from .common import summarize
+
+WORKERS = (1, 4, 16)
+LOOKUPS_PER_PUBLISH = 10
+
+
+def _timed(func: Callable[[dict], object], context: dict) -> Tuple[float, Optional[str]]:
+    """Call function with the context, the thread's connection is closed afterwards"""
+    started = perf_counter()
+    error = None
+    try:
+        func(context)
+    except DatabaseError as e:
+        error = str(e)
+    elapsed = perf_counter() - started
+    connection.close()
+    return elapsed, error
+
+
+def _run_concurrently(func: Callable[[dict], object], contexts: List[dict], workers: int) -> dict:
+    """Run function for the contexts with the thread pool and summarize"""
+    started = perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(lambda context: _timed(func, context), contexts))
+    elapsed = perf_counter() - started
+    errors = [error for _, error in results if error]
+    return {
+        **summarize([duration for duration, _ in results]),
+        'ops_per_s': round(len(contexts) / elapsed, 2),
+        'errors': len(errors),
+        'error_sample': errors[0] if errors else None,
+    }
+
+
+def run(content: str, repeat: int, workers: Sequence[int] = WORKERS) -> List[dict]:
+    """Publish `repeat` files and look them up one by one and all at once with every worker count
+
+    Args:
+        content (str): _published markdown_
+        repeat (int): _published files per worker count_
+        workers (Sequence[int]): _thread pool sizes_
+
+    Returns:
+        List[dict]: _results per operation and worker count_
+    """
+    owner, _ = User.objects.get_or_create(username='bench-publisher')
+    results = []
+    for count in workers:
+        contexts = [
+            {'username': owner.username, 'repo': 'docs', 'branch': 'main', 'path': f'workers-{count}/{i}.md',
+             'content': content, 'owner': owner}
+            for i in range(repeat)
+        ]
+        results.append({'name': f'publish_file-{count}', 'workers': count,
+                        **_run_concurrently(PrivatePublish.publish_file, contexts, count)})
+        results.append({'name': f'lookup_published_file-{count}', 'workers': count,
+                        **_run_concurrently(PrivatePublish.lookup_published_file,
+                                            contexts * LOOKUPS_PER_PUBLISH, count)})
+        paths = [context['path'] for context in contexts]
+        results.append({'name': f'lookup_published_files-{count}', 'workers': count,
+                        **_run_concurrently(lambda context: PrivatePublish.lookup_published_files(context, paths),
+                                            contexts[:1] * LOOKUPS_PER_PUBLISH, count)})
+    return results
@@ -0,0 +1,43 @@
+"""
+`markdownify` throughput over the corpus, the render cache is bypassed.
+Warm renders are also timed with all extensions to show the adaptive pipeline speedup.
+"""
+from time import perf_counter
+from typing import Dict, List
+
+from markhub.services.markdown_render import get_extensions, markdownify
+from markhub.settings import MARTOR_MARKDOWN_EXTENSIONS
+
+from .common import measure, summarize
+
+
+def run(corpus: Dict[str, str], repeat: int) -> List[dict]:
+    """Render every corpus document once cold and `repeat` times warm
+
+    Args:
+        corpus (Dict[str, str]): _file name: markdown content_
+        repeat (int): _warm renders per document_
+
+    Returns:
+        List[dict]: _results per document_
+    """
+    results = []
+    for name, content in corpus.items():
+        started = perf_counter()
+        markdownify(content)
+        first = perf_counter() - started
+        summary = summarize(measure(lambda: markdownify(content), repeat))
+        full = summarize(measure(lambda: markdownify(content, adaptive=False), repeat))
+        size = len(content.encode('UTF-8'))
+        results.append({
+            'name': name,
+            'bytes': size,
+            'first_ms': round(first * 1000, 3),
+            **summary,
+            'docs_per_s': round(1000 / summary['median_ms'], 2),
+            'mb_per_s': round(size / (1024 * 1024) / (summary['median_ms'] / 1000), 3),
+            'extensions': f'{len(get_extensions(content))}/{len(MARTOR_MARKDOWN_EXTENSIONS)}',
+            'all_extensions_median_ms': full['median_ms'],
+            'adaptive_speedup': round(full['median_ms'] / summary['median_ms'], 2),
+        })
+    return results
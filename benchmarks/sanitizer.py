@@ -0,0 +1,75 @@
+"""
+Regression check of rendered markdown against script injection: payloads must not render tags or attributes
+which run scripts. Math payloads are rendered with MATH_RENDERER=mathml when latex2mathml is installed.
+
+    python -m benchmarks sanitizer
+"""
+from html.parser import HTMLParser
+from typing import Dict, List, Tuple
+
+from markhub.services.markdown_render import is_allowed_url, markdownify
+
+PAYLOADS = {
+    'link': '[x](javascript:alert(1))',
+    'link-case': '[x](JaVaScRiPt:alert(1))',
+    'link-entity': '[x](java&#x09;script:alert(1))',
+    'image': '![i](javascript:alert(1))',
+    'image-data': '![i](data:text/html;base64,PHNjcmlwdD5hbGVydCgxKTwvc2NyaXB0Pg==)',
+    'raw-html': '<img src=x onerror=alert(1)>',
+    'math-text-breakout': r'$\text{</mtext></math><img/src/onerror=alert(1)>}$',
+    'math-text-tag': r'$\text{<svg/onload=alert(1)>}$',
+    'math-block-text': '$$\n\\text{<script>alert(1)</script>}\n$$',
+    'math-href': r'$\href{javascript:alert(1)}{x}$',
+}
+SCRIPT_TAGS = {'script', 'svg', 'iframe', 'object', 'embed', 'style'}
+URL_ATTRIBUTES = {'href', 'src', 'srcset', 'xlink:href', 'action', 'formaction'}
+
+
+class _TagCollector(HTMLParser):
+    """Collect start tags with their attributes"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.tags: List[Tuple[str, List[Tuple[str, str]]]] = []
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, str]]) -> None:
+        self.tags.append((tag, attrs))
+
+
+def find_unsafe_markup(html: str) -> List[str]:
+    """Find tags and attributes of the html which run scripts
+
+    Args:
+        html (str): _rendered markdown_
+
+    Returns:
+        List[str]: _unsafe tags and attributes_
+    """
+    parser = _TagCollector()
+    parser.feed(html)
+    parser.close()
+    unsafe = []
+    for tag, attrs in parser.tags:
+        if tag in SCRIPT_TAGS:
+            unsafe.append(f'<{tag}>')
+        for name, value in attrs:
+            if name.startswith('on') or name in URL_ATTRIBUTES and not is_allowed_url(value or ''):
+                unsafe.append(f'<{tag} {name}="{value}">')
+    return unsafe
+
+
+def check(payloads: Dict[str, str] = PAYLOADS) -> List[str]:
+    """Render the payloads and find unsafe markup
+
+    Args:
+        payloads (Dict[str, str]): _payload name: markdown content_
+
+    Returns:
+        List[str]: _payloads with unsafe markup and their renders_
+    """
+    failures = []
+    for name, content in payloads.items():
+        html, _ = markdownify(content)
+        if unsafe := find_unsafe_markup(html):
+            failures.append(f'{name}: {", ".join(unsafe)}\n{html}\n')
+    return failures
@@ -0,0 +1,93 @@
+"""
+Cold start time of fresh interpreters with `-X importtime` breakdowns.
+
+    python -m benchmarks importtime --case setup
+"""
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+from time import perf_counter
+from typing import Dict, List, Tuple
+
+from .common import summarize
+
+CASES = {
+    # django.setup() as done by every worker and manage.py command
+    'setup': 'import django; django.setup()',
+    # URLconf with views as loaded by the first request
+    'urlconf': 'import django; django.setup(); from django.urls import get_resolver; get_resolver().url_patterns',
+    # explicit worker warm-up
+    'warm_up': 'import django; django.setup(); from markhub.services.warmup import warm_up; warm_up()',
+}
+HEAVY_PACKAGES = ('github', 'markdown', 'pymdownx', 'pygments', 'latex2mathml', 'PIL')
+TOP_IMPORTS = 10
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+def parse_importtime(stderr: str) -> List[Tuple[int, str, float, float]]:
+    """Parse `-X importtime` output
+
+    Args:
+        stderr (str): _interpreter stderr_
+
+    Returns:
+        List[Tuple[int, str, float, float]]: _depth, module, self and cumulative milliseconds per import_
+    """
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip(' ')) - 1) // 2
+        imports.append((depth, name.strip(), int(own) / 1000, int(cumulative) / 1000))
+    return imports
+
+
+def importtime(code: str) -> dict:
+    """Get import time breakdown of the code run in a fresh interpreter
+
+    Args:
+        code (str): _python code_
+
+    Returns:
+        dict: _total import milliseconds, module count, import milliseconds of heavy packages
+            and top-level imports by cumulative time_
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], capture_output=True, text=True,
+                            cwd=BASE_DIR)
+    if result.returncode:
+        errors = [line for line in result.stderr.splitlines() if not line.startswith('import time:')]
+        raise RuntimeError(errors[-1] if errors else f'exit code {result.returncode}')
+    imports = parse_importtime(result.stderr)
+    top_level = sorted(((name, ms) for depth, name, _, ms in imports if depth == 0), key=lambda item: -item[1])
+    heavy: Dict[str, float] = defaultdict(float)
+    for _, name, own, _ in imports:
+        if (package := name.partition('.')[0]) in HEAVY_PACKAGES:
+            heavy[package] += own
+    return {
+        'import_ms': round(sum(ms for _, ms in top_level), 1),
+        'modules': len(imports),
+        'heavy_packages': {package: round(ms, 1) for package, ms in heavy.items()},
+        'top_imports': [[name, round(ms, 1)] for name, ms in top_level[:TOP_IMPORTS]],
+    }
+
+
+def run(repeat: int) -> List[dict]:
+    """Start `repeat` fresh interpreters per case
+
+    Args:
+        repeat (int): _interpreter starts per case_
+
+    Returns:
+        List[dict]: _results per case_
+    """
+    results = []
+    for name, code in CASES.items():
+        times = []
+        for _ in range(repeat):
+            started = perf_counter()
+            subprocess.run([sys.executable, '-c', code], check=True, capture_output=True, cwd=BASE_DIR)
+            times.append(perf_counter() - started)
+        results.append({'name': name, **summarize(times), **importtime(code)})
+    return results
@@ -0,0 +1,89 @@
+"""
+End-to-end `RepoView`, `FileView` and `ShareView` latency against the fake GitHub server.
+"""
+from time import perf_counter
+from typing import List, Tuple
+
+from allauth.socialaccount.models import SocialAccount, SocialApp, SocialToken
+from django.contrib.auth.models import User
+from django.contrib.sites.models import Site
+from django.core.cache import cache
+from django.test import Client
+
+from .common import measure, summarize
+from .fake_github import FakeGitHub
+
+USERNAME = 'bench'
+REPO = 'docs'
+
+
+def create_github_user(username: str = USERNAME) -> User:
+    """Create user with a GitHub social token
+
+    Args:
+        username (str): _GitHub login_
+
+    Returns:
+        User: _Django user_
+    """
+    user, _ = User.objects.get_or_create(username=username)
+    app, _ = SocialApp.objects.get_or_create(provider='github', defaults={'name': 'GitHub', 'client_id': 'bench'})
+    app.sites.add(Site.objects.get_current())
+    account, _ = SocialAccount.objects.get_or_create(user=user, provider='github', defaults={'uid': username})
+    SocialToken.objects.get_or_create(app=app, account=account, defaults={'token': f'{username}-token'})
+    return user
+
+
+def get_page_cases(file_name: str) -> List[Tuple[str, Client, str]]:
+    """Get repository, file and share pages with clients of the repository owner and an anonymous user
+
+    Args:
+        file_name (str): _markdown file of the repository to open_
+
+    Returns:
+        List[Tuple[str, Client, str]]: _view name, client and url per page_
+    """
+    owner = Client()
+    owner.force_login(create_github_user())
+    return [
+        ('RepoView', owner, f'/repo/{REPO}/'),
+        ('FileView', owner, f'/file/{REPO}/main/{file_name}/'),
+        ('ShareView', Client(), f'/view/{USERNAME}/{REPO}/main/{file_name}/'),
+    ]
+
+
+def run(fake: FakeGitHub, file_name: str, repeat: int) -> List[dict]:
+    """Request repository, file and share pages, the first request runs with empty caches
+
+    Args:
+        fake (FakeGitHub): _running fake GitHub server with the {USERNAME}/{REPO} repository_
+        file_name (str): _markdown file of the repository to open_
+        repeat (int): _requests per page after the first one_
+
+    Returns:
+        List[dict]: _results per page_
+    """
+    cache.clear()
+    results = []
+    for name, client, url in get_page_cases(file_name):
+        def request():
+            response = client.get(url, secure=True)
+            assert response.status_code == 200, f'{url} - {response.status_code}'
+
+        fake.requests.clear()
+        started = perf_counter()
+        request()
+        first = perf_counter() - started
+        first_requests = sum(fake.requests.values())
+        fake.requests.clear()
+        summary = summarize(measure(request, repeat))
+        results.append({
+            'name': name,
+            'url': url,
+            'first_ms': round(first * 1000, 3),
+            'first_github_requests': first_requests,
+            **summary,
+            'github_requests_per_view': round(sum(fake.requests.values()) / repeat, 2),
+            'github_endpoints': dict(fake.requests),
+        })
+    return results
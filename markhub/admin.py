@@ -1,6 +1,109 @@
-from django.contrib import admin
+import json
 
-from .models import PrivatePublish
+from django.contrib import admin, messages
+from django.core.exceptions import PermissionDenied
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import path, reverse
+from django.utils.html import format_html
 
+from .models import PrivatePublish, RequestProfile, SearchIndex
+from .services.profiler import to_speedscope
 
-admin.site.register(PrivatePublish)
+
+@admin.register(PrivatePublish)
+class PrivatePublishAdmin(admin.ModelAdmin):
+    """Published files admin"""
+
+    actions = ['prerender_repositories']
+
+    @admin.action(description='Prerender markdown of selected repository branches')
+    def prerender_repositories(self, request, queryset):
+        """Render all markdown files of selected repository branches into the render cache"""
+        # PyGithub and Markdown are imported at the first use, not with the admin at startup
+        from github import GithubException
+
+        from .services.github_repository import get_github, get_github_token
+        from .services.prerender import prerender
+
+        targets = {
+            (published.user, published.repo, published.branch): published.owner
+            for published in queryset.select_related('owner')
+        }
+        for (user, repo, branch), owner in targets.items():
+            target = f'{user}/{repo}@{branch}'
+            if not (token := get_github_token(owner)):
+                self.message_user(request, f'{target}: {owner} has no GitHub token', messages.ERROR)
+                continue
+            try:
+                stats = prerender(token, get_github(token).get_repo(f'{user}/{repo}'), branch)
+                self.message_user(request, f'{target}: {stats}', messages.SUCCESS)
+            except GithubException as e:
+                self.message_user(request, f'{target}: GitHub error - {e}', messages.ERROR)
+
+
+@admin.register(SearchIndex)
+class SearchIndexAdmin(admin.ModelAdmin):
+    """Search indexes admin"""
+
+    list_display = ['__str__', 'commit', 'updated']
+
+
+@admin.register(RequestProfile)
+class RequestProfileAdmin(admin.ModelAdmin):
+    """Request profiles admin, the slowest profiles first"""
+
+    list_display = ['path', 'view', 'status', 'duration_ms', 'github_calls', 'samples', 'created', 'downloads']
+    list_filter = ['view', 'created']
+    search_fields = ['path']
+    date_hierarchy = 'created'
+    readonly_fields = [field.name for field in RequestProfile._meta.fields] + ['downloads']
+
+    def has_add_permission(self, request) -> bool:
+        return False
+
+    def has_change_permission(self, request, obj=None) -> bool:
+        return False
+
+    @admin.display(description='Duration, ms', ordering='duration')
+    def duration_ms(self, obj: RequestProfile) -> str:
+        return f'{obj.duration * 1000:.0f}'
+
+    @admin.display(description='Flamegraph')
+    def downloads(self, obj: RequestProfile) -> str:
+        """Links to collapsed stacks for flamegraph.pl and to the speedscope file"""
+        return format_html(
+            '<a href="{}">collapsed</a> / <a href="{}">speedscope</a>',
+            reverse('admin:markhub_requestprofile_collapsed', args=[obj.pk]),
+            reverse('admin:markhub_requestprofile_speedscope', args=[obj.pk]),
+        )
+
+    def get_urls(self):
+        urls = [
+            path('<int:pk>/collapsed/', self.admin_site.admin_view(self.collapsed_view),
+                 name='markhub_requestprofile_collapsed'),
+            path('<int:pk>/speedscope/', self.admin_site.admin_view(self.speedscope_view),
+                 name='markhub_requestprofile_speedscope'),
+        ]
+        return urls + super().get_urls()
+
+    def collapsed_view(self, request, pk: int) -> HttpResponse:
+        """Download collapsed stacks"""
+        profile = self._get_profile(request, pk)
+        response = HttpResponse(profile.stacks, content_type='text/plain; charset=utf-8')
+        response['Content-Disposition'] = f'attachment; filename="profile-{pk}.collapsed.txt"'
+        return response
+
+    def speedscope_view(self, request, pk: int) -> HttpResponse:
+        """Download the speedscope file"""
+        profile = self._get_profile(request, pk)
+        speedscope = to_speedscope(profile.stacks, str(profile), profile.interval)
+        response = HttpResponse(json.dumps(speedscope), content_type='application/json')
+        response['Content-Disposition'] = f'attachment; filename="profile-{pk}.speedscope.json"'
+        return response
+
+    def _get_profile(self, request, pk: int) -> RequestProfile:
+        profile = get_object_or_404(RequestProfile, pk=pk)
+        if not self.has_view_permission(request, profile):
+            raise PermissionDenied
+        return profile
@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+
+
+class MarkhubConfig(AppConfig):
+    """MarkHub application config
+
+    Heavy dependencies (PyGithub, Markdown, Pygments) are imported at the first use,
+    `markhub.services.warmup.warm_up` loads them before the first request if WARM_UP is set.
+    """
+
+    name = 'markhub'
+    verbose_name = 'MarkHub'
@@ -0,0 +1,5 @@
+def slugify_unicode(value: str, separator: str) -> str:
+    """`markdown.extensions.toc.slugify_unicode`, Markdown is imported at the first call instead of with settings"""
+    from markdown.extensions.toc import slugify_unicode
+
+    return slugify_unicode(value, separator)
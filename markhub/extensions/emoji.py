@@ -0,0 +1,49 @@
+"""
+Emoji index and generator for `pymdownx.emoji`
+==============================================
+
+`pymdownx.emoji.twemoji` deep copies the whole emoji database for every Markdown instance,
+and `pymdownx.emoji.to_svg` makes an image with CDN link for every emoji.
+Here the index is built once per process at the first use and shared by all Markdown instances,
+and emoji are rendered as Unicode characters in a short span styled by local static css.
+
+Only the short (default) and no title modes are supported, the index has no emoji names.
+The module is referenced by settings, so Markdown and pymdownx are imported at the first use.
+"""
+import xml.etree.ElementTree as etree
+from typing import Optional
+
+INDEX_NAME = 'twemoji'
+INDEX_FIELDS = ('unicode', 'unicode_alt', 'category')
+
+_index: Optional[dict] = None
+
+
+def twemoji(options: dict, md) -> dict:
+    """Shared compact Twemoji index, loaded lazily"""
+    global _index
+    if _index is None:
+        from pymdownx import twemoji_db
+        _index = {
+            'name': INDEX_NAME,
+            'emoji': {
+                shortname: {field: emoji[field] for field in INDEX_FIELDS if field in emoji}
+                for shortname, emoji in twemoji_db.emoji.items()
+            },
+            'aliases': twemoji_db.aliases,
+        }
+    return _index
+
+
+def to_span(index, shortname, alias, uc, alt, title, category, options, md) -> etree.Element:
+    """Return Unicode emoji span element"""
+    from markdown import util as md_util
+    from pymdownx.emoji import add_attributes
+
+    attributes = {'class': options.get('classes', index)}
+    if title:
+        attributes['title'] = title
+    add_attributes(options, attributes)
+    span = etree.Element('span', attributes)
+    span.text = md_util.AtomicString(alt)
+    return span
@@ -0,0 +1,119 @@
+"""
+Highlight Cache Extension for Python-Markdown
+=============================================
+
+`pymdownx.highlight` replacement which highlights the same code snippet with the same options
+only once per process. Fenced code blocks (`pymdownx.superfences`) and inline code
+(`pymdownx.inlinehilite`) get the cached highlighter via `get_pymdownx_highlighter`.
+"""
+import threading
+from collections import OrderedDict
+from copy import deepcopy
+from dataclasses import dataclass
+from hashlib import sha1
+from time import perf_counter
+from typing import Iterable
+
+from pygments.lexers import get_lexer_by_name
+from pymdownx.highlight import Highlight, HighlightExtension
+
+from markhub.services.metrics import cache_stats
+from markhub.settings import HIGHLIGHT_CACHE_SIZE
+
+_cache: OrderedDict = OrderedDict()
+_lock = threading.Lock()
+_thread_local = threading.local()
+
+
+@dataclass
+class HighlightStats:
+    """Highlighting stats of the process"""
+
+    calls: int = 0
+    hits: int = 0
+    seconds: float = 0.0
+
+    @property
+    def hit_ratio(self) -> float:
+        """Cache hit ratio"""
+        return self.hits / self.calls if self.calls else 0.0
+
+
+highlight_stats = HighlightStats()
+cache_stats.register('highlight', lambda: (highlight_stats.hits, highlight_stats.calls - highlight_stats.hits))
+
+
+def get_thread_highlight_seconds() -> float:
+    """Get seconds spent in highlighting by the current thread
+
+    Returns:
+        float: _highlighting seconds_
+    """
+    return getattr(_thread_local, 'seconds', 0.0)
+
+
+def preload_lexers(names: Iterable[str]) -> None:
+    """Import Pygments lexers modules, so the first render doesn't pay for it
+
+    Args:
+        names (Iterable[str]): _lexer names or aliases_
+    """
+    for name in names:
+        get_lexer_by_name(name)
+
+
+class CachedHighlight(Highlight):
+    """Highlight with LRU cache keyed by language, code hash and highlight options"""
+
+    def _cache_key(self, src: str, language: str, *args) -> str:
+        """Get cache key for code snippet and options"""
+        options = vars(self)
+        # Code block number is a part of the output only with line spans or anchors
+        if not (self.line_spans or self.line_anchors):
+            args = args[:-1]
+        return sha1(repr((sorted(options.items()), language, args, src)).encode('UTF-8')).hexdigest()
+
+    def highlight(
+        self, src, language, css_class='highlight', hl_lines=None,
+        linestart=-1, linestep=-1, linespecial=-1, inline=False, classes=None, id_value='', attrs=None,
+        title=None, code_block_count=0
+    ):
+        """Highlight code or get it from the cache"""
+        started = perf_counter()
+        key = self._cache_key(src, language, css_class, hl_lines, linestart, linestep, linespecial, inline,
+                              classes, id_value, attrs, title, code_block_count)
+        with _lock:
+            code = _cache.get(key)
+            if code is not None:
+                _cache.move_to_end(key)
+        hit = code is not None
+        if not hit:
+            code = super().highlight(
+                src, language, css_class, hl_lines, linestart, linestep, linespecial, inline, classes,
+                id_value, attrs, title, code_block_count
+            )
+            with _lock:
+                _cache[key] = code
+                if len(_cache) > HIGHLIGHT_CACHE_SIZE:
+                    _cache.popitem(last=False)
+        elapsed = perf_counter() - started
+        _thread_local.seconds = get_thread_highlight_seconds() + elapsed
+        with _lock:
+            highlight_stats.calls += 1
+            highlight_stats.hits += hit
+            highlight_stats.seconds += elapsed
+        # Inline code is an element, every document gets its own copy
+        return deepcopy(code) if inline else code
+
+
+class HighlightCacheExtension(HighlightExtension):
+    """Highlight extension with the cached highlighter"""
+
+    def get_pymdownx_highlighter(self):
+        """Get the cached highlighter"""
+        return CachedHighlight
+
+
+def makeExtension(*args, **kwargs):
+    """Return extension"""
+    return HighlightCacheExtension(*args, **kwargs)
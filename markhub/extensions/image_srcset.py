@@ -0,0 +1,55 @@
+"""
+Image Srcset Extension for Python-Markdown
+==========================================
+
+Add `srcset` with resized WebP variants to images uploaded by `markhub.services.image_uploader`.
+Their names contain the content hash and the original width: `<hash>-<width>.<ext>`. The variants
+are made by a background job after the upload, so only stored variants are listed.
+"""
+import re
+from pathlib import PurePosixPath
+
+from django.core.files.storage import default_storage
+from markdown import Extension
+from markdown.treeprocessors import Treeprocessor
+
+from markhub.settings import IMAGE_VARIANT_WIDTHS, MARTOR_UPLOAD_PATH, MEDIA_URL
+
+UPLOADED_IMAGE_RE = re.compile(
+    r'^(?:https?://[^/]+)?' + re.escape(str(PurePosixPath(MEDIA_URL, MARTOR_UPLOAD_PATH))) +
+    r'/[0-9a-f]{32}-(?P<width>\d+)\.(?:png|jpe?g)$'
+)
+
+
+class ImageSrcsetTreeprocessor(Treeprocessor):
+    """Add srcset, sizes and lazy loading to uploaded images"""
+
+    def run(self, root):
+        for img in root.iter('img'):
+            src = img.get('src', '')
+            if not (match := UPLOADED_IMAGE_RE.match(src)):
+                continue
+            width = int(match.group('width'))
+            stem = src.rsplit('/', 1)[1].rsplit('.', 1)[0]
+            candidates = [
+                f"{src.rsplit('.', 1)[0]}.{variant}.webp {variant}w"
+                for variant in IMAGE_VARIANT_WIDTHS
+                if variant < width
+                and default_storage.exists(str(PurePosixPath(MARTOR_UPLOAD_PATH, f'{stem}.{variant}.webp')))
+            ]
+            if candidates:
+                img.set('srcset', ', '.join(candidates + [f'{src} {width}w']))
+                img.set('sizes', f'(max-width: {width}px) 100vw, {width}px')
+            img.set('loading', 'lazy')
+
+
+class ImageSrcsetExtension(Extension):
+    """Image srcset extension"""
+
+    def extendMarkdown(self, md):
+        md.treeprocessors.register(ImageSrcsetTreeprocessor(md), 'image_srcset', 0)
+
+
+def makeExtension(*args, **kwargs):
+    """Return extension"""
+    return ImageSrcsetExtension(*args, **kwargs)
@@ -25,6 +25,7 @@ class UpdateFileForm(forms.Form):
                                 }))
     content = MartorFormField(label='File content')
     republish = forms.BooleanField(label='Republish', required=False, initial=False)
+    sha = forms.CharField(max_length=40, required=False, widget=forms.HiddenInput())  # blob SHA of the opened file
 
 
 class BranchSelector(forms.Form):
@@ -0,0 +1,195 @@
+"""
+Request instrumentation: GitHub requests, database queries, session and template timings.
+
+`MetricsMiddleware` collects timings of every request into `markhub.services.metrics` histograms
+and the `Server-Timing` response header of staff users and METRICS_ALLOWED_IPS. This module is also the session engine and the template
+backend, which time session load/save and template rendering.
+
+`ProfilingMiddleware` samples stacks of some requests into `RequestProfile` for the admin.
+"""
+import random
+from functools import wraps
+from time import perf_counter
+from typing import Any, Callable
+from urllib.parse import urlsplit
+
+from django.contrib.sessions.backends import db
+from django.db import DatabaseError, connection
+from django.http.request import HttpRequest
+from django.http.response import HttpResponse
+from django.template.backends import django as django_backend
+
+from .models import RequestProfile
+from .services.metrics import (DB_DURATION, GITHUB_DURATION, SESSION_DURATION,
+                               TEMPLATE_DURATION, VIEW_DURATION,
+                               get_request_timings, request_timings,
+                               server_timing, timed)
+from .services.profiler import SamplingProfiler
+from .settings import (METRICS_ALLOWED_IPS, PROFILE_INTERVAL, PROFILE_KEEP,
+                       PROFILE_SAMPLE_RATE, PROFILE_VIEWS, logger)
+
+GITHUB_REQUEST_METHODS = (
+    'requestJsonAndCheck', 'requestBlobAndCheck', 'requestMultipartAndCheck', 'requestMemoryBlobAndCheck'
+)
+
+
+def get_github_endpoint(url: str) -> str:
+    """Get GitHub API endpoint template of the request url for metric labels
+
+    Args:
+        url (str): _request url or path_
+
+    Returns:
+        str: _endpoint like /repos/{owner}/{repo}/contents/{path}_
+    """
+    parts = [part for part in urlsplit(url).path.split('/') if part]
+    if parts[:2] == ['api', 'v3']:  # GitHub Enterprise
+        parts = parts[2:]
+    if len(parts) >= 3 and parts[0] == 'repos':
+        kept = 5 if len(parts) > 4 and parts[3] == 'git' else 4
+        endpoint = ['repos', '{owner}', '{repo}'] + parts[3:kept]
+        if len(parts) > kept:
+            endpoint.append('{path}' if 'contents' in endpoint else '{id}')
+    elif len(parts) >= 2 and parts[0] in ('users', 'orgs'):
+        endpoint = [parts[0], '{name}'] + parts[2:3]
+    else:
+        endpoint = parts[:2]
+    return '/' + '/'.join(endpoint)
+
+
+def instrument_github() -> None:
+    """Time PyGithub requests by endpoint, called once PyGithub is imported by `github_repository`"""
+    from github.Requester import Requester
+
+    for name in GITHUB_REQUEST_METHODS:
+        method = getattr(Requester, name, None)
+        if method is None or getattr(method, 'instrumented', False):
+            continue
+
+        def instrumented(self, verb: str, url: str, *args, _method: Callable = method, **kwargs) -> Any:
+            with timed('github', GITHUB_DURATION, method=verb, endpoint=get_github_endpoint(url)):
+                return _method(self, verb, url, *args, **kwargs)
+
+        instrumented = wraps(method)(instrumented)
+        instrumented.instrumented = True
+        setattr(Requester, name, instrumented)
+
+
+def is_metrics_client(request: HttpRequest) -> bool:
+    """Check the request may see metrics and timings: staff users and METRICS_ALLOWED_IPS
+
+    Args:
+        request (HttpRequest): _Django request instance_
+
+    Returns:
+        bool: _metrics are shown_
+    """
+    if request.META.get('REMOTE_ADDR') in METRICS_ALLOWED_IPS:
+        return True
+    user = getattr(request, 'user', None)  # missing if a middleware answered before AuthenticationMiddleware
+    return bool(user and user.is_staff)
+
+
+class MetricsMiddleware:
+    """Collect request timings into metrics and the Server-Timing header of metrics clients"""
+
+    def __init__(self, get_response: Callable) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        started = perf_counter()
+        with request_timings() as timings, connection.execute_wrapper(self._time_query):
+            response = self.get_response(request)
+        elapsed = perf_counter() - started
+        match = request.resolver_match
+        VIEW_DURATION.observe(
+            elapsed, view=match.view_name if match else 'unresolved', method=request.method, status=response.status_code
+        )
+        if is_metrics_client(request):  # timings tell which pages are cached and how slow GitHub is
+            response['Server-Timing'] = server_timing(timings, elapsed)
+        return response
+
+    @staticmethod
+    def _time_query(execute: Callable, sql: str, params: Any, many: bool, context: dict) -> Any:
+        """Database execute wrapper"""
+        with timed('db', DB_DURATION):
+            return execute(sql, params, many, context)
+
+
+class ProfilingMiddleware:
+    """Profile PROFILE_SAMPLE_RATE of requests to PROFILE_VIEWS and staff requests with ?profile=1"""
+
+    def __init__(self, get_response: Callable) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        response = self.get_response(request)
+        if profiler := getattr(request, '_profiler', None):
+            profiler.stop()
+            self._save_profile(request, response, profiler)
+        return response
+
+    def process_view(self, request: HttpRequest, view_func: Callable, view_args: tuple, view_kwargs: dict) -> None:
+        """Start profiling after the view is resolved, so the profile covers the view and template rendering"""
+        requested = request.GET.get('profile') == '1' and request.user.is_staff
+        sampled = request.resolver_match.view_name in PROFILE_VIEWS and random.random() < PROFILE_SAMPLE_RATE
+        if requested or sampled:
+            request._profile_started = perf_counter()
+            request._profile_github_calls = self._github_calls()
+            request._profiler = SamplingProfiler(PROFILE_INTERVAL)
+            request._profiler.start()
+
+    @staticmethod
+    def _github_calls() -> int:
+        """Get GitHub requests made by the current request"""
+        timings = get_request_timings() or {}
+        return int(timings.get('github', [0.0, 0])[1])
+
+    def _save_profile(self, request: HttpRequest, response: HttpResponse, profiler: SamplingProfiler) -> None:
+        """Store the profile and keep PROFILE_KEEP latest ones"""
+        try:
+            RequestProfile.objects.create(
+                view=request.resolver_match.view_name, path=request.get_full_path()[:4096], method=request.method,
+                status=response.status_code, duration=perf_counter() - request._profile_started,
+                github_calls=self._github_calls() - request._profile_github_calls,
+                samples=profiler.samples, interval=profiler.interval, stacks=profiler.collapsed(),
+            )
+            RequestProfile.prune(PROFILE_KEEP)
+        except DatabaseError as e:
+            logger.error(f'Request profile of {request.path} is not saved - {e}')
+
+
+class SessionStore(db.SessionStore):
+    """Database session store with timed load and save, use as SESSION_ENGINE = 'markhub.instrumentation'"""
+
+    def load(self) -> dict:
+        with timed('session', SESSION_DURATION, operation='load'):
+            return super().load()
+
+    def save(self, must_create: bool = False) -> None:
+        with timed('session', SESSION_DURATION, operation='save'):
+            super().save(must_create)
+
+
+class Template:
+    """Django template with timed rendering"""
+
+    def __init__(self, template: django_backend.Template) -> None:
+        self.template = template
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.template, name)
+
+    def render(self, context=None, request=None) -> str:
+        with timed('template', TEMPLATE_DURATION, template=self.template.origin.template_name or 'string'):
+            return self.template.render(context, request)
+
+
+class DjangoTemplates(django_backend.DjangoTemplates):
+    """Django templates backend with timed rendering of top-level templates"""
+
+    def from_string(self, template_code: str) -> Template:
+        return Template(super().from_string(template_code))
+
+    def get_template(self, template_name: str) -> Template:
+        return Template(super().get_template(template_name))
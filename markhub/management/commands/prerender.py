@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+from github import GithubException
+
+from markhub.management.utils import get_target_repository
+from markhub.services.prerender import PrerenderStats, prerender
+from markhub.settings import PRERENDER_FETCH_CONCURRENCY, PRERENDER_PROCESSES
+
+
+class Command(BaseCommand):
+    help = 'Render all markdown files of a repository or directory into the render cache'
+
+    def add_arguments(self, parser):
+        parser.add_argument('target', help='<user>/<repo>@<branch>, the default branch if @<branch> is omitted')
+        parser.add_argument('path', nargs='?', default='', help='directory to prerender (repository root by default)')
+        parser.add_argument('--concurrency', type=int, default=PRERENDER_FETCH_CONCURRENCY,
+                            help='max concurrent GitHub fetches')
+        parser.add_argument('--processes', type=int, default=PRERENDER_PROCESSES,
+                            help='render processes (CPU count by default)')
+
+    def handle(self, *args, **options):
+        token, handler, branch = get_target_repository(options['target'])
+        try:
+            stats = prerender(token, handler, branch, options['path'], progress=self._progress,
+                              concurrency=options['concurrency'], processes=options['processes'])
+        except GithubException as e:
+            raise CommandError(f'GitHub error - {e}')
+        self.stdout.write(self.style.SUCCESS(f'{handler.full_name}@{branch}: {stats}'))
+
+    def _progress(self, path: str, stats: PrerenderStats) -> None:
+        """Write prerendering progress"""
+        self.stdout.write(
+            f'[{stats.done}/{stats.total}] {path} - '
+            f'{stats.files_per_second:.1f} files/s, {stats.mb_per_second:.2f} MB/s'
+        )
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand, CommandError
+from github import GithubException
+
+from markhub.management.utils import get_target_repository
+from markhub.services.search_index import update_search_index
+
+
+class Command(BaseCommand):
+    help = 'Build or incrementally update the full-text search index of a repository branch'
+
+    def add_arguments(self, parser):
+        parser.add_argument('target', help='<user>/<repo>@<branch>, the default branch if @<branch> is omitted')
+
+    def handle(self, *args, **options):
+        _, handler, branch = get_target_repository(options['target'])
+        try:
+            stats = update_search_index(handler, branch)
+        except GithubException as e:
+            raise CommandError(f'GitHub error - {e}')
+        self.stdout.write(self.style.SUCCESS(f'{handler.full_name}@{branch}: {stats}'))
@@ -0,0 +1,33 @@
+from pathlib import Path
+from urllib.error import URLError
+from urllib.request import urlopen
+
+from django.core.management.base import BaseCommand, CommandError
+
+from markhub.settings import BASE_DIR, VENDOR_ASSETS
+
+VENDOR_ROOT = BASE_DIR / 'static'
+DOWNLOAD_TIMEOUT = 30  # seconds
+
+
+class Command(BaseCommand):
+    help = 'Download the pinned CDN assets of VENDOR_ASSETS into static/ to be bundled and served locally'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='download assets which are downloaded yet')
+
+    def handle(self, *args, **options):
+        for path, url in VENDOR_ASSETS.items():
+            target = Path(VENDOR_ROOT, path)
+            if target.is_file() and not options['force']:
+                self.stdout.write(f'{path} - downloaded yet')
+                continue
+            try:
+                with urlopen(url, timeout=DOWNLOAD_TIMEOUT) as response:
+                    content = response.read()
+            except (URLError, OSError) as e:
+                raise CommandError(f'{url} download error - {e}')
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_bytes(content)
+            self.stdout.write(f'{path} - {len(content) / 1024:.1f} KB from {url}')
+        self.stdout.write(self.style.SUCCESS(f'{len(VENDOR_ASSETS)} vendored assets in {VENDOR_ROOT}'))
@@ -0,0 +1,39 @@
+import re
+from typing import Tuple
+
+from django.contrib.auth.models import User
+from django.core.management.base import CommandError
+from github import GithubException
+from github.Repository import Repository
+
+from markhub.services.github_repository import get_github, get_github_token
+
+TARGET_PATTERN = re.compile(r'^(?P<username>[-a-zA-Z0-9_\.]+)/(?P<repo>[-a-zA-Z0-9_\.]+)(@(?P<branch>[^/]+))?$')
+
+
+def get_target_repository(target: str) -> Tuple[str, Repository, str]:
+    """Get GitHub repository for command target with the owner's token
+
+    Args:
+        target (str): _<user>/<repo>@<branch>, the default branch if @<branch> is omitted_
+
+    Raises:
+        CommandError: _if target is invalid or repository is not available_
+
+    Returns:
+        Tuple[str, Repository, str]: _token, repository and branch_
+    """
+    if not (match := TARGET_PATTERN.match(target)):
+        raise CommandError(f"Target {target} doesn't match <user>/<repo>@<branch>")
+    username, repo, branch = match.group('username', 'repo', 'branch')
+    try:
+        token = get_github_token(User.objects.get(username=username))
+    except User.DoesNotExist:
+        raise CommandError(f'User {username} not found')
+    if not token:
+        raise CommandError(f'User {username} has no GitHub token')
+    try:
+        handler = get_github(token).get_repo(f'{username}/{repo}')
+    except GithubException as e:
+        raise CommandError(f'GitHub error - {e}')
+    return token, handler, branch or handler.default_branch
@@ -0,0 +1,37 @@
+"""
+Client timezone: `static/js/client-tz.js` stores the browser timezone in the TIMEZONE_COOKIE cookie,
+`TimezoneMiddleware` activates it, so templates render timestamps in the client timezone.
+"""
+from functools import lru_cache
+from typing import Callable, Optional
+
+import pytz
+from django.http.request import HttpRequest
+from django.http.response import HttpResponse
+from django.utils import timezone
+
+TIMEZONE_COOKIE = 'tz'  # the name is used by static/js/client-tz.js
+
+
+@lru_cache(maxsize=64)
+def get_timezone(name: str) -> Optional[pytz.BaseTzInfo]:
+    """Get timezone by IANA name, None for unknown names"""
+    try:
+        return pytz.timezone(name)
+    except pytz.UnknownTimeZoneError:
+        return None
+
+
+class TimezoneMiddleware:
+    """Activate the client timezone of the TIMEZONE_COOKIE cookie, TIME_ZONE without it"""
+
+    def __init__(self, get_response: Callable) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if (name := request.COOKIES.get(TIMEZONE_COOKIE)) and (zone := get_timezone(name)):
+            timezone.activate(zone)
+        try:
+            return self.get_response(request)
+        finally:
+            timezone.deactivate()
@@ -0,0 +1,70 @@
+# Generated by Django 3.2.25 on 2026-10-19 10:20
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+FTS_TABLE = 'markhub_searchdocument_fts'
+
+
+def create_fts_table(apps, schema_editor):
+    """Create FTS5 table for search documents text (SQLite only)"""
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(path, headings, content, tokenize='unicode61')"
+    )
+    schema_editor.execute(
+        f"CREATE TRIGGER {FTS_TABLE}_delete AFTER DELETE ON markhub_searchdocument "
+        f"BEGIN DELETE FROM {FTS_TABLE} WHERE rowid = old.id; END"
+    )
+
+
+def drop_fts_table(apps, schema_editor):
+    """Drop FTS5 table for search documents text (SQLite only)"""
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(f"DROP TRIGGER IF EXISTS {FTS_TABLE}_delete")
+    schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('markhub', '0003_privatepublish_toc'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchIndex',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('user', models.CharField(max_length=39, verbose_name='Username')),
+                ('repo', models.TextField(max_length=100, verbose_name='Repository name')),
+                ('branch', models.TextField(max_length=255, verbose_name='Branch name')),
+                ('commit', models.CharField(blank=True, max_length=40, verbose_name='Indexed commit SHA')),
+                ('updated', models.DateTimeField(auto_now=True, verbose_name='Update time')),
+            ],
+            options={
+                'verbose_name': 'Search index',
+                'verbose_name_plural': 'Search indexes',
+                'ordering': ['user', 'repo', 'branch'],
+                'unique_together': {('user', 'repo', 'branch')},
+            },
+        ),
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('path', models.TextField(max_length=4096, verbose_name='File path')),
+                ('sha', models.CharField(max_length=40, verbose_name='Blob SHA')),
+                ('index', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='documents', to='markhub.searchindex', verbose_name='Search index')),
+            ],
+            options={
+                'verbose_name': 'Search document',
+                'verbose_name_plural': 'Search documents',
+                'ordering': ['index', 'path'],
+                'unique_together': {('index', 'path')},
+            },
+        ),
+        migrations.RunPython(create_fts_table, drop_fts_table),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 3.2.25 on 2026-10-19 10:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('markhub', '0004_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RequestProfile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('view', models.CharField(max_length=100, verbose_name='View name')),
+                ('path', models.TextField(max_length=4096, verbose_name='Request path')),
+                ('method', models.CharField(max_length=10, verbose_name='Request method')),
+                ('status', models.PositiveSmallIntegerField(verbose_name='Response status')),
+                ('duration', models.FloatField(verbose_name='Duration, seconds')),
+                ('github_calls', models.PositiveIntegerField(default=0, verbose_name='GitHub requests')),
+                ('samples', models.PositiveIntegerField(default=0, verbose_name='Stack samples')),
+                ('interval', models.FloatField(verbose_name='Sampling interval, seconds')),
+                ('stacks', models.TextField(blank=True, verbose_name='Collapsed stacks')),
+                ('created', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='Profiling time')),
+            ],
+            options={
+                'verbose_name': 'Request profile',
+                'verbose_name_plural': 'Request profiles',
+                'ordering': ['-duration'],
+                'get_latest_by': 'created',
+            },
+        ),
+    ]
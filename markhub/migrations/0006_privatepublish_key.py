@@ -0,0 +1,53 @@
+from hashlib import sha256
+
+from django.db import migrations, models
+
+BATCH_SIZE = 500
+
+
+def make_key(user, repo, branch, path):
+    """PrivatePublish.make_key at the time of the migration"""
+    return sha256('\0'.join([user, repo, branch, path]).encode('UTF-8')).hexdigest()
+
+
+def fill_keys(apps, schema_editor):
+    """Fill lookup keys of the published files"""
+    PrivatePublish = apps.get_model('markhub', 'PrivatePublish')
+    published_files = []
+    for published_file in PrivatePublish.objects.only('user', 'repo', 'branch', 'path').order_by('pk').iterator():
+        published_file.key = make_key(published_file.user, published_file.repo, published_file.branch,
+                                      published_file.path)
+        published_files.append(published_file)
+        if len(published_files) == BATCH_SIZE:
+            PrivatePublish.objects.bulk_update(published_files, ['key'])
+            published_files = []
+    PrivatePublish.objects.bulk_update(published_files, ['key'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('markhub', '0005_request_profile'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='privatepublish',
+            name='key',
+            field=models.CharField(editable=False, max_length=64, null=True, verbose_name='Lookup key'),
+        ),
+        migrations.RunPython(fill_keys, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='privatepublish',
+            name='key',
+            field=models.CharField(editable=False, max_length=64, unique=True, verbose_name='Lookup key'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='privatepublish',
+            unique_together=set(),
+        ),
+        migrations.AlterIndexTogether(
+            name='privatepublish',
+            index_together={('user', 'repo', 'branch')},
+        ),
+    ]
@@ -0,0 +1,47 @@
+import posixpath
+import re
+from urllib.parse import unquote, urlsplit
+
+from django.db import migrations, models
+
+IMG_SRC_RE = re.compile(r'(<img\b[^>]*?\bsrc=")([^"]*)(")', re.IGNORECASE)
+
+
+def get_relative_images(html, directory):
+    """markhub.services.assets.get_relative_images at the time of the migration"""
+    paths = []
+    for match in IMG_SRC_RE.finditer(html):
+        src = match.group(2).replace('&amp;', '&')
+        parts = urlsplit(src)
+        if not parts.path or parts.scheme or parts.netloc or src.startswith(('/', '#')):
+            continue
+        path = posixpath.normpath(posixpath.join(directory, unquote(parts.path)))
+        if path not in ('.', '..') and not path.startswith('../') and path not in paths:
+            paths.append(path)
+    return paths
+
+
+def fill_images(apps, schema_editor):
+    """Fill relative image paths of the published files"""
+    PrivatePublish = apps.get_model('markhub', 'PrivatePublish')
+    for published_file in PrivatePublish.objects.only('path', 'content').iterator():
+        directory = posixpath.dirname(published_file.path)
+        if images := get_relative_images(published_file.content or '', directory):
+            published_file.images = '\n'.join(images)
+            published_file.save(update_fields=['images'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('markhub', '0006_privatepublish_key'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='privatepublish',
+            name='images',
+            field=models.TextField(blank=True, default='', verbose_name='Relative image paths'),
+        ),
+        migrations.RunPython(fill_images, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,52 @@
+import re
+from html import unescape
+
+from django.db import migrations
+
+ALLOWED_URL_SCHEMES = [
+    "file", "ftp", "ftps", "http", "https", "irc", "mailto",
+    "sftp", "ssh", "tel", "telnet", "tftp", "vnc", "xmpp",
+]
+HTML_TAG = re.compile(r'<[a-zA-Z][^<>]*>')
+URL_ATTRIBUTE = re.compile(r'\s(href|src|srcset)="([^"]*)"', re.IGNORECASE)
+URL_SCHEME = re.compile(r'([^/?#]*):')
+URL_IGNORED = re.compile(r'[\x00-\x20\x7f]')
+
+
+def is_allowed_url(url):
+    """markhub.services.markdown_render.is_allowed_url at the time of the migration"""
+    scheme = URL_SCHEME.match(URL_IGNORED.sub('', unescape(url)))
+    return scheme is None or scheme.group(1).lower() in ALLOWED_URL_SCHEMES
+
+
+def sanitize_attribute(match):
+    name, value = match.groups()
+    urls = [candidate.split()[0] for candidate in value.split(',') if candidate.strip()] \
+        if name.lower() == 'srcset' else [value]
+    return match.group(0) if all(is_allowed_url(url) for url in urls) else ''
+
+
+def sanitize_urls(html):
+    """markhub.services.markdown_render.sanitize_urls at the time of the migration"""
+    return HTML_TAG.sub(lambda tag: URL_ATTRIBUTE.sub(sanitize_attribute, tag.group(0)), html)
+
+
+def sanitize_contents(apps, schema_editor):
+    """Drop unsafe URLs from the rendered contents of the published files"""
+    PrivatePublish = apps.get_model('markhub', 'PrivatePublish')
+    for published_file in PrivatePublish.objects.only('content').iterator():
+        content = sanitize_urls(published_file.content or '')
+        if content != (published_file.content or ''):
+            published_file.content = content
+            published_file.save(update_fields=['content'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('markhub', '0007_privatepublish_images'),
+    ]
+
+    operations = [
+        migrations.RunPython(sanitize_contents, migrations.RunPython.noop),
+    ]
@@ -1,10 +1,15 @@
-from typing import Optional
+from datetime import datetime
+from hashlib import md5, sha256
+from pathlib import PurePosixPath
+from typing import Dict, Iterable, List, Optional
 
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.db import models
 from django.urls import reverse
 
-from .services.markdown_render import markdownify
+from .services.metrics import cache_stats
+from .settings import PUBLISHED_FILES_CACHE_TIMEOUT
 
 
 class PrivatePublish(models.Model):
@@ -22,11 +27,15 @@ class PrivatePublish(models.Model):
     content = models.TextField(null=True, blank=True, verbose_name='Markdown content')
     toc = models.TextField(null=True, blank=True, verbose_name='Markdown content TOC')
     owner = models.ForeignKey(User, on_delete=models.CASCADE, verbose_name="User - Repository owner")
+    # Repository paths of relative images of the content, one per line, the image proxy fetches only them
+    # with the owner's token
+    images = models.TextField(blank=True, default='', verbose_name='Relative image paths')
+    # SHA-256 of user, repo, branch and path, files are looked up by the fixed width key instead of the TEXT columns
+    key = models.CharField(max_length=64, unique=True, editable=False, verbose_name='Lookup key')
 
     class Meta:
         get_latest_by = 'published'
-        index_together = ['user', 'repo', 'branch', 'path']
-        unique_together = ['user', 'repo', 'branch', 'path']
+        index_together = ['user', 'repo', 'branch']  # files of the branch for lookup_owner
         ordering = ['user', 'repo', 'branch', 'path']
         verbose_name = 'Published file'
         verbose_name_plural = 'Published files'
@@ -42,6 +51,48 @@ class PrivatePublish(models.Model):
         """
         return '/'.join([self.user, self.repo, self.branch, self.path])
     
+    def save(self, *args, **kwargs) -> None:
+        """Save instance with the lookup key of its user, repo, branch and path"""
+        self.key = self.make_key(self.user, self.repo, self.branch, self.path)
+        super().save(*args, **kwargs)
+        cache.delete(self.get_directory_cache_key(self.user, self.repo, self.branch, self.path))
+
+    def delete(self, *args, **kwargs):
+        """Delete instance, bulk deletes leave publish times of the directory cached for PUBLISHED_FILES_CACHE_TIMEOUT"""
+        cache.delete(self.get_directory_cache_key(self.user, self.repo, self.branch, self.path))
+        return super().delete(*args, **kwargs)
+
+    @staticmethod
+    def make_key(user: str, repo: str, branch: str, path: str) -> str:
+        """Make lookup key of the published file
+
+        Args:
+            user (str): _repository owner_
+            repo (str): _repository name_
+            branch (str): _branch name_
+            path (str): _file path_
+
+        Returns:
+            str: _hex SHA-256 of the NUL separated parts, NUL is not allowed in git names_
+        """
+        return sha256('\0'.join([user, repo, branch, path]).encode('UTF-8')).hexdigest()
+
+    @classmethod
+    def get_directory_cache_key(cls, user: str, repo: str, branch: str, path: str) -> str:
+        """Get cache key of publish times of the directory files
+
+        Args:
+            user (str): _repository owner_
+            repo (str): _repository name_
+            branch (str): _branch name_
+            path (str): _path of a file in the directory_
+
+        Returns:
+            str: _cache key_
+        """
+        directory = str(PurePosixPath(path).parent)
+        return 'published:' + cls.make_key(user, repo, branch, '' if directory == '.' else directory)
+
     def get_absolute_url(self):
         """Get absolute url for the published file
 
@@ -64,16 +115,85 @@ class PrivatePublish(models.Model):
         Returns:
             Optional[PrivatePublish]: PrivatePublish instance is published or None
         """
+        if not context.get('username'):
+            return None
         try:
             return cls.objects.get(
-                user=context.get('username'),
-                repo=context['repo'],
-                branch=context['branch'],
-                path=context['path']
+                key=cls.make_key(context['username'], context['repo'], context['branch'], context['path'])
             )
         except cls.DoesNotExist as e:
             return None
+
+    @classmethod
+    def lookup_published_files(cls, context: dict, paths: Iterable[str]) -> Dict[str, 'PrivatePublish']:
+        """Lookup for published files of the repository branch with one query, without content and toc
+
+        Args:
+            context (dict): context dict with request parameters
+            paths (Iterable[str]): file paths
+
+        Returns:
+            Dict[str, PrivatePublish]: PrivatePublish instances of the published files by path
+        """
+        if not context.get('username'):
+            return {}
+        keys = [cls.make_key(context['username'], context['repo'], context['branch'], path) for path in paths]
+        if not keys:
+            return {}
+        return {
+            published_file.path: published_file
+            for published_file in cls.objects.filter(key__in=keys).defer('content', 'toc').order_by()
+        }
     
+    @classmethod
+    def lookup_publish_times(cls, context: dict, paths: List[str]) -> Dict[str, datetime]:
+        """Lookup for publish times of files of one directory with one query, cached until a file of the directory
+        is published or unpublished or the paths change
+
+        Args:
+            context (dict): context dict with request parameters
+            paths (List[str]): file paths in one directory
+
+        Returns:
+            Dict[str, datetime]: publish times of the published files by path
+        """
+        if not paths or not context.get('username'):
+            return {}
+        key = cls.get_directory_cache_key(context['username'], context['repo'], context['branch'], paths[0])
+        digest = md5('\0'.join(sorted(paths)).encode('UTF-8')).hexdigest()
+        cached = cache.get(key)
+        cache_stats.hit('published', cached is not None and cached[0] == digest)
+        if cached is not None and cached[0] == digest:
+            return cached[1]
+        publish_times = {
+            path: published_file.published
+            for path, published_file in sorted(cls.lookup_published_files(context, paths).items())
+        }
+        cache.set(key, (digest, publish_times), PUBLISHED_FILES_CACHE_TIMEOUT)
+        return publish_times
+
+    @classmethod
+    def lookup_owner(cls, context: dict, image: str) -> Optional[User]:
+        """Lookup for the owner of a file published from the repository branch with the image
+
+        Args:
+            context (dict): context dict with request parameters
+            image (str): image path in the repository
+
+        Returns:
+            Optional[User]: repository owner if a published file of the branch shows the image or None
+        """
+        published_files = cls.objects.filter(
+            user=context.get('username'),
+            repo=context['repo'],
+            branch=context['branch'],
+            images__contains=image,
+        ).only('images', 'owner').select_related('owner')
+        for published_file in published_files:
+            if image in published_file.images.split('\n'):
+                return published_file.owner
+        return None
+
     @classmethod
     def publish_file(cls, context: dict) -> Optional['PrivatePublish']:
         """Publish file or republish if it was published yet
@@ -84,12 +204,122 @@ class PrivatePublish(models.Model):
         Returns:
             Optional[PrivatePublish]: PrivatePublish instance is published or None
         """
+        from .services.assets import get_relative_images
+        from .services.render_pool import MARKDOWNIFY, RenderLimitError, plain_text, render
+
         if published_file := cls.lookup_published_file(context):
             published_file.delete()
-        content, toc = markdownify(context['content'])
+        try:
+            content, toc = render(MARKDOWNIFY, context['content'], wait=None)  # publishing waits for a free process
+        except RenderLimitError:
+            content, toc = plain_text(context['content']), ''
         published_file = PrivatePublish(
             user=context['username'], repo=context['repo'], branch=context['branch'], path=context['path'],
-            content=content, toc=toc, owner=context['owner']
+            content=content, toc=toc, owner=context['owner'],
+            images='\n'.join(get_relative_images(content, str(PurePosixPath(context['path']).parent))),
         )
         published_file.save()
         return published_file
+
+
+class SearchIndex(models.Model):
+    """Full-text search index state of the repository branch"""
+
+    user = models.CharField(max_length=39, verbose_name='Username')
+    repo = models.TextField(max_length=100, verbose_name='Repository name')
+    branch = models.TextField(max_length=255, verbose_name='Branch name')
+    commit = models.CharField(max_length=40, blank=True, verbose_name='Indexed commit SHA')
+    updated = models.DateTimeField(auto_now=True, verbose_name='Update time')
+
+    class Meta:
+        unique_together = ['user', 'repo', 'branch']
+        ordering = ['user', 'repo', 'branch']
+        verbose_name = 'Search index'
+        verbose_name_plural = 'Search indexes'
+
+    def __str__(self) -> str:
+        """String instance representation
+
+        Returns:
+            _str_: _string instance representation_
+        """
+        return f'{self.user}/{self.repo}@{self.branch}'
+
+    @classmethod
+    def lookup_index(cls, context: dict) -> Optional['SearchIndex']:
+        """Lookup for the repository branch search index
+
+        Args:
+            context (dict): context dict with request parameters
+
+        Returns:
+            Optional[SearchIndex]: SearchIndex instance if the branch is indexed or None
+        """
+        return cls.objects.filter(
+            user=context.get('username'),
+            repo=context['repo'],
+            branch=context['branch'],
+        ).first()
+
+
+class SearchDocument(models.Model):
+    """Indexed markdown file, its text is stored in the FTS5 table with the same rowid"""
+
+    index = models.ForeignKey(SearchIndex, on_delete=models.CASCADE, related_name='documents',
+                              verbose_name='Search index')
+    path = models.TextField(max_length=4096, verbose_name='File path')
+    sha = models.CharField(max_length=40, verbose_name='Blob SHA')
+
+    class Meta:
+        unique_together = ['index', 'path']
+        ordering = ['index', 'path']
+        verbose_name = 'Search document'
+        verbose_name_plural = 'Search documents'
+
+    def __str__(self) -> str:
+        """String instance representation
+
+        Returns:
+            _str_: _string instance representation_
+        """
+        return f'{self.index}/{self.path}'
+
+
+class RequestProfile(models.Model):
+    """Sampled stacks of a profiled request"""
+
+    view = models.CharField(max_length=100, verbose_name='View name')
+    path = models.TextField(max_length=4096, verbose_name='Request path')
+    method = models.CharField(max_length=10, verbose_name='Request method')
+    status = models.PositiveSmallIntegerField(verbose_name='Response status')
+    duration = models.FloatField(verbose_name='Duration, seconds')
+    github_calls = models.PositiveIntegerField(default=0, verbose_name='GitHub requests')
+    samples = models.PositiveIntegerField(default=0, verbose_name='Stack samples')
+    interval = models.FloatField(verbose_name='Sampling interval, seconds')
+    stacks = models.TextField(blank=True, verbose_name='Collapsed stacks')
+    created = models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='Profiling time')
+
+    class Meta:
+        get_latest_by = 'created'
+        ordering = ['-duration']
+        verbose_name = 'Request profile'
+        verbose_name_plural = 'Request profiles'
+
+    def __str__(self) -> str:
+        """String instance representation
+
+        Returns:
+            _str_: _string instance representation_
+        """
+        return f'{self.method} {self.path} ({self.duration * 1000:.0f} ms)'
+
+    @classmethod
+    def prune(cls, keep: int) -> None:
+        """Delete all but the latest profiles
+
+        Args:
+            keep (int): _number of kept profiles_
+        """
+        latest = cls.objects.order_by('-created').values_list('created', flat=True)[keep:keep + 1]
+        if latest:
+            cls.objects.filter(created__lte=latest[0]).delete()
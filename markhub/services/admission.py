@@ -0,0 +1,109 @@
+"""
+Admission control of public share pages.
+
+Share pages need no login, and a page which is not cached costs a GitHub request and a render.
+Requests take tokens from token buckets in the shared cache, so limits hold across web workers:
+every page takes one token of its client IP bucket, uncached pages take SHARE_MISS_COST client tokens
+and a token of the shared repository bucket. Cached pages are admitted while the render queue is full,
+uncached pages are shed with 503 once SHARE_MAX_RENDER_QUEUE renders wait for a free render process.
+"""
+from hashlib import md5
+from math import ceil
+from time import time
+
+from django.core.cache import cache
+from django.http.request import HttpRequest
+from django.http.response import HttpResponse
+
+from markhub.settings import (RATE_LIMIT_PROXY_COUNT, RENDER_QUEUE_TIMEOUT,
+                              SHARE_CLIENT_BURST, SHARE_CLIENT_RATE,
+                              SHARE_MAX_RENDER_QUEUE, SHARE_MISS_COST,
+                              SHARE_TARGET_BURST, SHARE_TARGET_RATE, logger)
+
+from .render_pool import render_queue_depth
+
+
+class Throttled(Exception):
+    """Request is not admitted"""
+
+    def __init__(self, status: int, retry_after: float, message: str) -> None:
+        """Create error
+
+        Args:
+            status (int): _429 for rate limits, 503 for load shedding_
+            retry_after (float): _seconds until the request may be admitted_
+            message (str): _error message_
+        """
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+    def response(self) -> HttpResponse:
+        """Get the error response with the Retry-After header"""
+        response = HttpResponse(str(self), status=self.status, content_type='text/plain')
+        response['Retry-After'] = str(max(1, ceil(self.retry_after)))
+        return response
+
+
+def get_client_ip(request: HttpRequest) -> str:
+    """Get client IP from X-Forwarded-For of RATE_LIMIT_PROXY_COUNT trusted proxies or REMOTE_ADDR
+
+    Args:
+        request (HttpRequest): _Django request instance_
+
+    Returns:
+        str: _client IP_
+    """
+    if RATE_LIMIT_PROXY_COUNT:
+        forwarded = [ip.strip() for ip in request.META.get('HTTP_X_FORWARDED_FOR', '').split(',') if ip.strip()]
+        if len(forwarded) >= RATE_LIMIT_PROXY_COUNT:
+            return forwarded[-RATE_LIMIT_PROXY_COUNT]
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def take_tokens(scope: str, identifier: str, rate: float, burst: int, cost: float = 1) -> float:
+    """Take tokens from the bucket in the shared cache, the bucket is left as is without enough tokens
+
+    Buckets are read and written without a lock, so concurrent requests may take the same tokens.
+
+    Args:
+        scope (str): _bucket scope_
+        identifier (str): _bucket identifier in the scope_
+        rate (float): _tokens added per second_
+        burst (int): _bucket size_
+        cost (float): _tokens to take_
+
+    Returns:
+        float: _0 if tokens are taken, otherwise seconds until the bucket has enough tokens_
+    """
+    key = f'ratelimit:{scope}:{md5(identifier.encode()).hexdigest()}'
+    now = time()
+    tokens, updated = cache.get(key) or (burst, now)
+    tokens = min(burst, tokens + (now - updated) * rate)
+    if tokens < cost:
+        return (cost - tokens) / rate
+    cache.set(key, (tokens - cost, now), ceil(burst / rate))  # full buckets are dropped
+    return 0.0
+
+
+def admit_share(request: HttpRequest, target: str, cached: bool) -> None:
+    """Admit share page request
+
+    Args:
+        request (HttpRequest): _Django request instance_
+        target (str): _shared repository, '<username>/<repo>'_
+        cached (bool): _page is shown without GitHub requests and renders_
+
+    Raises:
+        Throttled: _request is not admitted_
+    """
+    if not cached and (depth := render_queue_depth()) >= SHARE_MAX_RENDER_QUEUE:
+        logger.warning(f"Share page of {target} is shed - {depth} renders are waiting")
+        raise Throttled(503, RENDER_QUEUE_TIMEOUT, 'Server is busy, try again later')
+    client = get_client_ip(request)
+    if wait := take_tokens('client', client, SHARE_CLIENT_RATE, SHARE_CLIENT_BURST, 1 if cached else SHARE_MISS_COST):
+        logger.warning(f"Share page of {target} is rate limited for {client}")
+        raise Throttled(429, wait, 'Too many requests, try again later')
+    if not cached and (wait := take_tokens('target', target, SHARE_TARGET_RATE, SHARE_TARGET_BURST)):
+        logger.warning(f"Share page of {target} is rate limited for the repository")
+        raise Throttled(429, wait, 'Too many requests, try again later')
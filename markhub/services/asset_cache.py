@@ -0,0 +1,118 @@
+import os
+import re
+import threading
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import Optional
+
+from markhub.settings import ASSET_CACHE_DIR, ASSET_CACHE_SIZE, logger
+
+BLOB_SHA = re.compile('[0-9a-f]{40}')
+
+
+def is_blob_sha(value: Optional[str]) -> bool:
+    """Check if the value is a hex git blob SHA, the only names the cache reads and writes"""
+    return bool(value) and BLOB_SHA.fullmatch(value) is not None
+
+
+class AssetCache:
+    """Size limited disk cache of repository blobs keyed by blob SHA
+
+    Blobs are immutable, so entries never go stale. Reads update the file mtime,
+    the least recently used files are evicted when the cache grows over its size.
+    """
+
+    EVICT_TO = 0.9  # share of max size left after eviction
+
+    def __init__(self, directory: Path, max_size: int) -> None:
+        """Create cache in the directory
+
+        Args:
+            directory (Path): _cache directory_
+            max_size (int): _max cache size in bytes_
+        """
+        self.directory = Path(directory)
+        self.max_size = max_size
+        self._size: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _path(self, sha: str) -> Path:
+        """Get blob file path, blobs are spread over subdirectories like in git objects
+
+        Raises:
+            ValueError: _not a blob SHA, other names could point outside the cache directory_
+        """
+        if not is_blob_sha(sha):
+            raise ValueError(f'Not a blob SHA - {sha!r}')
+        return self.directory / sha[:2] / sha[2:]
+
+    def __contains__(self, sha: str) -> bool:
+        """Check if the blob is cached"""
+        return is_blob_sha(sha) and self._path(sha).is_file()
+
+    def get(self, sha: str) -> Optional[bytes]:
+        """Get cached blob and mark it as recently used
+
+        Args:
+            sha (str): _blob SHA_
+
+        Returns:
+            Optional[bytes]: _blob content or None if it is not cached or not a blob SHA_
+        """
+        if not is_blob_sha(sha):
+            return None
+        path = self._path(sha)
+        try:
+            content = path.read_bytes()
+            os.utime(path)
+            return content
+        except OSError:
+            return None
+
+    def set(self, sha: str, content: bytes) -> None:
+        """Put blob into the cache, evict least recently used blobs if the cache is full
+
+        Args:
+            sha (str): _blob SHA_
+            content (bytes): _blob content_
+
+        Raises:
+            ValueError: _not a blob SHA_
+        """
+        path = self._path(sha)
+        if path.is_file():
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with NamedTemporaryFile(dir=path.parent, delete=False) as temp:
+            temp.write(content)
+        os.replace(temp.name, path)
+        with self._lock:
+            if self._size is None:
+                self._size = sum(item.stat().st_size for item in self._files())
+            else:
+                self._size += len(content)
+            if self._size > self.max_size:
+                self._evict()
+
+    def _files(self):
+        """Iterate over cached blob files"""
+        return (item for item in self.directory.glob('??/*') if item.is_file())
+
+    def _evict(self) -> None:
+        """Remove least recently used blobs down to EVICT_TO of max size"""
+        files = sorted(((item.stat(), item) for item in self._files()), key=lambda item: item[0].st_mtime)
+        self._size = sum(stat.st_size for stat, _ in files)
+        removed = 0
+        for stat, item in files:
+            if self._size <= self.max_size * self.EVICT_TO:
+                break
+            try:
+                item.unlink()
+                self._size -= stat.st_size
+                removed += 1
+            except OSError as e:
+                logger.error(f"Asset cache file {item} is not removed - {e}")
+        logger.info(f"Asset cache evicted {removed} blobs, {self._size} bytes left")
+
+
+asset_cache = AssetCache(ASSET_CACHE_DIR, ASSET_CACHE_SIZE)
@@ -0,0 +1,128 @@
+import posixpath
+import re
+from base64 import b64decode
+from hashlib import sha1
+from typing import List, Optional, Tuple
+from urllib.parse import unquote, urlsplit
+
+from django.contrib.auth.models import User
+from django.urls import reverse
+from django.utils.html import escape
+
+from markhub.models import PrivatePublish
+
+from .github_repository import get_github, get_github_token
+
+IMG_SRC_RE = re.compile(r'(<img\b[^>]*?\bsrc=")([^"]*)(")', re.IGNORECASE)
+
+
+def resolve_relative_path(src: str, directory: str) -> Optional[str]:
+    """Resolve relative image link against the markdown file directory like GitHub does
+
+    Args:
+        src (str): _image link from rendered html_
+        directory (str): _markdown file directory in repository, '' for root_
+
+    Returns:
+        Optional[str]: _repository path or None if the link is not relative or escapes the repository_
+    """
+    parts = urlsplit(src)
+    if not parts.path or parts.scheme or parts.netloc or src.startswith(('/', '#')):
+        return None
+    path = posixpath.normpath(posixpath.join(directory, unquote(parts.path)))
+    if path == '.' or path.startswith('../') or path == '..':
+        return None
+    return path
+
+
+def get_relative_images(html: str, directory: str = '') -> List[str]:
+    """Get repository paths of relative images of rendered markdown
+
+    Args:
+        html (str): _rendered markdown_
+        directory (str): _markdown file directory in repository, '' or '.' for root_
+
+    Returns:
+        List[str]: _image paths in repository without duplicates_
+    """
+    directory = '' if directory == '.' else directory
+    paths = (
+        resolve_relative_path(match.group(2).replace('&amp;', '&'), directory) for match in IMG_SRC_RE.finditer(html)
+    )
+    return list(dict.fromkeys(path for path in paths if path))
+
+
+def rewrite_relative_images(html: str, username: str, repo: str, branch: str, directory: str = '') -> str:
+    """Rewrite relative image links of rendered markdown to the MarkHub asset proxy
+
+    Args:
+        html (str): _rendered markdown_
+        username (str): _repository owner_
+        repo (str): _repository name_
+        branch (str): _repository branch_
+        directory (str): _markdown file directory in repository, '' for root_
+
+    Returns:
+        str: _html with proxied image links_
+    """
+    def replace(match: re.Match) -> str:
+        path = resolve_relative_path(match.group(2).replace('&amp;', '&'), directory)
+        if path is None:
+            return match.group(0)
+        url = reverse('asset', kwargs={'username': username, 'repo': repo, 'branch': branch, 'path': path})
+        return f'{match.group(1)}{escape(url)}{match.group(3)}'
+
+    return IMG_SRC_RE.sub(replace, html) if '<img' in html else html
+
+
+def git_blob_sha(content: bytes) -> str:
+    """Get git blob SHA of the content
+
+    Args:
+        content (bytes): _file content_
+
+    Returns:
+        str: _blob SHA as in git trees_
+    """
+    return sha1(b'blob %d\0' % len(content) + content).hexdigest()
+
+
+def get_asset_token(user: User, username: str, repo: str, branch: str, path: str) -> Optional[str]:
+    """Get GitHub token to fetch repository assets: the user's own token,
+    or the publish owner's token for images of published files
+
+    Args:
+        user (User): _request user_
+        username (str): _repository owner_
+        repo (str): _repository name_
+        branch (str): _repository branch_
+        path (str): _image path in repository_
+
+    Returns:
+        Optional[str]: _GitHub access token or None for public fetch_
+    """
+    if user.is_authenticated and user.username == username:
+        return get_github_token(user)
+    if owner := PrivatePublish.lookup_owner({'username': username, 'repo': repo, 'branch': branch}, path):
+        return get_github_token(owner)
+
+
+def fetch_asset(token: str, username: str, repo: str, branch: str, path: str) -> Tuple[str, bytes]:
+    """Fetch repository file via GitHub API
+
+    Args:
+        token (str): _GitHub access token_
+        username (str): _repository owner_
+        repo (str): _repository name_
+        branch (str): _repository branch_
+        path (str): _file path_
+
+    Returns:
+        Tuple[str, bytes]: _blob SHA and content_
+    """
+    handler = get_github(token).get_repo(f'{username}/{repo}', lazy=True)
+    contents = handler.get_contents(path, ref=branch)
+    if contents.encoding == 'base64':
+        return contents.sha, contents.decoded_content
+    # Files over 1 MB come without content
+    return contents.sha, b64decode(handler.get_git_blob(contents.sha).content)
@@ -0,0 +1,53 @@
+"""
+Background jobs: work which must not hold requests runs in a thread pool of the web worker.
+
+Jobs are identified by keys, a job is not submitted again while one with its key waits or runs.
+Results are stored in the cache or the storage, where later requests find them. Up to
+BACKGROUND_QUEUE_SIZE jobs wait per process, other submissions are dropped and made again by later
+requests. With BACKGROUND_WORKERS = 0 jobs run in the calling thread.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Set
+
+from markhub.settings import BACKGROUND_QUEUE_SIZE, BACKGROUND_WORKERS, logger
+
+_executor: Optional[ThreadPoolExecutor] = None
+_pending: Set[str] = set()
+_lock = threading.Lock()
+
+
+def submit(key: str, function: Callable, *args) -> bool:
+    """Run the function in the background unless a job with the key is pending
+
+    Args:
+        key (str): _job key_
+        function (Callable): _job function_
+        *args: _function arguments_
+
+    Returns:
+        bool: _the job is submitted or done_
+    """
+    global _executor
+    if not BACKGROUND_WORKERS:
+        _run(key, function, *args)
+        return True
+    with _lock:
+        if key in _pending or len(_pending) >= BACKGROUND_QUEUE_SIZE:
+            return False
+        if _executor is None:
+            _executor = ThreadPoolExecutor(BACKGROUND_WORKERS, thread_name_prefix='markhub-background')
+        _pending.add(key)
+    _executor.submit(_run, key, function, *args)
+    return True
+
+
+def _run(key: str, function: Callable, *args) -> None:
+    """Run the job and log its errors"""
+    try:
+        function(*args)
+    except Exception as e:
+        logger.error(f"Background job {key} failed - {e}")
+    finally:
+        with _lock:
+            _pending.discard(key)
@@ -1,17 +1,59 @@
-from datetime import datetime
+from base64 import b64encode
+from datetime import datetime, timezone
+from hashlib import sha1
+from itertools import groupby, islice
 from pathlib import Path, PurePosixPath
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
+from urllib.parse import quote
 
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.core.exceptions import PermissionDenied
 from django.http import Http404
 from django.http.request import HttpRequest
 from django.utils.html import format_html
-from github import Github, UnknownObjectException
+from github import (Github, GithubException, InputGitTreeElement,
+                    UnknownObjectException)
+from github.Branch import Branch
+from github.Commit import Commit
 from github.ContentFile import ContentFile
+from github.GitCommit import GitCommit
+from github.PaginatedList import PaginatedList
 from github.Repository import Repository
+from markhub.instrumentation import instrument_github
 from markhub.models import PrivatePublish
-from markhub.settings import log_error_with_404, logger
+from markhub.services.background import submit
+from markhub.services.metrics import cache_stats
+from markhub.services.mirror import (LastCommit, MirrorContent, MirrorError,
+                                     get_mirror)
+from markhub.settings import (BRANCH_CACHE_TIMEOUT, BRANCH_SEARCH_LIMIT,
+                              GITHUB_API_URL, LAST_COMMIT_CACHE_TIMEOUT,
+                              LAST_COMMIT_WALK_LIMIT, REPOSITORY_BACKEND,
+                              log_error_with_404, logger)
+
+instrument_github()  # all GitHub clients are made here, so requests are timed once PyGithub is loaded
+NOT_MIRRORED = object()  # the mirror can't answer, read via the API
+
+
+class CommitConflict(Exception):
+    """File or branch changed since the edit was started, the commit is not made"""
+
+
+def as_utc(date: Optional[datetime]) -> Optional[datetime]:
+    """Make naive UTC dates of PyGithub and mirrors aware, so templates show them in the active timezone"""
+    return date.replace(tzinfo=timezone.utc) if date and date.tzinfo is None else date
+
+
+def get_github(token: Optional[str] = None) -> Github:
+    """ Get github handler for token with GITHUB_API_URL
+
+    Args:
+        token: GitHub access token, anonymous access if None
+
+    Returns:
+        Github object
+    """
+    return Github(token, base_url=GITHUB_API_URL)
 
 
 @logger.catch
@@ -24,11 +66,25 @@ def get_github_handler(user: User) -> Union[Github, None]:
     Returns:
         Github object for user if it has a token, otherwise None
     """
+    if token := get_github_token(user):
+        return get_github(token)
+
+
+def get_github_token(user: User) -> Optional[str]:
+    """ Get github access token for user
+
+    Args:
+        user: Django User
+
+    Returns:
+        GitHub access token if user has it, otherwise None
+    """
     social_account = user.socialaccount_set
     if social_account.exists() and social_account.first().provider == 'github':
         social_login = social_account.first().socialtoken_set
         if social_login.exists():
-            return Github(social_login.first().token)    
+            return social_login.first().token
+
 
 class GitHubRepository:
     """GitHub Repository handler via session"""
@@ -42,7 +98,6 @@ class GitHubRepository:
         """
         if repo_name in request.session:
             self.handler: Repository =  request.session[repo_name]
-            self.branches = request.session[f'{repo_name}__branches']
             self.branch = request.session[f'{repo_name}__current_branch']
         else:
             user: User = request.user
@@ -51,44 +106,130 @@ class GitHubRepository:
                 try:
                     self.handler = g.get_repo(f"{user.username}/{repo_name}")
                     if self.handler:
-                        self.branches: List = [branch.name for branch in self.handler.get_branches()]
                         request.session[repo_name] = self.handler
-                        request.session[f'{repo_name}__branches'] = self.branches
                         self.save_current_branch(request, self.handler.default_branch)
                         logger.info(f"{user.username}/{repo_name} have got from GitHub")
                 except UnknownObjectException as e:
                     log_error_with_404(f"Repository not found - {e}")
+        self.user: User = request.user
         if self.handler:
             self.username = self.handler.owner.login or request.user.username
             request.session['__current_repo__'] = repo_name
 
-    def create_file(self, path: str, content: str, branch: str = '') -> str:
+    def _mirror_read(self, method: str, *args):
+        """Read via the repository mirror with REPOSITORY_BACKEND = 'mirror'
+
+        Args:
+            method (str): RepositoryMirror method name
+            *args: method arguments
+
+        Returns:
+            method result or NOT_MIRRORED if the mirror is disabled or can't answer
+        """
+        if REPOSITORY_BACKEND != 'mirror':
+            return NOT_MIRRORED
+        try:
+            mirror = get_mirror(self.handler.full_name)
+            mirror.ensure_fresh(lambda: get_github_token(self.user))
+            return getattr(mirror, method)(*args)
+        except MirrorError as e:
+            logger.info(f"{e}, reading via the GitHub API")
+            return NOT_MIRRORED
+
+    def _mark_mirror_stale(self) -> None:
+        """Fetch the repository mirror at the next read after a write"""
+        if REPOSITORY_BACKEND == 'mirror':
+            try:
+                get_mirror(self.handler.full_name).mark_stale()
+            except MirrorError:
+                pass
+
+    def commit_files(self, files: Dict[str, bytes], message: str, branch: str = '',
+                     base_shas: Optional[Dict[str, Optional[str]]] = None) -> GitCommit:
+        """Commit several files to the branch with one commit via Git Data API
+
+        Args:
+            files (Dict[str, bytes]): file path: file content
+            message (str): commit message
+            branch (str): repository branch. Defaults to '' (current repository branch)
+            base_shas (Dict[str, Optional[str]]): expected blob SHA of paths in the branch (file path: SHA),
+                None - the path must not exist. Defaults to None
+
+        Raises:
+            CommitConflict: _a path of base_shas differs in the branch or the branch moved during the commit_
+
+        Returns:
+            GitCommit: new commit
+        """
+        branch = branch if branch else self.branch
+        ref = self.handler.get_git_ref(f'heads/{branch}')
+        parent = self.handler.get_git_commit(ref.object.sha)
+        for directory, paths in groupby(sorted(base_shas or {}), lambda item: str(PurePosixPath(item).parent)):
+            entries = _get_tree_entries(self.handler, parent.sha, '' if directory == '.' else directory)
+            for path in paths:
+                if entries.get(PurePosixPath(path).name) == base_shas[path]:
+                    continue
+                if base_shas[path] is None:
+                    raise CommitConflict(f'File {path} already exists in {branch}')
+                raise CommitConflict(f'File {path} was changed in {branch} since it was opened, copy your changes '
+                                     f'and open the file again')
+        tree = self.handler.create_git_tree([
+            InputGitTreeElement(
+                path, '100644', 'blob',
+                sha=self.handler.create_git_blob(b64encode(content).decode('ascii'), 'base64').sha
+            )
+            for path, content in files.items()
+        ], parent.tree)
+        commit = self.handler.create_git_commit(message, tree, [parent])
+        try:
+            ref.edit(commit.sha)
+        except GithubException as e:
+            if e.status != 422:  # not a fast-forward, the branch moved after it was read
+                raise
+            raise CommitConflict(f'Branch {branch} was changed during the commit, save the file again')
+        return commit
+
+    def create_file(self, path: str, content: str, branch: str = '', images: Optional[Dict[str, bytes]] = None) -> str:
         """Create a new file in the repository if success otherwise raise 404 exception
 
         Args:
             path (str): path to the new file
             updated_content (str): new file content
             branch (str): repository branch. Defaults to '' (current repository branch)
+            images (Dict[str, bytes]): images to commit next to the file (file name: content). Defaults to None
+
+        Raises:
+            CommitConflict: _the file exists or the branch moved during the commit_
 
         Returns:
             str: success message in html
         """
         branch = branch if branch else self.branch
+        message = f"Add {PurePosixPath(path).name} at MarkHub"
         try: 
-            status: dict = self.handler.create_file(
-                path=path, 
-                message=f"Add {PurePosixPath(path).name} at MarkHub", 
-                content=content, 
-                branch=branch
-            )
+            if images:
+                commit = self.commit_files(self._with_images(path, content, images), message, branch,
+                                           base_shas={path: None})
+            else:
+                commit = self.handler.create_file(
+                    path=path, 
+                    message=message, 
+                    content=content, 
+                    branch=branch
+                )["commit"]
+            self._mark_mirror_stale()
             return format_html(
                 'File {} was successfully created with commit <a href="{}" target="_blank">{}</a>.',
                 path,
-                status["commit"].html_url,
-                status["commit"].sha[:7]
+                commit.html_url,
+                commit.sha[:7]
             )
         except UnknownObjectException as e:
             log_error_with_404(f"File not created - {e}")
+        except GithubException as e:
+            if e.status != 422:  # the contents API asks for the SHA of an existing file
+                raise
+            raise CommitConflict(f'File {path} already exists in {branch}')
     
     def delete_file(self, path: str, branch: str = '') -> str:
         """Delete a file in the repository if success otherwise raise 404 exception
@@ -109,6 +250,7 @@ class GitHubRepository:
                 contents.sha, 
                 branch
             )
+            self._mark_mirror_stale()
             return format_html(
                     'File {} was successfully deleted with commit <a href="{}" target="_blank">{}</a>.',
                     path,
@@ -118,7 +260,7 @@ class GitHubRepository:
         except UnknownObjectException as e:
             log_error_with_404(f"Path not found - {e}")
 
-    def get_contents(self, path: str, branch: str) -> ContentFile:
+    def get_contents(self, path: str, branch: str) -> Union[ContentFile, MirrorContent]:
         """Get contents for path, otherwise raise Http404 exception
 
         Args:
@@ -126,14 +268,51 @@ class GitHubRepository:
             branch (str): repository branch
 
         Returns:
-            ContentFile: repository item contents
+            Union[ContentFile, MirrorContent]: repository item contents, a list of them for directories
         """
         if not branch:
             branch = self.branch
+        if (contents := self._mirror_read('get_contents', path, branch, self.handler.html_url)) is not NOT_MIRRORED:
+            if contents is None:
+                log_error_with_404(f"Path not found - {path}")
+            return contents
         try:
             return self.handler.get_contents(path, ref=branch)
         except UnknownObjectException as e:
             log_error_with_404(f"Path not found - {e}")
+
+    def get_dir_contents(self, path: str, branch: str) -> Union[List[Union[ContentFile, MirrorContent]],
+                                                               ContentFile, MirrorContent]:
+        """Get directory entries like `Repository.get_dir_contents`, GitHub exceptions are raised as is
+
+        Args:
+            path (str): directory path
+            branch (str): repository branch
+
+        Returns:
+            Union[List[Union[ContentFile, MirrorContent]], ContentFile, MirrorContent]: directory entries
+                or file contents if the path is a file
+        """
+        contents = self._mirror_read('get_contents', path, branch, self.handler.html_url)
+        if contents is NOT_MIRRORED:
+            return self.handler.get_dir_contents(path, ref=branch)
+        if contents is None:
+            raise UnknownObjectException(404, {'message': 'Not Found'}, None)
+        return contents
+
+    def get_last_commit(self, branch: str) -> Tuple[str, datetime]:
+        """Get head commit SHA and committer date of the branch
+
+        Args:
+            branch (str): repository branch
+
+        Returns:
+            Tuple[str, datetime]: commit SHA and UTC committer date
+        """
+        if (commit := self._mirror_read('get_last_commit', branch)) is not NOT_MIRRORED:
+            return commit[0], as_utc(commit[1])
+        commit = self.handler.get_commit(branch)
+        return commit.sha, as_utc(commit.commit.committer.date)
     
     def get_context(self, path: str, extra: Dict) -> Dict:
         """Get template context dict with repository data
@@ -150,7 +329,7 @@ class GitHubRepository:
             'repo': self.name,
             'private': self.handler.private,
             'branch': self.branch,
-            'branches': self.branches,
+            'branches': self.page_branches,
             'path': path,
         }
         if path:
@@ -168,11 +347,65 @@ class GitHubRepository:
             branch (str): _repo branch_
 
         Returns:
-            datetime: _file last update_ or None
+            datetime: _file last update in UTC_ or None
         """
+        if (last_update := self._mirror_read('get_file_last_update', path, branch)) is not NOT_MIRRORED:
+            return as_utc(last_update)
         commits = self.handler.get_commits(sha=branch, path=path)
         if commits.totalCount:
-            return commits[0].commit.committer.date
+            return as_utc(commits[0].commit.committer.date)
+
+    def get_last_commits(self, path: str, branch: str,
+                         contents: List[Union[ContentFile, MirrorContent]]) -> Optional[Dict[str, LastCommit]]:
+        """Get last commits changing directory entries, cached by the directory tree for all sessions
+
+        Mirrors are read in the request, the API walk runs as a background job, which fills the cache.
+
+        Args:
+            path (str): directory path, '' for the root
+            branch (str): repository branch
+            contents (List[Union[ContentFile, MirrorContent]]): directory entries
+
+        Returns:
+            Optional[Dict[str, LastCommit]]: last commit by entry name, entries changed beyond
+                LAST_COMMIT_WALK_LIMIT commits are missing; None while the walk is pending
+        """
+        path = path.strip('/')
+        # entry names and SHAs define the directory tree, so its history up to the head is the same
+        tree = sha1(''.join(f'{item.name}\0{item.sha}\0' for item in contents).encode()).hexdigest()
+        key = f'last_commits:{self.handler.full_name}:{tree}:{path}'
+        last_commits = cache.get(key)
+        cache_stats.hit('last_commits', last_commits is not None)
+        if last_commits is None:
+            names = [item.name for item in contents]
+            last_commits = self._mirror_read('get_last_commits', path, branch, names, LAST_COMMIT_WALK_LIMIT)
+            if last_commits is NOT_MIRRORED:
+                entries = {item.name: item.sha for item in contents}
+                # PyGithub objects are not shared between threads, the job gets its own handler
+                submit(key, _cache_last_commits, key, get_github_token(self.user), self.handler.full_name,
+                       path, branch, entries)
+                if (last_commits := cache.get(key)) is None:
+                    return None
+            else:
+                cache.set(key, last_commits, LAST_COMMIT_CACHE_TIMEOUT)
+        return {name: commit._replace(date=as_utc(commit.date)) for name, commit in last_commits.items()}
+
+    @staticmethod
+    def _with_images(path: str, content: str, images: Dict[str, bytes]) -> Dict[str, bytes]:
+        """Get files to commit: markdown file and images in its directory
+
+        Args:
+            path (str): markdown file path
+            content (str): markdown file content
+            images (Dict[str, bytes]): image file name: content
+
+        Returns:
+            Dict[str, bytes]: file path: content
+        """
+        parent = PurePosixPath(path).parent
+        files = {str(parent / name): data for name, data in images.items()}
+        files[path] = content.encode('UTF-8')
+        return files
 
     def get_path_parts(self, path: str) -> Dict:
         """ Get path parts dict for path
@@ -190,6 +423,70 @@ class GitHubRepository:
             path_parts_dict[path_parts[i]] = '/'.join(path_parts[:i+1])
         return path_parts_dict
     
+    @property
+    def page_branches(self) -> List[str]:
+        """Default and current branches, the only ones rendered on page load"""
+        return list(dict.fromkeys([self.handler.default_branch, self.branch]))
+
+    @property
+    def _branches_cache_key(self) -> str:
+        return f'branches:{self.handler.full_name}'
+
+    def get_branches(self) -> List[str]:
+        """Get all branch names from the mirror or GitHub paged through once per BRANCH_CACHE_TIMEOUT for all sessions
+
+        Returns:
+            List[str]: branch names
+        """
+        if (branches := self._mirror_read('get_branches')) is not NOT_MIRRORED:
+            return branches
+        branches = cache.get(self._branches_cache_key)
+        cache_stats.hit('branches', branches is not None)
+        if branches is None:
+            # get_branches() pages by 30, so the same list is requested with 100 branches per page
+            pages = PaginatedList(Branch, self.handler._requester, f'{self.handler.url}/branches', {'per_page': 100})
+            branches = [branch.name for branch in pages]
+            cache.set(self._branches_cache_key, branches, BRANCH_CACHE_TIMEOUT)
+        return branches
+
+    def search_branches(self, query: str, limit: int = BRANCH_SEARCH_LIMIT) -> List[str]:
+        """Search branch names for the branch selector typeahead
+
+        Args:
+            query (str): case insensitive part of the branch name
+            limit (int): max number of branches. Defaults to BRANCH_SEARCH_LIMIT
+
+        Returns:
+            List[str]: matching branches, the default branch and prefix matches first
+        """
+        query = query.lower()
+        matches = [branch for branch in self.get_branches() if query in branch.lower()]
+        matches.sort(key=lambda branch: (
+            branch != self.handler.default_branch, not branch.lower().startswith(query), len(branch), branch
+        ))
+        return matches[:limit]
+
+    def has_branch(self, branch: str) -> bool:
+        """Check if the branch exists, via the cached branch list or one GitHub request
+
+        Args:
+            branch (str): branch name
+
+        Returns:
+            bool: True if the repository has the branch
+        """
+        if branch in self.page_branches:
+            return True
+        if (branches := self._mirror_read('get_branches')) is not NOT_MIRRORED:
+            return branch in branches
+        if (branches := cache.get(self._branches_cache_key)) is not None:
+            return branch in branches
+        try:
+            self.handler.get_branch(branch)
+            return True
+        except GithubException:
+            return False
+
     @property
     def name(self) -> Optional[str]:
         """Returns repository name"""
@@ -206,34 +503,52 @@ class GitHubRepository:
         self.branch = branch
         request.session[f'{self.handler.name}__current_branch'] = self.branch
     
-    def update_file(self, path: str, updated_content: str, branch: str = '') -> str:
+    def update_file(self, path: str, updated_content: str, branch: str = '',
+                    images: Optional[Dict[str, bytes]] = None, sha: str = '') -> str:
         """Update a file in the repository if success otherwise raise 404 exception
 
         Args:
             path (str): path to the updated file
             updated_content (str): updated content
             branch (str): repository branch. Defaults to '' (current repository branch)
+            images (Dict[str, bytes]): images to commit next to the file (file name: content). Defaults to None
+            sha (str): blob SHA of the file the update started from. Defaults to '' (the branch head file)
+
+        Raises:
+            CommitConflict: _the file changed since `sha` or the branch moved during the commit_
 
         Returns:
             str: success message in html
         """
         branch = branch if branch else self.branch
+        message = f"Update {PurePosixPath(path).name} at MarkHub"
         try:
-            contents = self.get_contents(path, branch)
-            status: dict = self.handler.update_file(
-                path=path, 
-                message=f"Update {PurePosixPath(path).name} at MarkHub", 
-                content=updated_content,
-                sha=contents.sha,
-                branch=branch)
+            if not sha:
+                sha = self.handler.get_contents(path, ref=branch).sha  # the mirror may be behind
+            if images:
+                commit = self.commit_files(self._with_images(path, updated_content, images), message, branch,
+                                           base_shas={path: sha})
+            else:
+                commit = self.handler.update_file(
+                    path=path, 
+                    message=message, 
+                    content=updated_content,
+                    sha=sha,
+                    branch=branch)["commit"]
+            self._mark_mirror_stale()
             return format_html(
                 'File {} was successfully updated with commit <a href="{}" target="_blank">{}</a>.',
                 path,
-                status["commit"].html_url,
-                status["commit"].sha[:7]
+                commit.html_url,
+                commit.sha[:7]
             )
         except UnknownObjectException as e:
             log_error_with_404(f"File not updated - {e}")
+        except GithubException as e:
+            if e.status != 409:  # the contents API rejects a stale file SHA
+                raise
+            raise CommitConflict(f'File {path} was changed in {branch} since it was opened, copy your changes '
+                                 f'and open the file again')
 
 
 def get_repository_or_error(request: HttpRequest, repo: str) -> GitHubRepository:
@@ -255,3 +570,78 @@ def get_repository_or_error(request: HttpRequest, repo: str) -> GitHubRepository
             raise PermissionDenied
         return repository
     raise Http404("Repository not found")
+
+
+def _cache_last_commits(key: str, token: Optional[str], full_name: str, path: str, branch: str,
+                        entries: Dict[str, str]) -> None:
+    """Walk the directory history and cache last commits of its entries, run as a background job
+
+    Args:
+        key (str): cache key
+        token (Optional[str]): GitHub access token, anonymous access if None
+        full_name (str): repository full name
+        path (str): directory path, '' for the root
+        branch (str): repository branch
+        entries (Dict[str, str]): entry SHA by name at the branch head
+    """
+    repository = get_github(token).get_repo(full_name, lazy=True)
+    last_commits = _walk_last_commits(repository, path, branch, entries, LAST_COMMIT_WALK_LIMIT)
+    cache.set(key, last_commits, LAST_COMMIT_CACHE_TIMEOUT)
+
+
+def _walk_last_commits(repository: Repository, path: str, branch: str, entries: Dict[str, str],
+                       limit: int) -> Dict[str, LastCommit]:
+    """Walk commits changing the directory via the API, newest first, until all entries are found
+
+    Entries whose SHAs differ in the directory trees of consecutive commits were changed by the newer commit,
+    so the walk costs one tree request per commit, the commit list has no changed files.
+
+    Args:
+        repository (Repository): PyGithub repository
+        path (str): directory path, '' for the root
+        branch (str): repository branch
+        entries (Dict[str, str]): entry SHA by name at the branch head
+        limit (int): max walked commits
+
+    Returns:
+        Dict[str, LastCommit]: last commit by entry name
+    """
+    pending = dict(entries)
+    last_commits: Dict[str, LastCommit] = {}
+    params = {'sha': branch, 'per_page': 100}
+    if path:
+        params['path'] = path
+    # the commit after the limit is the older side of the last walked commit
+    history = islice(PaginatedList(Commit, repository._requester, f'{repository.url}/commits', params), limit + 1)
+    newer = next(history, None)
+    for _ in range(limit):
+        if newer is None or not pending:
+            break
+        older = next(history, None)
+        # the oldest commit changing the directory created it with all its entries
+        older_entries = _get_tree_entries(repository, older.sha, path) if older else {}
+        for name in [name for name, sha in pending.items() if older_entries.get(name) != sha]:
+            last_commits[name] = LastCommit(
+                newer.sha, newer.commit.committer.date, newer.commit.message.partition('\n')[0]
+            )
+            del pending[name]
+        newer = older
+    return last_commits
+
+
+def _get_tree_entries(repository: Repository, commit: str, path: str) -> Dict[str, str]:
+    """Get directory entries at the commit
+
+    Args:
+        repository (Repository): PyGithub repository
+        commit (str): commit SHA
+        path (str): directory path, '' for the root
+
+    Returns:
+        Dict[str, str]: entry SHA by name, empty if the directory is missing
+    """
+    try:
+        tree = repository.get_git_tree(f'{commit}:{quote(path)}' if path else commit)
+    except UnknownObjectException:
+        return {}
+    return {item.path: item.sha for item in tree.tree}
@@ -0,0 +1,274 @@
+import re
+from bisect import bisect_left
+from dataclasses import dataclass
+from html import unescape
+from typing import Dict, List, Optional, Set, Tuple
+
+from django.core.cache import cache
+from django.utils.html import escape
+from markdown.extensions.toc import nest_toc_tokens, unique
+
+from markhub.extensions import emoji
+from markhub.settings import (MARTOR_MARKDOWN_EXTENSION_CONFIGS,
+                              RENDER_CACHE_TIMEOUT, RENDER_CACHE_VERSION)
+
+from .markdown_render import get_render_cache_key
+from .metrics import cache_stats
+
+TOC_CONFIG = MARTOR_MARKDOWN_EXTENSION_CONFIGS['markdown.extensions.toc']
+TOC_MIN_LEVEL, TOC_MAX_LEVEL = (int(x) for x in TOC_CONFIG['toc_depth'].split('-'))
+
+# Python-Markdown headings start at the first column
+ATX_HEADING_RE = re.compile(r'^(#{1,6})[ \t]+(.*?)(?:[ \t]+#+)?[ \t]*$')
+SETEXT_UNDERLINE_RE = re.compile(r'^(=+|-+)[ ]*$')
+FENCE_RE = re.compile(r'^[ ]*(`{3,}|~{3,})')
+FENCE_END_RE = re.compile(r'^[ >]*(`{3,}|~{3,})[ ]*$')
+META_RE = re.compile(r'^[A-Za-z0-9_-]+:')
+REFERENCE_RE = re.compile(r'^ {0,3}\[([^\]]+)\]:', re.MULTILINE)
+SHORTCUT_REFERENCE_RE = re.compile(r'(?<!\])\[([^\]]+)\](?![(\[])')
+# Blocks are parsed again inside blockquotes, list items, admonitions, details and tabs,
+# list item continuations and the content of the last three are indented by 4 spaces
+BLOCKQUOTE_RE = re.compile(r'^ {0,3}>[ ]?')
+LIST_ITEM_RE = re.compile(r'^ {0,3}(?:[*+-]|\d+\.)[ \t]+')
+INDENTED_BLOCK_RE = re.compile(r'^ {0,3}(?:!!!|\?\?\?\+?|===!?)[ \t]')
+INDENT_RE = re.compile(r'^(?: {4}|\t)')
+HR_RE = re.compile(r'^ {0,3}([*_-])(?: *\1){2,} *$')
+# attr_list of headings, the toc extension keeps its id
+ATTR_LIST_RE = re.compile(r'[ ]+\{:?[ ]*([^}\n ][^}\n]*)[ ]*\}[ ]*$')
+ATTR_ID_RE = re.compile(r'(?:^|\s)(?:#|id=)("[^"]*"|\'[^\']*\'|[^\s"\']+)')
+CODE_SPAN_RE = re.compile(r'(?<!\\)(`+)(.+?)(?<!`)\1(?!`)')
+CODE_PLACEHOLDER = '\x02{}\x03'
+CODE_PLACEHOLDER_RE = re.compile(r'\x02(\d+)\x03')
+EMOJI_RE = re.compile(r':[+\-\w]+:')
+INLINE_MARKUP = (
+    (re.compile(r'!\[[^\]]*\]\([^)]*\)|!\[[^\]]*\]\[[^\]]*\]'), ''),  # images have no text
+    (re.compile(r'\[([^\]]*)\]\([^)]*\)'), r'\1'),     # links
+    (re.compile(r'\[([^\]]*)\]\[[^\]]*\]'), r'\1'),    # reference links
+    (re.compile(r'<((?:https?|ftp)://[^>\s]+|[^>\s@]+@[^>\s@]+)>'), r'\1'),  # autolinks
+    (re.compile(r'(\*{1,3}|~~|\^\^|==)(\S.*?\S|\S)\1'), r'\2'),        # emphasis, delete, insert, mark
+    (re.compile(r'(?<!\w)(_{1,3})(\S.*?\S|\S)\1(?!\w)'), r'\2'),       # emphasis, not intraword
+    (re.compile(r'\\(.)'), r'\1'),                      # escapes
+)
+
+
+@dataclass
+class Heading:
+    """Markdown heading with its anchor slug"""
+
+    level: int
+    name: str
+    id: Optional[str]
+
+
+def _emoji_text(match: re.Match) -> str:
+    """Unicode text of the emoji shortcode as pymdownx.emoji renders it"""
+    index = emoji.twemoji({}, None)
+    shortname = index['aliases'].get(match.group(0), match.group(0))
+    if (item := index['emoji'].get(shortname)) is None:
+        return match.group(0)
+    if code := item.get('unicode_alt', item.get('unicode')):
+        return ''.join(chr(int(point, 16)) for point in code.split('-'))
+    return shortname
+
+
+def _heading_text(source: str, references: Set[str]) -> str:
+    """Reduce heading markdown to the text of the rendered heading
+
+    Raw html is escaped by martor.extensions.escape_html, so tags stay in the text like in code spans.
+
+    Args:
+        source (str): _heading markdown_
+        references (Set[str]): _lowercase labels of link reference definitions_
+
+    Returns:
+        str: _heading plain text_
+    """
+    code_spans: List[str] = []
+
+    def stash_code(match: re.Match) -> str:
+        code_spans.append(match.group(2).strip())
+        return CODE_PLACEHOLDER.format(len(code_spans) - 1)
+
+    source = CODE_SPAN_RE.sub(stash_code, source)
+    source = SHORTCUT_REFERENCE_RE.sub(
+        lambda match: match.group(1) if match.group(1).lower() in references else match.group(0), source
+    )
+    for pattern, replacement in INLINE_MARKUP:
+        source = pattern.sub(replacement, source)
+    source = unescape(EMOJI_RE.sub(_emoji_text, source))
+    return CODE_PLACEHOLDER_RE.sub(lambda match: code_spans[int(match.group(1))], source).strip()
+
+
+def _split_attributes(source: str) -> Tuple[str, Optional[str]]:
+    """Split attr_list off the heading markdown
+
+    Args:
+        source (str): _heading markdown_
+
+    Returns:
+        Tuple[str, Optional[str]]: _heading markdown without attr_list and the id of the list_
+    """
+    if match := ATTR_LIST_RE.search(source):
+        ids = ATTR_ID_RE.findall(match.group(1))
+        return source[:match.start()], ids[-1].strip('"\'') if ids else None
+    return source, None
+
+
+def _strip_containers(line: str, depth: int, lists: bool) -> Tuple[str, int, bool]:
+    """Strip blockquote and list item markers and the indentation of block content
+
+    Args:
+        line (str): _source line_
+        depth (int): _indentation levels of the blocks opened by previous lines_
+        lists (bool): _list items can start on the line, they don't interrupt paragraphs_
+
+    Returns:
+        Tuple[str, int, bool]: _line content, indentation levels of open blocks, the line opens a block_
+    """
+    line = BLOCKQUOTE_RE.sub('', line)
+    level = 0
+    while level < depth and (match := INDENT_RE.match(line)):
+        line, level = line[match.end():], level + 1
+    opens_block = False
+    while True:
+        if match := BLOCKQUOTE_RE.match(line):
+            line = line[match.end():]
+        elif lists and not HR_RE.match(line) and (match := LIST_ITEM_RE.match(line)):
+            line, level, opens_block = line[match.end():], level + 1, True
+        elif INDENTED_BLOCK_RE.match(line):
+            return '', level + 1, True  # the rest of the line is the block title
+        else:
+            return line, level, opens_block
+
+
+def _setext_level(underline: str) -> int:
+    """Heading level of the setext underline or 0"""
+    if match := SETEXT_UNDERLINE_RE.match(underline):
+        return 1 if match.group(1)[0] == '=' else 2
+    return 0
+
+
+def extract_headings(content: str) -> List[Heading]:
+    """Extract headings with one linear pass over markdown source without rendering
+
+    ATX and setext headings are recognized in blockquotes, lists, admonitions, details and tabs too,
+    closed fenced code blocks, indented code and the meta block are skipped. Anchors are attr_list ids
+    or slugs made unique the same way as in the toc extension.
+
+    Args:
+        content (str): _markdown content_
+
+    Returns:
+        List[Heading]: _document headings_
+    """
+    headings = []
+    references = {label.lower() for label in REFERENCE_RE.findall(content)}
+    lines = content.splitlines()
+    if lines and META_RE.match(lines[0]):
+        while lines and lines[0].strip():
+            lines.pop(0)
+    fence_ends: Dict[str, List[int]] = {}
+    for number, line in enumerate(lines):
+        if match := FENCE_END_RE.match(line):
+            fence_ends.setdefault(match.group(1), []).append(number)
+    fence = ''
+    depth = 0
+    block_start = True  # setext heading text is the first line of a block, lists don't interrupt paragraphs
+    top_start = True  # the line starts a block of the document, outside of lists
+    tight_item = False  # lines of list items without blank lines are inline text
+    index = 0
+    while index < len(lines):
+        source = lines[index]
+        index += 1
+        top_level = top_start and not (depth and INDENT_RE.match(source)) and not INDENTED_BLOCK_RE.match(source)
+        line, level, opens_block = _strip_containers(source, depth, depth > 0 or block_start)
+        if line.strip() or opens_block:
+            depth = level
+        if HR_RE.match(source):
+            depth = 0  # horizontal rules split blocks, lists and blockquotes end
+        if fence:
+            if line.strip() == fence:
+                fence, block_start = '', False
+            top_start = False
+            continue
+        # unclosed fences are paragraph text
+        if (match := FENCE_RE.match(line)) and (ends := fence_ends.get(match.group(1))) \
+                and bisect_left(ends, index) < len(ends):
+            fence, block_start, top_start = match.group(1), False, False
+            continue
+        if opens_block or not line.strip():
+            tight_item = opens_block and bool(LIST_ITEM_RE.match(source.lstrip(' >')))
+        elif tight_item and INDENT_RE.match(source):
+            block_start = top_start = False
+            continue
+        heading_level, text, whole_line = 0, '', False
+        if index < len(lines) and not INDENT_RE.match(line):
+            # setext headings of document blocks take the whole line, even with list or blockquote markers
+            if top_level and source.strip() and not ATX_HEADING_RE.match(source) \
+                    and (heading_level := _setext_level(lines[index])):
+                text, whole_line = source, True
+            elif block_start and line.strip() and not ATX_HEADING_RE.match(line) \
+                    and not HR_RE.match(lines[index]):
+                if heading_level := _setext_level(_strip_containers(lines[index], depth, depth > 0)[0]):
+                    text = line
+            index += bool(heading_level)
+        if not heading_level and (match := ATX_HEADING_RE.match(line)):
+            heading_level, text, whole_line = len(match.group(1)), match.group(2), line == source
+        if heading_level:
+            text, heading_id = _split_attributes(text.strip())
+            headings.append(Heading(heading_level, _heading_text(text, references), heading_id))
+            block_start, tight_item = True, False  # list items starting with headings are parsed as blocks
+        else:
+            # indented code at the start of a block ends with its last indented line
+            block_start = not line.strip() or bool(HR_RE.match(line) or block_start and INDENT_RE.match(line))
+        top_start = not source.strip() or whole_line or bool(HR_RE.match(source) or INDENTED_BLOCK_RE.match(source)) \
+            or top_level and not depth and bool(INDENT_RE.match(source))
+    used_ids = {heading.id for heading in headings if heading.id}
+    for heading in headings:
+        if not heading.id:
+            heading.id = unique(TOC_CONFIG['slugify'](heading.name, '-'), used_ids)
+    return headings
+
+
+def build_toc(headings: List[Heading]) -> str:
+    """Build toc html in the toc extension format
+
+    Args:
+        headings (List[Heading]): _document headings_
+
+    Returns:
+        str: _toc html or empty string if there are no headings in toc depth_
+    """
+    def build_ul(items: List[dict]) -> str:
+        return '<ul>\n{}</ul>\n'.format(''.join(
+            '<li><a href="#{}">{}</a>{}</li>\n'.format(
+                escape(item['id']), escape(item['name']),
+                build_ul(item['children']) if item['children'] else ''
+            )
+            for item in items
+        ))
+
+    tokens = [
+        {'level': heading.level, 'id': heading.id, 'name': heading.name}
+        for heading in headings
+        if TOC_MIN_LEVEL <= heading.level <= TOC_MAX_LEVEL
+    ]
+    return f'<div class="toc">\n{build_ul(nest_toc_tokens(tokens))}</div>\n' if tokens else ''
+
+
+def get_toc(content: str) -> str:
+    """Get toc html for markdown content via the render cache
+
+    Args:
+        content (str): _markdown content_
+
+    Returns:
+        str: _toc html or empty string_
+    """
+    key = get_render_cache_key(content, prefix='toc')
+    toc = cache.get(key, version=RENDER_CACHE_VERSION)
+    cache_stats.hit('toc', toc is not None)
+    if toc is None:
+        toc = build_toc(extract_headings(content))
+        cache.set(key, toc, RENDER_CACHE_TIMEOUT, version=RENDER_CACHE_VERSION)
+    return toc
@@ -1,6 +1,10 @@
 import os
 import json
-import uuid
+import hashlib
+from io import BytesIO
+from pathlib import PurePosixPath
+from types import ModuleType
+from typing import Dict, List, Optional
 
 from django.conf import settings
 from django.http import HttpResponse
@@ -8,9 +12,169 @@ from django.utils.translation import ugettext_lazy as _
 from django.contrib.auth.decorators import login_required
 from django.core.files.storage import default_storage
 from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import UploadedFile
+from django.http.request import HttpRequest
+from django.utils.text import slugify
 
 from martor.utils import LazyEncoder
 
+from markhub.settings import logger
+
+from .background import submit
+
+STAGED_IMAGES_SESSION_KEY = '__staged_images__'
+
+
+def get_image_variant_name(name: str, width: int) -> str:
+    """Get storage name of the resized WebP image variant
+
+    Args:
+        name (str): _original image storage name_
+        width (int): _variant width_
+
+    Returns:
+        str: _variant storage name_
+    """
+    return str(PurePosixPath(name).with_suffix(f'.{width}.webp'))
+
+
+def _get_pil_image() -> Optional[ModuleType]:
+    """Get `PIL.Image` imported at the first upload or None if Pillow is not installed"""
+    try:
+        from PIL import Image
+    except ImportError:  # optional dependency, install with `poetry install -E images`
+        return None
+    Image.MAX_IMAGE_PIXELS = settings.IMAGE_MAX_PIXELS  # larger images raise DecompressionBombError when decoded
+    return Image
+
+
+def _get_image_width(image: UploadedFile) -> Optional[int]:
+    """Get image width from the image header if variants can be made for the image"""
+    if (Image := _get_pil_image()) is None or image.content_type == 'image/gif':
+        return None
+    try:
+        with Image.open(image) as im:
+            if im.width * im.height > settings.IMAGE_MAX_PIXELS:
+                logger.warning(f"Image {image.name} is stored without variants - {im.width}x{im.height} pixels")
+                return None
+            return im.width
+    except (OSError, ValueError, Image.DecompressionBombError) as e:
+        logger.error(f"Image {image.name} is not readable - {e}")
+    finally:
+        image.seek(0)
+
+
+def _hash_image(image: UploadedFile) -> str:
+    """Get image content hash reading the upload by chunks"""
+    sha = hashlib.sha256()
+    for chunk in image.chunks():
+        sha.update(chunk)
+    image.seek(0)
+    return sha.hexdigest()[:32]
+
+
+def generate_image_variants(name: str) -> None:
+    """Save resized WebP variants of the stored image for IMAGE_VARIANT_WIDTHS less than its width
+
+    Args:
+        name (str): _original image storage name_
+    """
+    Image = _get_pil_image()
+    with default_storage.open(name) as image, Image.open(image) as im:
+        widths = [
+            width for width in settings.IMAGE_VARIANT_WIDTHS
+            if width < im.width and not default_storage.exists(get_image_variant_name(name, width))
+        ]
+        if widths:
+            im.load()
+        for width in widths:
+            variant = im.copy()
+            variant.thumbnail((width, im.height))
+            buffer = BytesIO()
+            variant.save(buffer, 'WEBP', quality=settings.IMAGE_VARIANT_QUALITY)
+            default_storage.save(get_image_variant_name(name, width), ContentFile(buffer.getvalue()))
+
+
+def save_image(image: UploadedFile) -> str:
+    """Save uploaded image with the content hash name, identical images are stored once
+
+    The request reads only the image header, resized variants are made by a background job.
+    The name includes the image width, markdown renders list the variants in srcset once they are stored.
+
+    Args:
+        image (UploadedFile): _uploaded image_
+
+    Returns:
+        str: _image storage name_
+    """
+    width = _get_image_width(image)
+    extension = PurePosixPath(image.name).suffix.lower()
+    digest = _hash_image(image)
+    stem = f'{digest}-{width}' if width else digest
+    name = os.path.join(settings.MARTOR_UPLOAD_PATH, f'{stem}{extension}')
+    if not default_storage.exists(name):
+        # Storage writes UploadedFile by chunks
+        name = default_storage.save(name, image)
+    if width:
+        submit(f'image-variants:{name}', generate_image_variants, name)
+    return name
+
+
+def stage_image(request: HttpRequest, image: UploadedFile) -> str:
+    """Stage uploaded image until the markdown file is committed with it
+
+    Args:
+        request (HttpRequest): _request with user session_
+        image (UploadedFile): _uploaded image_
+
+    Returns:
+        str: _image file name to link relatively from the markdown file_
+    """
+    path = PurePosixPath(image.name)
+    filename = f'{slugify(path.stem) or "image"}-{_hash_image(image)[:8]}{path.suffix.lower()}'
+    name = os.path.join(settings.IMAGE_STAGING_PATH, str(request.user.pk), filename)
+    if not default_storage.exists(name):
+        name = default_storage.save(name, image)
+    staged = request.session.get(STAGED_IMAGES_SESSION_KEY, {})
+    staged[filename] = name
+    request.session[STAGED_IMAGES_SESSION_KEY] = staged
+    return filename
+
+
+def get_staged_images(request: HttpRequest, content: str) -> Dict[str, bytes]:
+    """Get staged images referenced in the markdown content
+
+    Args:
+        request (HttpRequest): _request with user session_
+        content (str): _markdown content to commit_
+
+    Returns:
+        Dict[str, bytes]: _image file name: image content_
+    """
+    images = {}
+    for filename, name in request.session.get(STAGED_IMAGES_SESSION_KEY, {}).items():
+        if filename in content:
+            try:
+                with default_storage.open(name) as stored:
+                    images[filename] = stored.read()
+            except OSError as e:
+                logger.error(f"Staged image {name} is not readable - {e}")
+    return images
+
+
+def clear_staged_images(request: HttpRequest, filenames: List[str]) -> None:
+    """Remove committed images from the staging storage
+
+    Args:
+        request (HttpRequest): _request with user session_
+        filenames (List[str]): _committed image file names_
+    """
+    staged = request.session.get(STAGED_IMAGES_SESSION_KEY, {})
+    for filename in filenames:
+        if name := staged.pop(filename, None):
+            default_storage.delete(name)
+    request.session[STAGED_IMAGES_SESSION_KEY] = staged
+
 
 @login_required
 def markdown_uploader(request):
@@ -42,10 +206,10 @@ def markdown_uploader(request):
                 return HttpResponse(
                     data, content_type='application/json', status=405)
 
-            img_uuid = "{0}-{1}".format(uuid.uuid4().hex[:10], image.name.replace(' ', '-'))
-            tmp_file = os.path.join(settings.MARTOR_UPLOAD_PATH, img_uuid)
-            def_path = default_storage.save(tmp_file, ContentFile(image.read()))
-            img_url = os.path.join(settings.MEDIA_URL, def_path)
+            if settings.IMAGE_UPLOADER == 'repo':
+                img_url = stage_image(request, image)
+            else:
+                img_url = os.path.join(settings.MEDIA_URL, save_image(image))
 
             data = json.dumps({
                 'status': 200,
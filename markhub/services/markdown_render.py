@@ -1,32 +1,197 @@
-from typing import Tuple
+import re
+import threading
+from collections import OrderedDict
+from hashlib import sha1
+from html import unescape
+from time import perf_counter
+from typing import Dict, Pattern, Tuple
 
+from django.core.cache import cache
 from markdown import Markdown
 
-from markhub.settings import (MARTOR_MARKDOWN_EXTENSION_CONFIGS,
-                              MARTOR_MARKDOWN_EXTENSIONS)
+from markhub.extensions.highlight_cache import get_thread_highlight_seconds
+from markhub.settings import (ADAPTIVE_MARKDOWN, ALLOWED_URL_SCHEMES,
+                              MARKDOWN_PIPELINES,
+                              MARTOR_MARKDOWN_EXTENSION_CONFIGS,
+                              MARTOR_MARKDOWN_EXTENSIONS,
+                              RENDER_CACHE_TIMEOUT, RENDER_CACHE_VERSION,
+                              RENDER_FALLBACK_CACHE_TIMEOUT, logger)
 
+from .math_render import prerender_math
+from .metrics import (HIGHLIGHT_DURATION, RENDER_DURATION, cache_stats,
+                      record_timing, timed)
+from .render_pool import MARKDOWNIFY, RenderLimitError, plain_text, render
 
-def _markdown() -> Markdown:
+# Syntax without which an extension leaves the output unchanged, so documents without it skip the extension.
+# Patterns may match more than the extension does, extensions without a pattern are always used.
+# caret, mark and tilde override one another's 'not_tilde' pattern, so they are used together.
+INLINE_MARKS = re.compile(r'\^|~|==')
+EXTENSION_TRIGGERS: Dict[str, Pattern] = {
+    'markdown.extensions.admonition': re.compile(r'!!!'),
+    'pymdownx.escapeall': re.compile(r'\\'),
+    'pymdownx.arithmatex': re.compile(r'\$|\\[(\[]|\\begin\{'),
+    'pymdownx.caret': INLINE_MARKS,
+    'pymdownx.critic': re.compile(r'\{(?:\+\+|--|~~|==|>>)'),
+    'pymdownx.details': re.compile(r'\?\?\?'),
+    'pymdownx.emoji': re.compile(r':[+\-\w]+:'),
+    'pymdownx.keys': re.compile(r'\+\+|\\\\\+'),
+    'pymdownx.magiclink': re.compile(r'@|://|www\.|[#!?][1-9]|[a-f\d]{40}', re.IGNORECASE),
+    'pymdownx.mark': INLINE_MARKS,
+    'pymdownx.smartsymbols': re.compile(
+        r'\((?:c|r|tm)\)|\+/-|=/=|c/o|<--|-->|\d/\d|\d(?:st|nd|rd|th)', re.IGNORECASE
+    ),
+    'pymdownx.tabbed': re.compile(r'==='),
+    'pymdownx.tasklist': re.compile(r'\[[ xX]\]'),
+    'pymdownx.tilde': INLINE_MARKS,
+    'martor.extensions.mdx_video': re.compile(r'://'),
+}
+_pipelines = threading.local()
+
+# Raw html is escaped by martor.extensions.escape_html, so '<' of the rendered html starts a tag of an extension
+HTML_TAG = re.compile(r'<[a-zA-Z][^<>]*>')
+URL_ATTRIBUTE = re.compile(r'\s(href|src|srcset)="([^"]*)"', re.IGNORECASE)
+URL_SCHEME = re.compile(r'([^/?#]*):')
+URL_IGNORED = re.compile(r'[\x00-\x20\x7f]')  # browsers drop whitespace and control characters in URLs
+
+
+def get_extensions(content: str) -> Tuple[str, ...]:
+    """Get MARTOR_MARKDOWN_EXTENSIONS used by the content syntax
+
+    Args:
+        content (str): _markdown content_
+
+    Returns:
+        Tuple[str, ...]: _extensions in the MARTOR_MARKDOWN_EXTENSIONS order_
     """
-    Rerurn the Markdown object with martor settings
+    return tuple(
+        extension for extension in MARTOR_MARKDOWN_EXTENSIONS
+        if (trigger := EXTENSION_TRIGGERS.get(extension)) is None or trigger.search(content)
+    )
+
+
+def _markdown(extensions: Tuple[str, ...] = tuple(MARTOR_MARKDOWN_EXTENSIONS)) -> Markdown:
+    """
+    Return the Markdown object with martor settings and the extensions, reused by the thread
+
+    Args:
+        extensions (Tuple[str, ...]): _extensions in the MARTOR_MARKDOWN_EXTENSIONS order_
 
     Returns:
         Markdown object
     """
-    return Markdown(
-        extensions=MARTOR_MARKDOWN_EXTENSIONS,
-        extension_configs=MARTOR_MARKDOWN_EXTENSION_CONFIGS,
-        output_format="html5",
-    )
+    if (pipelines := getattr(_pipelines, 'pipelines', None)) is None:
+        pipelines = _pipelines.pipelines = OrderedDict()
+    markdown = pipelines.get(extensions)
+    cache_stats.hit('markdown_pipeline', markdown is not None)
+    if markdown is None:
+        markdown = pipelines[extensions] = Markdown(
+            extensions=list(extensions),
+            extension_configs=MARTOR_MARKDOWN_EXTENSION_CONFIGS,
+            output_format="html5",
+        )
+        if len(pipelines) > MARKDOWN_PIPELINES:
+            pipelines.popitem(last=False)
+    else:
+        pipelines.move_to_end(extensions)
+    return markdown.reset()
+
+
+def is_allowed_url(url: str) -> bool:
+    """Check the URL is relative or its scheme is one of ALLOWED_URL_SCHEMES
+
+    Args:
+        url (str): _escaped URL of an html attribute_
+
+    Returns:
+        bool: _URL is allowed_
+    """
+    scheme = URL_SCHEME.match(URL_IGNORED.sub('', unescape(url)))
+    return scheme is None or scheme.group(1).lower() in ALLOWED_URL_SCHEMES
+
+
+def _sanitize_attribute(match: re.Match) -> str:
+    name, value = match.groups()
+    urls = [candidate.split()[0] for candidate in value.split(',') if candidate.strip()] \
+        if name.lower() == 'srcset' else [value]
+    return match.group(0) if all(is_allowed_url(url) for url in urls) else ''
+
+
+def sanitize_urls(html: str) -> str:
+    """Drop link and image URLs with schemes out of ALLOWED_URL_SCHEMES, like martor's bleach.clean does
+
+    Args:
+        html (str): _rendered html_
 
-def markdownify(content: str) -> Tuple[str, str]:
+    Returns:
+        str: _html without javascript: and other unsafe URLs_
+    """
+    return HTML_TAG.sub(lambda tag: URL_ATTRIBUTE.sub(_sanitize_attribute, tag.group(0)), html)
+
+
+def markdownify(content: str, adaptive: bool = ADAPTIVE_MARKDOWN) -> Tuple[str, str]:
     """Convert content to markdown with toc
 
     Args:
         content (str): _content to convert_
-    
+        adaptive (bool): _skip extensions whose syntax is missing in the content_. Defaults to ADAPTIVE_MARKDOWN
+
+    Returns:
+        Tuple rendered content and toc:
+    """
+    started, highlighting = perf_counter(), get_thread_highlight_seconds()
+    with timed('render', RENDER_DURATION):
+        markdown = _markdown(get_extensions(content)) if adaptive else _markdown()
+        rendered = sanitize_urls(prerender_math(markdown.convert(content))), markdown.toc
+    elapsed, highlighting = perf_counter() - started, get_thread_highlight_seconds() - highlighting
+    HIGHLIGHT_DURATION.observe(highlighting)
+    record_timing('highlighting', highlighting)
+    logger.debug(f"Markdown rendered in {elapsed * 1000:.1f} ms, highlighting {highlighting / elapsed:.0%}")
+    return rendered
+
+
+def get_render_cache_key(content: str, prefix: str = 'markdownify') -> str:
+    """Get render cache key for content
+
+    Args:
+        content (str): _markdown content_
+        prefix (str): _key prefix of the cached result kind_
+
+    Returns:
+        str: _render cache key_
+    """
+    return f"{prefix}:{sha1(content.encode('UTF-8')).hexdigest()}"
+
+
+def cache_rendered(content: str, rendered: Tuple[str, str]) -> None:
+    """Put rendered content and toc into the render cache
+
+    Args:
+        content (str): _markdown content_
+        rendered (Tuple[str, str]): _rendered content and toc_
+    """
+    cache.set(get_render_cache_key(content), rendered, RENDER_CACHE_TIMEOUT, version=RENDER_CACHE_VERSION)
+
+
+def cached_markdownify(content: str) -> Tuple[str, str]:
+    """Convert content to markdown with toc via the render cache and the render pool,
+    documents over the render limits are converted to plain text
+
+    Args:
+        content (str): _content to convert_
+
     Returns:
         Tuple rendered content and toc:
     """
-    markdown = _markdown()
-    return markdown.convert(content), markdown.toc
+    rendered = cache.get(get_render_cache_key(content), version=RENDER_CACHE_VERSION)
+    cache_stats.hit('render', rendered is not None)
+    if rendered is None:
+        try:
+            rendered = render(MARKDOWNIFY, content)
+            cache_rendered(content, rendered)
+        except RenderLimitError as e:
+            logger.warning(f"Document is shown as plain text - {e}")
+            rendered = plain_text(content), ''
+            if e.reason != 'queue':  # documents over the limits would be over them again
+                cache.set(get_render_cache_key(content), rendered, RENDER_FALLBACK_CACHE_TIMEOUT,
+                          version=RENDER_CACHE_VERSION)
+    return rendered
@@ -0,0 +1,121 @@
+import re
+import xml.etree.ElementTree as etree
+from functools import lru_cache
+from html import unescape
+from typing import Optional
+
+from markhub.settings import MATH_CACHE_SIZE, MATH_RENDERER, logger
+
+from .metrics import cache_stats
+
+latex_to_mathml = None
+if MATH_RENDERER == 'mathml':
+    try:
+        from latex2mathml.converter import convert as latex_to_mathml
+    except ImportError:  # optional dependency, install with `poetry install -E math`
+        pass
+
+ARITHMATEX_CLASS = 'class="arithmatex"'
+# Generic arithmatex output: <span class="arithmatex">\(...\)</span> or <div class="arithmatex">\[...\]</div>
+ARITHMATEX_RE = re.compile(r'<(span|div) class="arithmatex">\\[(\[]([^<]*?)\\[)\]]</\1>', re.DOTALL)
+
+# latex2mathml copies \text{...} into <mtext> unescaped, so its output is parsed and serialized again
+# with MathML presentation elements and attributes only, formulas with anything else are left for MathJax
+MATHML_NAMESPACE = 'http://www.w3.org/1998/Math/MathML'
+MATHML_ELEMENTS = {
+    'math', 'mrow', 'mi', 'mn', 'mo', 'ms', 'mtext', 'mspace', 'mfrac', 'msqrt', 'mroot', 'mstyle', 'merror',
+    'mpadded', 'mphantom', 'menclose', 'msub', 'msup', 'msubsup', 'munder', 'mover', 'munderover',
+    'mmultiscripts', 'mprescripts', 'none', 'mtable', 'mtr', 'mtd', 'mlabeledtr',
+}
+MATHML_ATTRIBUTES = {
+    'accent', 'accentunder', 'align', 'bevelled', 'close', 'columnalign', 'columnlines', 'columnspacing',
+    'columnspan', 'denomalign', 'depth', 'display', 'displaystyle', 'equalcolumns', 'equalrows', 'fence', 'form',
+    'frame', 'framespacing', 'height', 'largeop', 'linethickness', 'lspace', 'mathbackground', 'mathcolor',
+    'mathsize', 'mathvariant', 'maxsize', 'minsize', 'movablelimits', 'notation', 'numalign', 'open', 'rowalign',
+    'rowlines', 'rowspacing', 'rowspan', 'rspace', 'scriptlevel', 'separator', 'separators', 'stretchy',
+    'symmetric', 'voffset', 'width',
+}
+
+if MATH_RENDERER == 'mathml' and latex_to_mathml is None:
+    logger.warning("MATH_RENDERER is 'mathml', but latex2mathml is not installed, math is left for MathJax")
+
+
+def has_math(html: str) -> bool:
+    """Check if rendered html has math which is not prerendered, so MathJax is needed
+
+    Args:
+        html (str): _rendered markdown_
+
+    Returns:
+        bool: _True if the html has math for MathJax_
+    """
+    return ARITHMATEX_CLASS in html
+
+
+@lru_cache(maxsize=MATH_CACHE_SIZE)
+def _formula_to_mathml(formula: str, display: str) -> Optional[str]:
+    """Convert LaTeX formula to MathML, cached by the formula hash
+
+    Args:
+        formula (str): _LaTeX formula_
+        display (str): _'inline' or 'block'_
+
+    Returns:
+        Optional[str]: _MathML or None if the formula is not supported_
+    """
+    try:
+        return sanitize_mathml(latex_to_mathml(formula, display=display))
+    except Exception as e:
+        logger.warning(f"Formula is left for MathJax - {e}")
+
+
+def sanitize_mathml(mathml: str) -> str:
+    """Parse MathML and serialize it again with escaped text
+
+    Args:
+        mathml (str): _MathML of latex2mathml_
+
+    Raises:
+        ValueError: _MathML is not well-formed or has elements or attributes out of the allowlist_
+
+    Returns:
+        str: _MathML of allowed elements and attributes_
+    """
+    try:
+        root = etree.fromstring(mathml)
+    except etree.ParseError as e:
+        raise ValueError(f"MathML is not well-formed: {e}") from e
+    for element in root.iter():
+        namespace, _, name = element.tag.rpartition('}')
+        if namespace != '{' + MATHML_NAMESPACE or name not in MATHML_ELEMENTS:
+            raise ValueError(f"MathML element {element.tag} is not allowed")
+        if disallowed := set(element.attrib) - MATHML_ATTRIBUTES:
+            raise ValueError(f"MathML attributes {', '.join(sorted(disallowed))} are not allowed")
+        element.tag = name
+    root.set('xmlns', MATHML_NAMESPACE)
+    return etree.tostring(root, encoding='unicode', short_empty_elements=False)
+
+
+cache_stats.register('math', lambda: _formula_to_mathml.cache_info()[:2])
+
+
+def prerender_math(html: str) -> str:
+    """Prerender arithmatex formulas to MathML if it is enabled with MATH_RENDERER setting
+
+    Unsupported formulas stay in the generic arithmatex markup for MathJax.
+
+    Args:
+        html (str): _rendered markdown_
+
+    Returns:
+        str: _html with MathML formulas_
+    """
+    if MATH_RENDERER != 'mathml' or latex_to_mathml is None or not has_math(html):
+        return html
+
+    def replace(match: re.Match) -> str:
+        display = 'block' if match.group(1) == 'div' else 'inline'
+        mathml = _formula_to_mathml(unescape(match.group(2)).strip(), display)
+        return f'<{match.group(1)} class="arithmatex-mathml">{mathml}</{match.group(1)}>' if mathml else match.group(0)
+
+    return ARITHMATEX_RE.sub(replace, html)
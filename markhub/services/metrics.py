@@ -0,0 +1,321 @@
+"""
+In-process metrics in the Prometheus text format and per-request timings for the Server-Timing header.
+
+Metrics are kept per process, so every worker exposes its own figures.
+"""
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Request timings: timing name: [seconds, calls]
+_request_timings: ContextVar[Optional[Dict[str, List[float]]]] = ContextVar('request_timings', default=None)
+# Metrics collected for another process: histogram observations, request timings and cache lookups
+_collected_metrics: ContextVar[Optional[Dict[str, list]]] = ContextVar('collected_metrics', default=None)
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    """Format labels as {name="value",...}"""
+    if not labels:
+        return ''
+    escaped = (
+        '{}="{}"'.format(name, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for name, value in labels.items()
+    )
+    return '{' + ','.join(escaped) + '}'
+
+
+class Histogram:
+    """Histogram with cumulative buckets per label values"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        """Create histogram and register it
+
+        Args:
+            name (str): _metric name_
+            documentation (str): _metric help_
+            labelnames (Sequence[str]): _label names_
+            buckets (Sequence[float]): _bucket upper bounds_
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._values: Dict[Tuple[str, ...], List] = {}
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Observe value
+
+        Args:
+            value (float): _observed value, seconds for durations_
+            labels (str): _label values_
+        """
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        with self._lock:
+            value_stats = self._values.setdefault(key, [[0] * len(self.buckets), 0.0, 0])
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    value_stats[0][i] += 1
+            value_stats[1] += value
+            value_stats[2] += 1
+        if (collected := _collected_metrics.get()) is not None:
+            collected['observations'].append((self.name, value, labels))
+
+    def expose(self) -> List[str]:
+        """Get metric lines in the Prometheus text format"""
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            values = {key: (list(value[0]), value[1], value[2]) for key, value in self._values.items()}
+        for key, (counts, total, count) in sorted(values.items()):
+            labels = dict(zip(self.labelnames, key))
+            for bound, bucket_count in zip(self.buckets, counts):
+                lines.append(f'{self.name}_bucket{_format_labels({**labels, "le": repr(float(bound))})} {bucket_count}')
+            lines.append(f'{self.name}_bucket{_format_labels({**labels, "le": "+Inf"})} {count}')
+            lines.append(f'{self.name}_sum{_format_labels(labels)} {total}')
+            lines.append(f'{self.name}_count{_format_labels(labels)} {count}')
+        return lines
+
+
+class Gauge:
+    """Gauge read from a collector at exposition"""
+
+    def __init__(self, name: str, documentation: str, collector: Callable[[], float]) -> None:
+        """Create gauge and register it
+
+        Args:
+            name (str): _metric name_
+            documentation (str): _metric help_
+            collector (Callable): _returns the current value_
+        """
+        self.name = name
+        self.documentation = documentation
+        self.collector = collector
+        REGISTRY.append(self)
+
+    def expose(self) -> List[str]:
+        """Get metric lines in the Prometheus text format"""
+        return [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} gauge',
+                f'{self.name} {self.collector()}']
+
+
+class CacheStats:
+    """Hit and miss counters of MarkHub caches with hit ratios"""
+
+    name = 'markhub_cache_requests_total'
+
+    def __init__(self) -> None:
+        """Create cache stats and register them"""
+        self._counts: Dict[Tuple[str, str], int] = defaultdict(int)
+        self._collectors: Dict[str, Callable[[], Tuple[int, int]]] = {}
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def hit(self, cache: str, hit: bool = True) -> None:
+        """Count cache lookup
+
+        Args:
+            cache (str): _cache name_
+            hit (bool): _True for hit, False for miss_
+        """
+        with self._lock:
+            self._counts[(cache, 'hit' if hit else 'miss')] += 1
+
+    def add(self, cache: str, hits: int, misses: int) -> None:
+        """Count cache lookups made elsewhere, e.g. in render processes
+
+        Args:
+            cache (str): _cache name_
+            hits (int): _hits_
+            misses (int): _misses_
+        """
+        with self._lock:
+            self._counts[(cache, 'hit')] += hits
+            self._counts[(cache, 'miss')] += misses
+
+    def miss(self, cache: str) -> None:
+        """Count cache miss
+
+        Args:
+            cache (str): _cache name_
+        """
+        self.hit(cache, False)
+
+    def register(self, cache: str, collector: Callable[[], Tuple[int, int]]) -> None:
+        """Register cache with its own counters
+
+        Args:
+            cache (str): _cache name_
+            collector (Callable): _returns hits and misses of the cache_
+        """
+        self._collectors[cache] = collector
+
+    def get(self) -> Dict[str, Tuple[int, int]]:
+        """Get hits and misses by cache name"""
+        with self._lock:
+            stats = {
+                cache: (self._counts[(cache, 'hit')], self._counts[(cache, 'miss')])
+                for cache, _ in list(self._counts)
+            }
+        for cache, collector in self._collectors.items():
+            hits, misses = collector()
+            counted_hits, counted_misses = stats.get(cache, (0, 0))
+            stats[cache] = (counted_hits + hits, counted_misses + misses)
+        return stats
+
+    def expose(self) -> List[str]:
+        """Get metric lines in the Prometheus text format"""
+        stats = sorted(self.get().items())
+        lines = [f'# HELP {self.name} Cache lookups by result', f'# TYPE {self.name} counter']
+        for cache, (hits, misses) in stats:
+            lines.append(f'{self.name}{_format_labels({"cache": cache, "result": "hit"})} {hits}')
+            lines.append(f'{self.name}{_format_labels({"cache": cache, "result": "miss"})} {misses}')
+        lines += ['# HELP markhub_cache_hit_ratio Cache hit ratio', '# TYPE markhub_cache_hit_ratio gauge']
+        for cache, (hits, misses) in stats:
+            ratio = hits / (hits + misses) if hits + misses else 0.0
+            lines.append(f'markhub_cache_hit_ratio{_format_labels({"cache": cache})} {ratio}')
+        return lines
+
+
+REGISTRY: List = []
+
+VIEW_DURATION = Histogram('markhub_view_duration_seconds', 'Response time by view', ['view', 'method', 'status'])
+GITHUB_DURATION = Histogram('markhub_github_request_duration_seconds', 'GitHub request time by endpoint',
+                            ['method', 'endpoint'])
+RENDER_DURATION = Histogram('markhub_render_duration_seconds', 'Markdown render time')
+HIGHLIGHT_DURATION = Histogram('markhub_highlight_duration_seconds', 'Code highlighting time per markdown render')
+DB_DURATION = Histogram('markhub_db_query_duration_seconds', 'Database query time')
+SESSION_DURATION = Histogram('markhub_session_duration_seconds', 'Session load and save time', ['operation'])
+TEMPLATE_DURATION = Histogram('markhub_template_render_duration_seconds', 'Template render time', ['template'])
+MIRROR_DURATION = Histogram('markhub_mirror_duration_seconds', 'Repository mirror fetch and read time', ['operation'])
+RENDER_POOL_DURATION = Histogram('markhub_render_pool_job_duration_seconds',
+                                 'Render pool job time with the wait for a free process by result', ['result'])
+RENDER_QUEUE_WAIT = Histogram('markhub_render_pool_wait_seconds', 'Wait for a free render process')
+cache_stats = CacheStats()
+
+
+def render_metrics() -> str:
+    """Get all metrics in the Prometheus text format
+
+    Returns:
+        str: _metrics exposition_
+    """
+    return '\n'.join(line for metric in REGISTRY for line in metric.expose()) + '\n'
+
+
+def record_timing(name: str, seconds: float) -> None:
+    """Add timing to the current request Server-Timing
+
+    Args:
+        name (str): _timing name_
+        seconds (float): _duration_
+    """
+    if (timings := _request_timings.get()) is not None:
+        timing = timings.setdefault(name, [0.0, 0])
+        timing[0] += seconds
+        timing[1] += 1
+    if (collected := _collected_metrics.get()) is not None:
+        collected['timings'].append((name, seconds))
+
+
+@contextmanager
+def timed(name: str, histogram: Histogram, **labels: str) -> Iterator[None]:
+    """Measure the block duration into the histogram and the current request Server-Timing
+
+    Args:
+        name (str): _Server-Timing name_
+        histogram (Histogram): _histogram to observe_
+        labels (str): _histogram label values_
+    """
+    started = perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = perf_counter() - started
+        histogram.observe(elapsed, **labels)
+        record_timing(name, elapsed)
+
+
+@contextmanager
+def collect_metrics() -> Iterator[Dict[str, list]]:
+    """Collect histogram observations, request timings and cache lookups of the block for merge_metrics,
+    so metrics of render processes are exposed by the web worker
+
+    Yields:
+        Dict[str, list]: _collected metrics, picklable_
+    """
+    collected: Dict[str, list] = {'observations': [], 'timings': [], 'cache': []}
+    before = cache_stats.get()
+    token = _collected_metrics.set(collected)
+    try:
+        yield collected
+    finally:
+        _collected_metrics.reset(token)
+        for cache, (hits, misses) in cache_stats.get().items():
+            before_hits, before_misses = before.get(cache, (0, 0))
+            if hits != before_hits or misses != before_misses:
+                collected['cache'].append((cache, hits - before_hits, misses - before_misses))
+
+
+def merge_metrics(collected: Dict[str, list]) -> None:
+    """Add metrics collected by collect_metrics in another process to this process and the current request
+
+    Args:
+        collected (Dict[str, list]): _collected metrics_
+    """
+    histograms = {metric.name: metric for metric in REGISTRY if isinstance(metric, Histogram)}
+    for name, value, labels in collected['observations']:
+        if name in histograms:
+            histograms[name].observe(value, **labels)
+    for name, seconds in collected['timings']:
+        record_timing(name, seconds)
+    for cache, hits, misses in collected['cache']:
+        cache_stats.add(cache, hits, misses)
+
+
+def get_request_timings() -> Optional[Dict[str, List[float]]]:
+    """Get timings of the current request
+
+    Returns:
+        Optional[Dict[str, List[float]]]: _timing name: [seconds, calls] or None outside of requests_
+    """
+    return _request_timings.get()
+
+
+@contextmanager
+def request_timings() -> Iterator[Dict[str, List[float]]]:
+    """Collect timings of the current request
+
+    Yields:
+        Dict[str, List[float]]: _timing name: [seconds, calls]_
+    """
+    timings: Dict[str, List[float]] = {}
+    token = _request_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _request_timings.reset(token)
+
+
+def server_timing(timings: Dict[str, List[float]], total: float) -> str:
+    """Format timings as the Server-Timing header value
+
+    Args:
+        timings (Dict[str, List[float]]): _timing name: [seconds, calls]_
+        total (float): _request seconds_
+
+    Returns:
+        str: _Server-Timing header value_
+    """
+    metrics = [
+        f'{name};dur={seconds * 1000:.1f};desc="{int(calls)} calls"'
+        for name, (seconds, calls) in timings.items()
+    ]
+    metrics.append(f'total;dur={total * 1000:.1f}')
+    return ', '.join(metrics)
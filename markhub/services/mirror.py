@@ -0,0 +1,354 @@
+"""
+Local shallow bare mirrors of GitHub repositories for reads without the contents API.
+
+With REPOSITORY_BACKEND = 'mirror' `GitHubRepository` reads trees, blobs, branches and path history
+from a bare mirror per repository in MIRROR_DIR. Mirrors are fetched incrementally over the git
+protocol with dulwich (`poetry install -E mirror`) at most once per MIRROR_FETCH_INTERVAL and after
+every write, so the API is used for writes only. Reads the mirror can't answer raise `MirrorError`
+and are made via the API: failed fetches, unknown refs and path history beyond the shallow depth.
+"""
+import stat
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path, PurePosixPath
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+from urllib.parse import quote
+
+from markhub.settings import (MIRROR_CLONE_URL, MIRROR_DEPTH, MIRROR_DIR,
+                              MIRROR_FETCH_INTERVAL, REPOSITORY_BACKEND,
+                              logger)
+
+from .metrics import MIRROR_DURATION, timed
+
+Repo = None
+if REPOSITORY_BACKEND == 'mirror':
+    try:
+        from dulwich.client import get_transport_and_path
+        from dulwich.errors import NotGitRepository, NotTreeError
+        from dulwich.object_store import tree_lookup_path
+        from dulwich.repo import Repo
+    except ImportError:  # optional dependency, install with `poetry install -E mirror`
+        logger.warning("REPOSITORY_BACKEND is 'mirror', but dulwich is not installed, the GitHub API is used")
+
+FETCHED_STAMP = 'markhub-fetched'  # mtime is the last fetch time, removed to make the mirror stale
+HEADS = b'refs/heads/'
+
+
+class MirrorError(Exception):
+    """The mirror can't answer, the GitHub API should be used"""
+
+
+@dataclass
+class MirrorContent:
+    """Repository item read from the mirror with the `ContentFile` attributes used by views"""
+
+    name: str
+    path: str
+    type: str  # 'file', 'dir', 'symlink' or 'submodule'
+    sha: str
+    html_url: str
+    repo: 'Repo' = field(repr=False)
+
+    @property
+    def decoded_content(self) -> bytes:
+        return self.repo[self.sha.encode()].data
+
+    @property
+    def size(self) -> int:
+        return len(self.decoded_content) if self.type == 'file' else 0
+
+
+class LastCommit(NamedTuple):
+    """Last commit changing a directory entry"""
+
+    sha: str
+    date: datetime
+    message: str  # first line
+
+
+def _get_item_type(mode: int) -> str:
+    """Get contents API item type of the tree entry mode"""
+    if stat.S_ISDIR(mode):
+        return 'dir'
+    if stat.S_ISLNK(mode):
+        return 'symlink'
+    if mode & 0o170000 == 0o160000:  # gitlink
+        return 'submodule'
+    return 'file'
+
+
+class RepositoryMirror:
+    """Shallow bare mirror of a repository"""
+
+    def __init__(self, full_name: str, directory: Path) -> None:
+        """Create mirror, the bare repository is initialized at the first fetch
+
+        Args:
+            full_name (str): _owner/repo_
+            directory (Path): _bare repository directory_
+        """
+        self.full_name = full_name
+        self.directory = directory
+        self._repo: Optional[Repo] = None
+        self._lock = threading.Lock()
+        self._failed_at = 0.0  # last failed fetch time, fetches are retried after MIRROR_FETCH_INTERVAL
+
+    @property
+    def repo(self) -> 'Repo':
+        if self._repo is None:
+            try:
+                self._repo = Repo(str(self.directory))
+            except NotGitRepository:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                self._repo = Repo.init_bare(str(self.directory))
+        return self._repo
+
+    @property
+    def _stamp(self) -> Path:
+        return self.directory / FETCHED_STAMP
+
+    def is_fresh(self) -> bool:
+        """Check if the mirror was fetched less than MIRROR_FETCH_INTERVAL seconds ago"""
+        try:
+            return time.time() - self._stamp.stat().st_mtime < MIRROR_FETCH_INTERVAL
+        except FileNotFoundError:
+            return False
+
+    def mark_stale(self) -> None:
+        """Fetch at the next read, called after writes"""
+        self._stamp.unlink(missing_ok=True)
+
+    def ensure_fresh(self, get_token: Callable[[], Optional[str]]) -> None:
+        """Fetch the mirror if it is stale
+
+        Args:
+            get_token (Callable[[], Optional[str]]): _GitHub access token getter, called for fetches only_
+
+        Raises:
+            MirrorError: _fetch failed_
+        """
+        if self.is_fresh():
+            return
+        with self._lock:
+            if self.is_fresh():
+                return
+            if time.time() - self._failed_at < MIRROR_FETCH_INTERVAL:
+                raise MirrorError(f'{self.full_name} fetch failed recently')
+            try:
+                self.fetch(get_token())
+            except MirrorError:
+                self._failed_at = time.time()
+                raise
+
+    def fetch(self, token: Optional[str]) -> None:
+        """Fetch branches incrementally and prune deleted ones
+
+        Args:
+            token (Optional[str]): _GitHub access token for private repositories_
+
+        Raises:
+            MirrorError: _fetch failed_
+        """
+        owner, name = self.full_name.split('/')
+        url = MIRROR_CLONE_URL.format(owner=owner, repo=name)
+        local = url.startswith('file://')
+        if token and url.startswith('https://'):
+            url = url.replace('https://', f'https://x-access-token:{quote(token, safe="")}@', 1)
+        repo = self.repo
+
+        def determine_wants(refs: Dict[bytes, bytes], depth: Optional[int] = None) -> List[bytes]:
+            return [sha for ref, sha in refs.items() if ref.startswith(HEADS) and sha not in repo.object_store]
+
+        try:
+            with timed('mirror', MIRROR_DURATION, operation='fetch'):
+                client, path = get_transport_and_path(url)
+                # the local client has no shallow support, local sources are fetched in full
+                result = client.fetch(path, repo, determine_wants, depth=None if local else MIRROR_DEPTH)
+        except Exception as e:  # protocol, authentication and network errors differ per transport
+            raise MirrorError(f'{self.full_name} fetch failed - {type(e).__name__}') from e
+        heads = {ref: sha for ref, sha in result.refs.items() if ref.startswith(HEADS)}
+        for ref in set(repo.refs.keys(base=HEADS)) - {ref[len(HEADS):] for ref in heads}:
+            del repo.refs[HEADS + ref]
+        for ref, sha in heads.items():
+            repo.refs[ref] = sha
+        if (head := result.symrefs.get(b'HEAD')) in heads:
+            repo.refs.set_symbolic_ref(b'HEAD', head)
+        self._stamp.touch()
+        logger.info(f"{self.full_name} mirror fetched, {len(heads)} branches")
+
+    def resolve(self, ref: str) -> bytes:
+        """Get commit SHA of the branch or commit
+
+        Args:
+            ref (str): _branch name or commit SHA_
+
+        Raises:
+            MirrorError: _unknown ref_
+
+        Returns:
+            bytes: _commit SHA_
+        """
+        name = HEADS + ref.encode()
+        if name in self.repo.refs:
+            return self.repo.refs[name]
+        if len(ref) == 40 and ref.encode() in self.repo.object_store:
+            return ref.encode()
+        raise MirrorError(f'{self.full_name} mirror has no {ref}')
+
+    def get_branches(self) -> List[str]:
+        """Get branch names"""
+        return sorted(ref.decode() for ref in self.repo.refs.keys(base=HEADS))
+
+    def get_last_commit(self, ref: str) -> Tuple[str, datetime]:
+        """Get head commit SHA and its committer date of the branch
+
+        Args:
+            ref (str): _branch name or commit SHA_
+
+        Returns:
+            Tuple[str, datetime]: _commit SHA and UTC committer date_
+        """
+        sha = self.resolve(ref)
+        return sha.decode(), datetime.utcfromtimestamp(self.repo[sha].commit_time)
+
+    def get_contents(self, path: str, ref: str, html_url: str) -> Union[MirrorContent, List[MirrorContent], None]:
+        """Get file or directory entries
+
+        Args:
+            path (str): _repository item path, '' for the root_
+            ref (str): _branch name or commit SHA_
+            html_url (str): _repository html url_
+
+        Returns:
+            Union[MirrorContent, List[MirrorContent], None]: _file, directory entries or None if not found_
+        """
+        with timed('mirror', MIRROR_DURATION, operation='contents'):
+            repo = self.repo
+            tree_sha = repo[self.resolve(ref)].tree
+            path = path.strip('/')
+            mode = stat.S_IFDIR
+            if path:
+                try:
+                    mode, tree_sha = tree_lookup_path(repo.__getitem__, tree_sha, path.encode())
+                except (KeyError, NotTreeError):
+                    return None
+            if not stat.S_ISDIR(mode):
+                return self._content(path, _get_item_type(mode), tree_sha, ref, html_url)
+            return [
+                self._content(
+                    str(PurePosixPath(path, entry.path.decode())), _get_item_type(entry.mode), entry.sha, ref, html_url
+                )
+                for entry in repo[tree_sha].iteritems()
+            ]
+
+    def _content(self, path: str, item_type: str, sha: bytes, ref: str, html_url: str) -> MirrorContent:
+        view = 'tree' if item_type == 'dir' else 'blob'
+        return MirrorContent(
+            PurePosixPath(path).name, path, item_type, sha.decode(), f'{html_url}/{view}/{ref}/{path}', self.repo
+        )
+
+    def get_file_last_update(self, path: str, ref: str) -> Optional[datetime]:
+        """Get committer date of the last commit changing the path
+
+        Args:
+            path (str): _repository item path_
+            ref (str): _branch name or commit SHA_
+
+        Raises:
+            MirrorError: _the last change is beyond the shallow history_
+
+        Returns:
+            Optional[datetime]: _UTC committer date or None if the path was never changed_
+        """
+        with timed('mirror', MIRROR_DURATION, operation='history'):
+            walker = self.repo.get_walker(include=[self.resolve(ref)], paths=[path.encode()], max_entries=1)
+            entry = next(iter(walker), None)
+        if entry is None:
+            return None
+        if entry.commit.id in self.repo.get_shallow():
+            # the shallow boundary commit shows every file as added, the real change may be older
+            raise MirrorError(f'{self.full_name} mirror history of {path} is too shallow')
+        return datetime.utcfromtimestamp(entry.commit.commit_time)
+
+    def _get_dir_entries(self, commit_sha: bytes, path: str) -> Dict[str, bytes]:
+        """Get directory entry SHAs by name at the commit, empty if the directory is missing"""
+        tree_sha = self.repo[commit_sha].tree
+        if path:
+            try:
+                mode, tree_sha = tree_lookup_path(self.repo.__getitem__, tree_sha, path.encode())
+            except (KeyError, NotTreeError):
+                return {}
+            if not stat.S_ISDIR(mode):
+                return {}
+        return {entry.path.decode(): entry.sha for entry in self.repo[tree_sha].iteritems()}
+
+    def get_last_commits(self, path: str, ref: str, names: Iterable[str], limit: int) -> Dict[str, LastCommit]:
+        """Get last commits changing directory entries with one walk of the directory history
+
+        An entry is changed by a commit if its SHA differs from the SHAs in all commit parents.
+
+        Args:
+            path (str): _directory path, '' for the root_
+            ref (str): _branch name or commit SHA_
+            names (Iterable[str]): _entry names_
+            limit (int): _max walked commits_
+
+        Returns:
+            Dict[str, LastCommit]: _last commit by entry name, entries changed beyond the limit
+                or the shallow history are missing_
+        """
+        pending = set(names)
+        last_commits: Dict[str, LastCommit] = {}
+        shallow = self.repo.get_shallow()
+        entries: Dict[bytes, Dict[str, bytes]] = {}  # directory entries by commit
+
+        def get_entries(commit_sha: bytes) -> Dict[str, bytes]:
+            if commit_sha not in entries:
+                entries[commit_sha] = self._get_dir_entries(commit_sha, path)
+            return entries[commit_sha]
+
+        with timed('mirror', MIRROR_DURATION, operation='last_commits'):
+            walker = self.repo.get_walker(
+                include=[self.resolve(ref)], paths=[path.encode()] if path else None, max_entries=limit
+            )
+            for entry in walker:
+                commit = entry.commit
+                if not pending or commit.id in shallow:
+                    break
+                current = get_entries(commit.id)
+                parents = [get_entries(parent) for parent in commit.parents]
+                for name in [name for name in pending if all(parent.get(name) != current.get(name)
+                                                               for parent in parents)]:
+                    last_commits[name] = LastCommit(
+                        commit.id.decode(),
+                        datetime.utcfromtimestamp(commit.commit_time),
+                        commit.message.decode('UTF-8', 'replace').partition('\n')[0],
+                    )
+                    pending.discard(name)
+        return last_commits
+
+
+_mirrors: Dict[str, RepositoryMirror] = {}
+_mirrors_lock = threading.Lock()
+
+
+def get_mirror(full_name: str) -> RepositoryMirror:
+    """Get the process-wide mirror of the repository
+
+    Args:
+        full_name (str): _owner/repo_
+
+    Raises:
+        MirrorError: _dulwich is not installed_
+
+    Returns:
+        RepositoryMirror: _repository mirror_
+    """
+    if Repo is None:
+        raise MirrorError('dulwich is not installed')
+    with _mirrors_lock:
+        if full_name not in _mirrors:
+            _mirrors[full_name] = RepositoryMirror(full_name, Path(MIRROR_DIR, f'{full_name}.git'))
+        return _mirrors[full_name]
@@ -0,0 +1,163 @@
+import threading
+from concurrent.futures import (FIRST_COMPLETED, Future, ProcessPoolExecutor,
+                                ThreadPoolExecutor, wait)
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Callable, Dict, List, Optional, Tuple
+
+from django.core.cache import cache
+from github import GithubException
+from github.Repository import Repository
+
+from markhub.settings import (PRERENDER_FETCH_CONCURRENCY,
+                              PRERENDER_PROCESSES, RENDER_CACHE_VERSION,
+                              logger)
+
+from .github_repository import get_github
+from .markdown_render import (cache_rendered, get_render_cache_key,
+                              markdownify)
+
+MARKDOWN_SUFFIX = '.md'
+
+_thread_local = threading.local()
+
+
+@dataclass
+class PrerenderStats:
+    """Prerendering progress with throughput figures"""
+
+    total: int = 0
+    fetched: int = 0
+    rendered: int = 0
+    cached: int = 0
+    errors: int = 0
+    size: int = 0
+    started: float = 0.0
+
+    @property
+    def done(self) -> int:
+        """Number of processed files"""
+        return self.rendered + self.cached + self.errors
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since prerendering start"""
+        return perf_counter() - self.started
+
+    @property
+    def files_per_second(self) -> float:
+        """Processed files per second"""
+        return self.done / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def mb_per_second(self) -> float:
+        """Fetched markdown megabytes per second"""
+        return self.size / (1024 * 1024) / self.elapsed if self.elapsed else 0.0
+
+    def __str__(self) -> str:
+        """String stats representation
+
+        Returns:
+            _str_: _progress with throughput figures_
+        """
+        return (f'{self.done}/{self.total} files ({self.rendered} rendered, {self.cached} cached, '
+                f'{self.errors} errors) in {self.elapsed:.2f}s - '
+                f'{self.files_per_second:.1f} files/s, {self.mb_per_second:.2f} MB/s')
+
+
+def list_markdown_files(handler: Repository, branch: str, path: str = '') -> List[str]:
+    """List markdown files from the branch tree with one API call
+
+    Args:
+        handler (Repository): _GitHub repository_
+        branch (str): _repository branch_
+        path (str): _directory to list, defaults to '' (repository root)_
+
+    Returns:
+        List[str]: _markdown file paths_
+    """
+    tree = handler.get_git_tree(branch, recursive=True)
+    if tree.raw_data.get('truncated'):
+        logger.warning(f"{handler.full_name}@{branch} tree is truncated, some files will be skipped")
+    prefix = f"{path.strip('/')}/" if path.strip('/') else ''
+    return [
+        item.path
+        for item in tree.tree
+        if item.type == 'blob' and item.path.lower().endswith(MARKDOWN_SUFFIX) and item.path.startswith(prefix)
+    ]
+
+
+def _fetch(token: str, full_name: str, branch: str, path: str) -> bytes:
+    """Fetch file contents with a GitHub handler of the current thread
+
+    PyGithub keeps one connection per handler, so handlers are not shared between threads.
+    """
+    if getattr(_thread_local, 'key', None) != (token, full_name):
+        _thread_local.handler = get_github(token).get_repo(full_name, lazy=True)
+        _thread_local.key = (token, full_name)
+    return _thread_local.handler.get_contents(path, ref=branch).decoded_content
+
+
+def prerender(token: str, handler: Repository, branch: str, path: str = '',
+              progress: Optional[Callable[[str, PrerenderStats], None]] = None,
+              concurrency: int = PRERENDER_FETCH_CONCURRENCY,
+              processes: Optional[int] = PRERENDER_PROCESSES) -> PrerenderStats:
+    """Render all markdown files of the repository directory into the render cache
+
+    Files are fetched by a bounded thread pool and rendered by a process pool,
+    because markdown rendering is CPU-bound.
+
+    Args:
+        token (str): _GitHub access token_
+        handler (Repository): _GitHub repository_
+        branch (str): _repository branch_
+        path (str): _directory to prerender, defaults to '' (repository root)_
+        progress (Callable): _callback with processed file path and current stats_
+        concurrency (int): _max concurrent fetches_
+        processes (int): _render processes, defaults to None (CPU count)_
+
+    Returns:
+        PrerenderStats: _final stats_
+    """
+    stats = PrerenderStats(started=perf_counter())
+    paths = list_markdown_files(handler, branch, path)
+    stats.total = len(paths)
+    if not paths:
+        return stats
+
+    def report(item: str) -> None:
+        if progress:
+            progress(item, stats)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as fetch_pool, \
+            ProcessPoolExecutor(max_workers=processes) as render_pool:
+        pending: Dict[Future, Tuple[str, Optional[str]]] = {
+            fetch_pool.submit(_fetch, token, handler.full_name, branch, item): (item, None)
+            for item in paths
+        }
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                item, content = pending.pop(future)
+                is_fetch = content is None
+                try:
+                    result = future.result()
+                    if is_fetch:
+                        stats.fetched += 1
+                        stats.size += len(result)
+                        content = result.decode('UTF-8')
+                except (GithubException, UnicodeDecodeError) as e:
+                    logger.error(f"Prerender failed for {item} - {e}")
+                    stats.errors += 1
+                    report(item)
+                    continue
+                if not is_fetch:
+                    cache_rendered(content, result)
+                    stats.rendered += 1
+                    report(item)
+                elif cache.has_key(get_render_cache_key(content), version=RENDER_CACHE_VERSION):
+                    stats.cached += 1
+                    report(item)
+                else:
+                    pending[render_pool.submit(markdownify, content)] = (item, content)
+    return stats
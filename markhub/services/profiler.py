@@ -0,0 +1,139 @@
+"""
+Low-overhead sampling profiler of a single thread with collapsed stacks and speedscope output.
+
+A background thread samples the stack of the profiled thread every `interval` seconds with
+`sys._current_frames()`, so the profiled code runs without tracing hooks.
+"""
+import os
+import sys
+import threading
+from collections import Counter
+from types import FrameType
+from typing import Dict, List, Optional
+
+from markhub.settings import BASE_DIR
+
+MAX_STACK_DEPTH = 128
+
+
+def _frame_name(frame: FrameType) -> str:
+    """Get frame name like `function (path/to/module.py:42)`, paths are relative to the project or site-packages"""
+    code = frame.f_code
+    filename = code.co_filename
+    for root in (str(BASE_DIR), *(path for path in sys.path if path.endswith('-packages'))):
+        if filename.startswith(root + os.sep):
+            filename = filename[len(root) + 1:]
+            break
+    return f'{code.co_name} ({filename}:{code.co_firstlineno})'.replace(';', ':')
+
+
+class SamplingProfiler:
+    """Sample stacks of the thread which created the profiler"""
+
+    def __init__(self, interval: float = 0.005) -> None:
+        """Create profiler of the current thread
+
+        Args:
+            interval (float): _seconds between samples_
+        """
+        self.interval = interval
+        self.thread_id = threading.get_ident()
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> 'SamplingProfiler':
+        self.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        """Start sampling"""
+        self._thread = threading.Thread(target=self._sample, name='markhub-profiler', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    @property
+    def samples(self) -> int:
+        return sum(self.stacks.values())
+
+    def _sample(self) -> None:
+        names: Dict[object, str] = {}  # frame name per code object
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack: List[str] = []
+            while frame is not None and len(stack) < MAX_STACK_DEPTH:
+                if (name := names.get(frame.f_code)) is None:
+                    name = names[frame.f_code] = _frame_name(frame)
+                stack.append(name)
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+            del frame
+
+    def collapsed(self) -> str:
+        """Get stacks in the collapsed format of flamegraph.pl and speedscope"""
+        return collapsed_stacks(self.stacks)
+
+
+def collapsed_stacks(stacks: Dict[str, int]) -> str:
+    """Format stacks as `frame;frame;frame count` lines
+
+    Args:
+        stacks (Dict[str, int]): _semicolon separated stack: samples_
+
+    Returns:
+        str: _collapsed stacks_
+    """
+    return ''.join(f'{stack} {count}\n' for stack, count in sorted(stacks.items()))
+
+
+def parse_collapsed(collapsed: str) -> Dict[str, int]:
+    """Parse collapsed stacks
+
+    Args:
+        collapsed (str): _collapsed stacks_
+
+    Returns:
+        Dict[str, int]: _semicolon separated stack: samples_
+    """
+    stacks: Dict[str, int] = {}
+    for line in collapsed.splitlines():
+        stack, _, count = line.rpartition(' ')
+        if stack and count.isdigit():
+            stacks[stack] = stacks.get(stack, 0) + int(count)
+    return stacks
+
+
+def to_speedscope(collapsed: str, name: str, interval: float) -> dict:
+    """Convert collapsed stacks to the speedscope sampled profile
+
+    Args:
+        collapsed (str): _collapsed stacks_
+        name (str): _profile name_
+        interval (float): _seconds between samples_
+
+    Returns:
+        dict: _speedscope file JSON_
+    """
+    frames: Dict[str, int] = {}
+    samples, weights = [], []
+    for stack, count in parse_collapsed(collapsed).items():
+        samples.append([frames.setdefault(frame, len(frames)) for frame in stack.split(';')])
+        weights.append(count * interval * 1000)
+    return {
+        '$schema': 'https://www.speedscope.app/file-format-schema.json',
+        'shared': {'frames': [{'name': frame} for frame in frames]},
+        'profiles': [{
+            'type': 'sampled', 'name': name, 'unit': 'milliseconds',
+            'startValue': 0, 'endValue': sum(weights), 'samples': samples, 'weights': weights,
+        }],
+        'exporter': 'markhub',
+    }
@@ -0,0 +1,291 @@
+"""
+Render sandbox: markdown is rendered by a bounded pool of worker processes with limits per job.
+
+Pathological documents can pin a CPU for seconds, so page renders run in RENDER_POOL_PROCESSES
+processes of the web worker instead of its request threads. A job over RENDER_TIMEOUT seconds gets
+its process killed and replaced. A job allocating over RENDER_MEMORY_LIMIT bytes gets MemoryError in
+its process. Renders over the limits, or waiting over RENDER_QUEUE_TIMEOUT seconds for a free process,
+fall back to escaped plain text. With RENDER_POOL_PROCESSES = 0 documents are rendered in the calling
+thread without limits.
+"""
+import multiprocessing
+import os
+import queue
+import threading
+from multiprocessing.connection import Connection
+from time import perf_counter
+from typing import Any, Callable, Dict, Optional
+
+from django.utils.html import escape
+from django.utils.module_loading import import_string
+
+from markhub.settings import (RENDER_MEMORY_LIMIT, RENDER_POOL_PROCESSES,
+                              RENDER_QUEUE_TIMEOUT, RENDER_TIMEOUT, logger)
+
+from .metrics import (RENDER_POOL_DURATION, RENDER_QUEUE_WAIT, Gauge,
+                      collect_metrics, merge_metrics, record_timing)
+
+try:
+    import resource
+except ImportError:  # not available on Windows, renders run without the memory limit
+    resource = None
+
+MARKDOWNIFY = 'markhub.services.markdown_render.markdownify'
+PREVIEW_MARKDOWNIFY = 'martor.utils.markdownify'
+
+
+class RenderLimitError(Exception):
+    """Render exceeded the pool limits"""
+
+    def __init__(self, reason: str, message: str) -> None:
+        """Create error
+
+        Args:
+            reason (str): _'timeout', 'memory', 'queue' or 'error'_
+            message (str): _error message_
+        """
+        super().__init__(message)
+        self.reason = reason
+
+
+def _set_memory_limit(limit: int) -> None:
+    """Limit the process address space to its current size plus `limit` bytes"""
+    if resource is None or not limit:
+        return
+    try:
+        with open('/proc/self/statm') as statm:
+            current = int(statm.read().split()[0]) * os.sysconf('SC_PAGE_SIZE')
+    except OSError:  # no procfs, the limit is relative to the Django process size
+        return
+    resource.setrlimit(resource.RLIMIT_AS, (current + limit, resource.getrlimit(resource.RLIMIT_AS)[1]))
+
+
+def _serve(connection: Connection, memory_limit: int) -> None:
+    """Render process loop: receive (function path, content), send (status, result, metrics of the render)"""
+    import django
+    django.setup()
+    from .markdown_render import markdownify
+    from .warmup import WARM_UP_DOCUMENT
+    markdownify(WARM_UP_DOCUMENT)  # renderer imports don't count towards the memory limit
+    functions: Dict[str, Callable] = {}
+    _set_memory_limit(memory_limit)
+    while True:
+        try:
+            function, content = connection.recv()
+        except (EOFError, KeyboardInterrupt):
+            return
+        with collect_metrics() as metrics:
+            try:
+                if function not in functions:
+                    functions[function] = import_string(function)
+                status, result = 'ok', functions[function](content)
+            except MemoryError:
+                connection.send(('memory', None, None))
+                return  # the process may be left inconsistent, the pool starts a new one
+            except Exception as e:
+                status, result = 'error', f'{type(e).__name__}: {e}'
+        connection.send((status, result, metrics))
+
+
+class RenderWorker:
+    """Render process connected with a pipe"""
+
+    def __init__(self) -> None:
+        """Start render process"""
+        context = multiprocessing.get_context('spawn')  # forking a threaded web worker may copy held locks
+        self.connection, child = context.Pipe()
+        self.process = context.Process(target=_serve, args=(child, RENDER_MEMORY_LIMIT), name='markhub-render',
+                                       daemon=True)
+        self.process.start()
+        child.close()
+
+    def run(self, function: str, content: str, timeout: float) -> Any:
+        """Run render function in the process
+
+        Args:
+            function (str): _render function path_
+            content (str): _markdown content_
+            timeout (float): _seconds to wait for the result_
+
+        Raises:
+            RenderLimitError: _timeout, memory limit or render error_
+
+        Returns:
+            Any: _render function result_
+        """
+        try:
+            self.connection.send((function, content))
+            if not self.connection.poll(timeout):
+                raise RenderLimitError('timeout', f'render took over {timeout} s')
+            status, result, metrics = self.connection.recv()
+        except (EOFError, OSError):
+            raise RenderLimitError('error', f'render process exited with code {self.process.exitcode}')
+        if metrics:
+            merge_metrics(metrics)  # render times and cache lookups of the process
+        if status == 'memory':
+            raise RenderLimitError('memory', f'render allocated over {RENDER_MEMORY_LIMIT} bytes')
+        if status == 'error':
+            raise RenderLimitError('error', result)
+        return result
+
+    def stop(self) -> None:
+        """Kill the process"""
+        self.process.kill()
+        self.process.join()
+        self.connection.close()
+
+
+class RenderPool:
+    """Bounded pool of render processes started on demand"""
+
+    def __init__(self, processes: int) -> None:
+        """Create pool
+
+        Args:
+            processes (int): _max render processes_
+        """
+        self.processes = processes
+        self.waiting = 0  # jobs waiting for a free process
+        self.busy = 0
+        self._idle: 'queue.LifoQueue[RenderWorker]' = queue.LifoQueue()
+        self._started = 0
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """Start all render processes"""
+        workers = []
+        while self._started < self.processes:
+            workers.append(self._acquire(None))
+        for worker in workers:
+            self._idle.put(worker)
+
+    def _acquire(self, wait: Optional[float]) -> RenderWorker:
+        with self._lock:
+            start = self._idle.empty() and self._started < self.processes
+            if start:
+                self._started += 1
+            else:
+                self.waiting += 1
+        if start:
+            try:
+                return RenderWorker()
+            except Exception:
+                with self._lock:
+                    self._started -= 1
+                raise
+        started = perf_counter()
+        try:
+            return self._idle.get(timeout=wait)
+        except queue.Empty:
+            raise RenderLimitError('queue', f'no free render process in {wait} s')
+        finally:
+            RENDER_QUEUE_WAIT.observe(perf_counter() - started)
+            with self._lock:
+                self.waiting -= 1
+
+    def run(self, function: str, content: str, wait: Optional[float] = RENDER_QUEUE_TIMEOUT,
+            timeout: float = RENDER_TIMEOUT) -> Any:
+        """Run render function in a free process, processes over the limits are replaced
+
+        Args:
+            function (str): _render function path_
+            content (str): _markdown content_
+            wait (Optional[float]): _seconds to wait for a free process, None - no limit_
+            timeout (float): _seconds to wait for the result_
+
+        Raises:
+            RenderLimitError: _limits exceeded or render error_
+
+        Returns:
+            Any: _render function result_
+        """
+        started = perf_counter()
+        try:
+            worker = self._acquire(wait)
+        except RenderLimitError as e:
+            RENDER_POOL_DURATION.observe(perf_counter() - started, result=e.reason)
+            raise
+        result = 'ok'
+        with self._lock:
+            self.busy += 1
+        try:
+            value = worker.run(function, content, timeout)
+            self._idle.put(worker)
+            return value
+        except RenderLimitError as e:
+            result = e.reason
+            if e.reason != 'error' or not worker.process.is_alive():
+                worker.stop()
+                with self._lock:
+                    self._started -= 1
+            else:
+                self._idle.put(worker)
+            raise
+        finally:
+            elapsed = perf_counter() - started
+            RENDER_POOL_DURATION.observe(elapsed, result=result)
+            record_timing('render_pool', elapsed)
+            with self._lock:
+                self.busy -= 1
+
+
+_pool: Optional[RenderPool] = None
+_pool_lock = threading.Lock()
+Gauge('markhub_render_pool_queue_depth', 'Renders waiting for a free render process',
+      lambda: render_queue_depth())
+Gauge('markhub_render_pool_busy_processes', 'Render processes running a render', lambda: _pool.busy if _pool else 0)
+
+
+def get_render_pool() -> Optional[RenderPool]:
+    """Get the process-wide render pool, None with RENDER_POOL_PROCESSES = 0"""
+    global _pool
+    if RENDER_POOL_PROCESSES and _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = RenderPool(RENDER_POOL_PROCESSES)
+    return _pool
+
+
+def render_queue_depth() -> int:
+    """Get renders waiting for a free render process, 0 without the pool"""
+    return _pool.waiting if _pool else 0
+
+
+def render(function: str, content: str, wait: Optional[float] = RENDER_QUEUE_TIMEOUT) -> Any:
+    """Run render function in the render pool or in the calling thread without the pool
+
+    Args:
+        function (str): _render function path_
+        content (str): _markdown content_
+        wait (Optional[float]): _seconds to wait for a free process, None - no limit_
+
+    Raises:
+        RenderLimitError: _limits exceeded or render error_
+
+    Returns:
+        Any: _render function result_
+    """
+    if pool := get_render_pool():
+        return pool.run(function, content, wait)
+    return import_string(function)(content)
+
+
+def plain_text(content: str) -> str:
+    """Get escaped plain text shown instead of documents over the render limits"""
+    return f'<pre class="render-fallback">{escape(content)}</pre>'
+
+
+def preview_markdownify(content: str) -> str:
+    """Render the editor preview with martor in the render pool, MARTOR_MARKDOWNIFY_FUNCTION
+
+    Args:
+        content (str): _markdown content_
+
+    Returns:
+        str: _sanitized html_
+    """
+    try:
+        return render(PREVIEW_MARKDOWNIFY, content)
+    except RenderLimitError as e:
+        logger.warning(f"Preview is shown as plain text - {e}")
+        return plain_text(content)
@@ -0,0 +1,179 @@
+from base64 import b64decode
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from django.db import connection, transaction
+from django.utils.html import escape
+from github.Repository import Repository
+
+from markhub.models import SearchDocument, SearchIndex
+from markhub.settings import logger
+
+from .headings import extract_headings
+from .prerender import MARKDOWN_SUFFIX
+
+FTS_TABLE = 'markhub_searchdocument_fts'
+SEARCH_RESULTS_LIMIT = 50
+SNIPPET_TOKENS = 16
+# Private use markers around matches, they are replaced with <mark> after escaping
+MATCH_START, MATCH_END = '\x02', '\x03'
+
+
+@dataclass
+class SearchResult:
+    """Ranked search result with highlighted snippets"""
+
+    path: str
+    path_html: str
+    snippet_html: str
+
+
+@dataclass
+class IndexUpdateStats:
+    """Search index update stats"""
+
+    added: int = 0
+    updated: int = 0
+    removed: int = 0
+
+    def __str__(self) -> str:
+        """String stats representation"""
+        return f'{self.added} added, {self.updated} updated, {self.removed} removed'
+
+
+def _get_headings(content: str) -> str:
+    """Get heading texts of the markdown toc without rendering
+
+    Args:
+        content (str): _markdown content_
+
+    Returns:
+        str: _headings separated by new lines_
+    """
+    return '\n'.join(heading.name for heading in extract_headings(content))
+
+
+def _highlight(text: str) -> str:
+    """Escape FTS highlighted text and mark matches
+
+    Args:
+        text (str): _text with match markers_
+
+    Returns:
+        str: _html with <mark> matches_
+    """
+    return escape(text).replace(MATCH_START, '<mark>').replace(MATCH_END, '</mark>')
+
+
+def _match_query(query: str) -> str:
+    """Convert user query to the FTS5 query with prefix matching of every term
+
+    Args:
+        query (str): _user query_
+
+    Returns:
+        str: _FTS5 MATCH expression_
+    """
+    return ' '.join('"{}"*'.format(term.replace('"', '""')) for term in query.split())
+
+
+def _index_documents(index: SearchIndex, documents: Dict[str, str], contents: Dict[str, str]) -> None:
+    """Add or replace documents in the search index
+
+    Args:
+        index (SearchIndex): _repository branch index_
+        documents (Dict[str, str]): _file path: blob sha_
+        contents (Dict[str, str]): _file path: markdown content_
+    """
+    with connection.cursor() as cursor:
+        for path, sha in documents.items():
+            document, _ = SearchDocument.objects.update_or_create(index=index, path=path, defaults={'sha': sha})
+            cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [document.pk])
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, path, headings, content) VALUES (%s, %s, %s, %s)',
+                [document.pk, path, _get_headings(contents[path]), contents[path]]
+            )
+
+
+def _unindex_documents(index: SearchIndex, paths: List[str]) -> None:
+    """Remove documents from the search index, their FTS rows are deleted by the trigger
+
+    Args:
+        index (SearchIndex): _repository branch index_
+        paths (List[str]): _file paths_
+    """
+    index.documents.filter(path__in=paths).delete()
+
+
+def update_search_index(handler: Repository, branch: str, commit: Optional[str] = None) -> IndexUpdateStats:
+    """Build or incrementally update the search index of the repository branch
+
+    Only blobs with changed SHAs since the indexed commit are fetched.
+
+    Args:
+        handler (Repository): _GitHub repository_
+        branch (str): _repository branch_
+        commit (str): _branch head commit SHA, fetched from GitHub if omitted_
+
+    Returns:
+        IndexUpdateStats: _update stats_
+    """
+    stats = IndexUpdateStats()
+    commit = commit or handler.get_branch(branch).commit.sha
+    index, _ = SearchIndex.objects.get_or_create(user=handler.owner.login, repo=handler.name, branch=branch)
+    if index.commit == commit:
+        return stats
+    tree = handler.get_git_tree(commit, recursive=True)
+    if tree.raw_data.get('truncated'):
+        logger.warning(f"{handler.full_name}@{branch} tree is truncated, some files will not be indexed")
+    blobs = {
+        item.path: item.sha
+        for item in tree.tree
+        if item.type == 'blob' and item.path.lower().endswith(MARKDOWN_SUFFIX)
+    }
+    indexed = dict(index.documents.values_list('path', 'sha'))
+    changed = {path: sha for path, sha in blobs.items() if indexed.get(path) != sha}
+    contents = {}
+    for path, sha in list(changed.items()):
+        try:
+            contents[path] = b64decode(handler.get_git_blob(sha).content).decode('UTF-8')
+        except UnicodeDecodeError:
+            logger.error(f"Unicode decode error during indexing {path}")
+            del changed[path]
+    removed = [path for path in indexed if path not in blobs]
+    with transaction.atomic():
+        _index_documents(index, changed, contents)
+        _unindex_documents(index, removed)
+        index.commit = commit
+        index.save()
+    stats.updated = sum(1 for path in changed if path in indexed)
+    stats.added = len(changed) - stats.updated
+    stats.removed = len(removed)
+    logger.info(f"{handler.full_name}@{branch} search index updated to {commit[:7]}: {stats}")
+    return stats
+
+
+def search(index: SearchIndex, query: str, limit: int = SEARCH_RESULTS_LIMIT) -> List[SearchResult]:
+    """Search markdown files of the indexed repository branch without GitHub calls
+
+    Paths, headings and content are ranked by BM25 with descending weights.
+
+    Args:
+        index (SearchIndex): _repository branch index_
+        query (str): _user query_
+        limit (int): _max results_
+
+    Returns:
+        List[SearchResult]: _ranked results_
+    """
+    if not (match := _match_query(query)):
+        return []
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT d.path, highlight({FTS_TABLE}, 0, %s, %s), snippet({FTS_TABLE}, -1, %s, %s, %s, %s) '
+            f'FROM {FTS_TABLE} JOIN {SearchDocument._meta.db_table} AS d ON d.id = {FTS_TABLE}.rowid '
+            f'WHERE {FTS_TABLE} MATCH %s AND d.index_id = %s '
+            f'ORDER BY bm25({FTS_TABLE}, 10.0, 5.0, 1.0) LIMIT %s',
+            [MATCH_START, MATCH_END, MATCH_START, MATCH_END, '…', SNIPPET_TOKENS, match, index.pk, limit]
+        )
+        return [SearchResult(path, _highlight(path_html), _highlight(snippet)) for path, path_html, snippet in cursor]
@@ -0,0 +1,50 @@
+"""
+Worker warm-up: load what the first request would pay for.
+
+PyGithub, Markdown extensions, Pygments lexers, the emoji index and the math renderer are
+imported lazily, so `django.setup()` stays fast for `manage.py` commands and autoscaled workers.
+`warm_up` loads them explicitly, it is called by the WSGI/ASGI application with WARM_UP.
+"""
+from time import perf_counter
+
+from django.urls import get_resolver
+
+from markhub.settings import HIGHLIGHT_PRELOAD_LEXERS, logger
+
+# Touches every lazily loaded renderer part: extensions, emoji index, highlighting and math
+WARM_UP_DOCUMENT = """# Warm-up :rocket:
+
+Text with **emphasis**, ==mark==, ~~tilde~~, ++ctrl+c++ and $e^{i\\pi} + 1 = 0$.
+
+```python
+print('warm')
+```
+
+| Column | Value |
+| ------ | ----- |
+| a      | `1`   |
+
+- [x] done
+"""
+
+
+def warm_up() -> float:
+    """Import views with PyGithub, preload Pygments lexers, render a sample document and start render processes
+
+    Returns:
+        float: _warm-up seconds_
+    """
+    from markhub.extensions.highlight_cache import preload_lexers
+
+    from .markdown_render import markdownify
+    from .render_pool import get_render_pool
+
+    started = perf_counter()
+    get_resolver().url_patterns  # imports the URLconf with all views
+    preload_lexers(HIGHLIGHT_PRELOAD_LEXERS)
+    markdownify(WARM_UP_DOCUMENT)
+    if pool := get_render_pool():
+        pool.start()
+    elapsed = perf_counter() - started
+    logger.info(f"Worker warmed up in {elapsed * 1000:.0f} ms")
+    return elapsed
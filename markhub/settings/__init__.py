@@ -1,4 +1,5 @@
 from .django import *
 from .allauth import *
 from .martor import *
+from .markhub import *
 from .logging import *
@@ -0,0 +1,176 @@
+from .django import BASE_DIR, DEBUG, env
+
+# MarkHub settings
+
+# GitHub endpoints, point them to a fake GitHub server for load testing
+GITHUB_API_URL = env('GITHUB_API_URL', default='https://api.github.com')
+GITHUB_RAW_URL = env('GITHUB_RAW_URL', default='https://raw.githubusercontent.com')
+
+# Render cache
+# Rendered markdown is keyed by the content hash, so cached entries never go stale.
+# Bump RENDER_CACHE_VERSION after changing MARTOR_MARKDOWN_EXTENSIONS or their configs.
+RENDER_CACHE_TIMEOUT = None
+RENDER_CACHE_VERSION = 3
+
+# Markdown pipelines (markhub.services.markdown_render)
+# With ADAPTIVE_MARKDOWN documents are rendered without the extensions whose syntax they don't contain,
+# the output is the same. Pipelines are reused per thread and extension set.
+ADAPTIVE_MARKDOWN = env.bool('ADAPTIVE_MARKDOWN', default=True)
+MARKDOWN_PIPELINES = 32  # cached pipelines per thread
+
+# Render sandbox: documents are rendered by a pool of processes per web worker with limits per render,
+# renders over the limits are shown as escaped plain text. 0 processes - render in request threads without limits
+RENDER_POOL_PROCESSES = env.int('RENDER_POOL_PROCESSES', default=2)
+RENDER_TIMEOUT = env.float('RENDER_TIMEOUT', default=10.0)  # seconds, the render process is killed and replaced
+RENDER_MEMORY_LIMIT = env.int('RENDER_MEMORY_LIMIT', default=512 * 1024 * 1024)  # bytes over the process start size
+RENDER_QUEUE_TIMEOUT = 5.0  # seconds to wait for a free render process
+RENDER_FALLBACK_CACHE_TIMEOUT = 300  # plain text of documents over the limits is cached shorter than renders
+
+# Share page admission control (markhub.services.admission)
+# Token buckets in the shared cache: tokens per second and bucket size per client IP for all share pages,
+# and per shared repository for pages which are not cached yet. Uncached pages cost SHARE_MISS_COST client tokens.
+# Over the buckets pages get 429, uncached pages get 503 while SHARE_MAX_RENDER_QUEUE renders wait for a process.
+SHARE_CLIENT_RATE = env.float('SHARE_CLIENT_RATE', default=1.0)
+SHARE_CLIENT_BURST = env.int('SHARE_CLIENT_BURST', default=30)
+SHARE_MISS_COST = 5
+SHARE_TARGET_RATE = env.float('SHARE_TARGET_RATE', default=0.5)
+SHARE_TARGET_BURST = env.int('SHARE_TARGET_BURST', default=30)
+SHARE_MAX_RENDER_QUEUE = env.int('SHARE_MAX_RENDER_QUEUE', default=4)
+SHARE_NOT_FOUND_CACHE_TIMEOUT = 300  # files missing in GitHub are answered with 404 without requests
+# Client IP is taken from X-Forwarded-For appended by this number of trusted proxies, REMOTE_ADDR with 0
+RATE_LIMIT_PROXY_COUNT = env.int('RATE_LIMIT_PROXY_COUNT', default=0)
+
+# Branch list of the branch selector typeahead, cached per repository and shared by all sessions
+BRANCH_CACHE_TIMEOUT = 300
+BRANCH_SEARCH_LIMIT = 20  # branches per typeahead response
+
+# Repository reads (markhub.services.mirror)
+# 'api' - GitHub contents API, 'mirror' - local shallow bare mirrors fetched over git (requires dulwich),
+# writes always use the API. Path history beyond MIRROR_DEPTH commits is read from the API.
+REPOSITORY_BACKEND = env('REPOSITORY_BACKEND', default='api')
+MIRROR_DIR = env('MIRROR_DIR', default=str(BASE_DIR / 'cache' / 'mirrors'))
+MIRROR_CLONE_URL = env('MIRROR_CLONE_URL', default='https://github.com/{owner}/{repo}.git')  # file:// for local tests
+MIRROR_DEPTH = env.int('MIRROR_DEPTH', default=200)  # commits per branch
+MIRROR_FETCH_INTERVAL = env.int('MIRROR_FETCH_INTERVAL', default=60)  # seconds between fetches
+
+# Last commit per entry of repository directory listings, found by one walk of the directory history
+# and cached by the directory tree, so it is walked again only after the directory changes.
+# API walks run as background jobs, listings are shown without last commits until the walk is cached
+LAST_COMMIT_WALK_LIMIT = 100  # commits per walk, entries changed earlier are shown without a commit
+LAST_COMMIT_CACHE_TIMEOUT = 24 * 60 * 60
+
+# Template fragment cache ({% fragment %} of markhub.templatetags.fragments)
+# Toolbars, directory listings and file bodies are keyed by user, repository, branch, commit or blob SHA,
+# path and client timezone, so cached fragments never go stale. Bump FRAGMENT_CACHE_VERSION after changing them.
+FRAGMENT_CACHE_TIMEOUT = None
+FRAGMENT_CACHE_VERSION = 3
+
+# Publish times of markdown files in directory listings of private repositories, looked up with one query
+# per directory and cached until a file of the directory is published or unpublished
+PUBLISHED_FILES_CACHE_TIMEOUT = 24 * 60 * 60
+
+# Prerendering with `manage.py prerender`
+PRERENDER_FETCH_CONCURRENCY = env.int('PRERENDER_FETCH_CONCURRENCY', default=8)
+PRERENDER_PROCESSES = env.int('PRERENDER_PROCESSES', default=None)  # None - os.cpu_count()
+
+# Worker warm-up (markhub.services.warmup)
+# PyGithub, Markdown and Pygments are imported at the first use, so workers and manage.py commands start fast.
+# With WARM_UP the WSGI/ASGI application loads views, lexers and the emoji index before the first request,
+# run gunicorn with --preload to do it once in the master process.
+WARM_UP = env.bool('WARM_UP', default=False)
+
+# Highlight cache (markhub.extensions.highlight_cache)
+HIGHLIGHT_CACHE_SIZE = env.int('HIGHLIGHT_CACHE_SIZE', default=4096)  # code snippets per process
+HIGHLIGHT_PRELOAD_LEXERS = [  # imported by the warm-up
+    'bash', 'c', 'cpp', 'csharp', 'css', 'diff', 'go', 'html', 'java', 'javascript', 'json',
+    'markdown', 'php', 'python', 'pycon', 'ruby', 'rust', 'sql', 'text', 'toml', 'typescript', 'yaml',
+]
+
+# Math rendering
+# '' - MathJax in the browser, 'mathml' - prerender to MathML on the server (requires latex2mathml)
+# Bump RENDER_CACHE_VERSION after changing MATH_RENDERER
+MATH_RENDERER = env('MATH_RENDERER', default='')
+MATH_CACHE_SIZE = 4096  # formulas per process
+
+# Background jobs of web workers (markhub.services.background): image variants and directory history walks.
+# Up to BACKGROUND_QUEUE_SIZE jobs wait per process, later ones are dropped. 0 workers - jobs run in request threads
+BACKGROUND_WORKERS = env.int('BACKGROUND_WORKERS', default=2)
+BACKGROUND_QUEUE_SIZE = 100
+
+# Uploaded image variants (markhub.services.image_uploader, requires Pillow)
+# Variants are made by background jobs and listed in srcset once they are stored.
+# Images over IMAGE_MAX_PIXELS decoded pixels are stored without variants.
+IMAGE_VARIANT_WIDTHS = [480, 960, 1440]
+IMAGE_VARIANT_QUALITY = 80
+IMAGE_MAX_PIXELS = 25_000_000
+
+# Asset proxy for relative images of markdown files (markhub.views.asset_proxy)
+# Image paths are resolved to blob SHAs for ASSET_CACHE_TIMEOUT seconds,
+# blobs are kept in the size limited disk cache and served as immutable.
+ASSET_CACHE_TIMEOUT = 300
+ASSET_CACHE_DIR = env('ASSET_CACHE_DIR', default=str(BASE_DIR / 'cache' / 'assets'))
+ASSET_CACHE_SIZE = env.int('ASSET_CACHE_SIZE', default=256 * 1024 * 1024)  # bytes
+ASSET_IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+
+# Metrics in the Prometheus text format at /metrics for staff users and these addresses
+METRICS_ALLOWED_IPS = env.list('METRICS_ALLOWED_IPS', default=['127.0.0.1'])
+
+# Sampling profiler (markhub.instrumentation.ProfilingMiddleware)
+# Profiles PROFILE_SAMPLE_RATE of requests to PROFILE_VIEWS, staff users profile any request with ?profile=1.
+# The slowest profiles are listed in the admin with collapsed stacks and speedscope downloads.
+PROFILE_SAMPLE_RATE = env.float('PROFILE_SAMPLE_RATE', default=0.0)
+PROFILE_INTERVAL = 0.005  # seconds between stack samples
+PROFILE_VIEWS = ['repo', 'base', 'file', 'share-base', 'share', 'new-file', 'update-file']
+PROFILE_KEEP = env.int('PROFILE_KEEP', default=500)  # latest profiles kept in the database
+
+# Static asset pipeline (markhub.staticfiles)
+# collectstatic builds STATIC_BUNDLES from their sources, adds content hashes to file names
+# and writes .gz (and .br with Brotli) variants. With STATIC_BUNDLES_ENABLED templates link bundles,
+# otherwise their sources. Bundles are minified with rjsmin and rcssmin (`poetry install -E assets`).
+STATIC_BUNDLES_ENABLED = env.bool('STATIC_BUNDLES_ENABLED', default=not DEBUG)
+STATIC_BUNDLE_DIR = BASE_DIR / 'dist' / 'bundles'
+STATIC_BUNDLES = {
+    'bundles/base.css': [
+        'plugins/css/bootstrap.min.css',
+        'vendor/bootstrap-icons/bootstrap-icons.css',
+        'css/main.css',
+        'css/markdown-extensions.css',
+    ],
+    'bundles/base.js': [
+        'plugins/js/jquery.min.js',
+        'plugins/js/bootstrap.min.js',
+        'js/client-tz.js',
+    ],
+    'bundles/document.css': ['plugins/css/ace.min.css', 'martor/css/martor.bootstrap.min.css'],
+    'bundles/editor.css': [
+        'plugins/css/ace.min.css',
+        'plugins/css/resizable.min.css',
+        'martor/css/martor.bootstrap.min.css',
+    ],
+    # scripts of the editor after ace.js, which finds its base path by its own script name
+    'bundles/editor.js': [
+        'plugins/js/mode-markdown.js',
+        'plugins/js/ext-language_tools.js',
+        'plugins/js/theme-github.js',
+        'plugins/js/typo.js',
+        'plugins/js/spellcheck.js',
+        'plugins/js/resizable.min.js',
+        'plugins/js/emojis.min.js',
+        'martor/js/martor.bootstrap.min.js',
+    ],
+}
+# CDN assets downloaded into static/ by `manage.py vendorassets`: static path: pinned CDN URL.
+# Templates link the CDN URLs of assets which are not downloaded yet only without STATIC_BUNDLES_ENABLED.
+VENDOR_ASSETS = {
+    'vendor/bootstrap-icons/bootstrap-icons.css':
+        'https://cdn.jsdelivr.net/npm/bootstrap-icons@1.8.3/font/bootstrap-icons.css',
+    'vendor/bootstrap-icons/fonts/bootstrap-icons.woff2':
+        'https://cdn.jsdelivr.net/npm/bootstrap-icons@1.8.3/font/fonts/bootstrap-icons.woff2',
+    'vendor/bootstrap-icons/fonts/bootstrap-icons.woff':
+        'https://cdn.jsdelivr.net/npm/bootstrap-icons@1.8.3/font/fonts/bootstrap-icons.woff',
+}
+# StaticFilesMiddleware serves STATIC_ROOT from the web workers with the variant the client accepts,
+# hashed names are cached as immutable, other names for STATIC_MAX_AGE seconds
+STATIC_SERVE = env.bool('STATIC_SERVE', default=True)
+STATIC_MAX_AGE = 60 * 60
+STATIC_IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
@@ -1,7 +1,6 @@
 from .django import BASE_DIR, env
 
-from markdown.extensions.toc import slugify_unicode
-from pymdownx import emoji
+from markhub.extensions import emoji, slugify_unicode
 
 
 # martor settings
@@ -37,7 +36,7 @@ MARTOR_IMGUR_CLIENT_ID = env('IMGUR_CLIENT_ID')
 MARTOR_IMGUR_API_KEY   = env('IMGUR_API_KEY')
 
 # Markdownify
-MARTOR_MARKDOWNIFY_FUNCTION = 'martor.utils.markdownify' # default
+MARTOR_MARKDOWNIFY_FUNCTION = 'markhub.services.render_pool.preview_markdownify' # martor.utils.markdownify in the render pool
 MARTOR_MARKDOWNIFY_URL = '/martor/markdownify/' # default
 
 # Markdown extensions (default)
@@ -57,7 +56,7 @@ MARTOR_MARKDOWN_EXTENSIONS = [
     'pymdownx.critic',
     'pymdownx.details',
     'pymdownx.emoji',
-    'pymdownx.highlight',
+    'markhub.extensions.highlight_cache',  # cached pymdownx.highlight
     'pymdownx.inlinehilite',
     'pymdownx.keys',
     'pymdownx.magiclink',
@@ -70,6 +69,7 @@ MARTOR_MARKDOWN_EXTENSIONS = [
 
     # Custom markdown extensions.
     'markdown_link_attr_modifier',
+    'markhub.extensions.image_srcset',  # srcset for uploaded images with resized variants
 
     # 'martor.extensions.urlize',
     # 'martor.extensions.del_ins',      # ~~strikethrough~~ and ++underscores++
@@ -99,7 +99,7 @@ MARTOR_MARKDOWN_EXTENSION_CONFIGS = {
     },
     'pymdownx.emoji': {
         'emoji_index': emoji.twemoji,
-        'emoji_generator': emoji.to_svg,
+        'emoji_generator': emoji.to_span,
     },
     'pymdownx.magiclink': {
         'repo_url_shortener': True,
@@ -137,12 +137,15 @@ ALLOWED_URL_SCHEMES = [
 # Check this setting is not set else csrf will not be sent over ajax calls:
 CSRF_COOKIE_HTTPONLY = False
 
-# Upload to locale storage
+# Upload to locale storage with IMAGE_UPLOADER=local
+# or commit images into repository next to markdown file with IMAGE_UPLOADER=repo
 # See at https://github.com/agusmakmun/django-markdown-editor/wiki
 
-# import time
-# MARTOR_UPLOAD_PATH = 'images/uploads/{}'.format(time.strftime("%Y/%m/%d/"))
-# MARTOR_UPLOAD_URL = '/martor/uploader/'  # change to local uploader
+IMAGE_UPLOADER = env('IMAGE_UPLOADER', default='imgur')  # 'imgur', 'local' or 'repo'
+MARTOR_UPLOAD_PATH = 'images/uploads/'
+IMAGE_STAGING_PATH = 'images/staged/'  # images waiting for the document commit
+if IMAGE_UPLOADER in ('local', 'repo'):
+    MARTOR_UPLOAD_URL = '/upload-image/'  # markhub.services.image_uploader.markdown_uploader
 
 # Maximum Upload Image
 # 2.5MB - 2621440
@@ -0,0 +1,224 @@
+"""
+Static asset pipeline: bundled, content-hashed and precompressed static files.
+
+`collectstatic` collects STATIC_BUNDLES built by `BundleFinder`, adds content hashes to all file names
+with the manifest storage and writes .gz (and .br with Brotli) variants of compressible files.
+`StaticFilesMiddleware` serves STATIC_ROOT from the web workers with the variant the client accepts,
+hashed names are cached by browsers as immutable.
+"""
+import gzip
+import mimetypes
+import posixpath
+import re
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.finders import BaseFinder
+from django.contrib.staticfiles.storage import (ManifestStaticFilesStorage,
+                                                staticfiles_storage)
+from django.core.exceptions import (ImproperlyConfigured, MiddlewareNotUsed,
+                                    SuspiciousFileOperation)
+from django.core.files.storage import FileSystemStorage
+from django.http import HttpRequest, HttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import patch_vary_headers
+from django.views.static import serve
+
+from markhub.settings import (STATIC_BUNDLE_DIR, STATIC_BUNDLES,
+                              STATIC_IMMUTABLE_MAX_AGE, STATIC_MAX_AGE,
+                              STATIC_SERVE, logger)
+
+try:
+    import brotli
+except ImportError:  # `poetry install -E assets`, .br variants are not written
+    brotli = None
+
+try:
+    import rcssmin
+    import rjsmin
+except ImportError:  # `poetry install -E assets`, bundles are concatenated without minification
+    rcssmin = rjsmin = None
+
+COMPRESSED_EXTENSIONS = ('.css', '.js', '.json', '.map', '.svg', '.txt', '.xml', '.ico', '.webmanifest')
+MIN_COMPRESSED_SIZE = 256  # bytes, smaller files are served as they are
+ENCODINGS = {'br': '.br', 'gzip': '.gz'}  # by preference
+
+# Relative url() references of stylesheets: not absolute, root-relative, data: or fragment urls
+CSS_URL = re.compile(r'''url\(\s*(['"]?)(?![a-zA-Z][a-zA-Z0-9+.-]*:|/|#)([^'")]+)\1\s*\)''')
+
+
+def _rebase_css_urls(css: str, source: str, bundle: str) -> str:
+    """Make relative url() references of the source stylesheet relative to the bundle"""
+    source_dir, bundle_dir = posixpath.dirname(source), posixpath.dirname(bundle)
+
+    def rebase(match: re.Match) -> str:
+        url = posixpath.normpath(posixpath.join(source_dir, match[2]))
+        return f'url("{posixpath.relpath(url, bundle_dir or ".")}")'
+
+    return CSS_URL.sub(rebase, css)
+
+
+def build_bundle(name: str, sources: List[str]) -> bytes:
+    """Concatenate bundle sources found by the staticfiles finders, minify the sources which are not minified
+
+    Args:
+        name (str): _bundle static path, .css or .js_
+        sources (List[str]): _source static paths in the bundle order_
+
+    Raises:
+        ImproperlyConfigured: _source is not found_
+
+    Returns:
+        bytes: _bundle content_
+    """
+    parts = []
+    for source in sources:
+        if not (path := finders.find(source)):
+            raise ImproperlyConfigured(f"Static file '{source}' of bundle '{name}' is not found, "
+                                       f"run `manage.py vendorassets` to download vendored assets")
+        text = Path(path).read_text(encoding='UTF-8')
+        minified = '.min.' in posixpath.basename(source)
+        if name.endswith('.css'):
+            text = _rebase_css_urls(text, source, name)
+            parts.append(text if minified or rcssmin is None else rcssmin.cssmin(text))
+        else:
+            parts.append(text if minified or rjsmin is None else rjsmin.jsmin(text))
+    # scripts without a trailing semicolon must not run into the next one
+    separator = '\n' if name.endswith('.css') else ';\n'
+    return separator.join(part.strip() for part in parts).encode('UTF-8') + b'\n'
+
+
+class BundleFinder(BaseFinder):
+    """Staticfiles finder of STATIC_BUNDLES, bundles are built into STATIC_BUNDLE_DIR when found or listed"""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.storage = FileSystemStorage(location=STATIC_BUNDLE_DIR)
+
+    def _build(self, name: str) -> str:
+        """Build bundle into its file, the file is kept unchanged with the same content"""
+        content = build_bundle(name, STATIC_BUNDLES[name])
+        path = Path(self.storage.path(name))
+        if not path.is_file() or path.read_bytes() != content:  # collectstatic skips files with the same mtime
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(content)
+        return str(path)
+
+    def find(self, path: str, all: bool = False):
+        if path not in STATIC_BUNDLES:
+            return []  # as Django finders, finders.find() would return [None] for None
+        found = self._build(path)
+        return [found] if all else found
+
+    def list(self, ignore_patterns) -> Iterator[Tuple[str, FileSystemStorage]]:
+        for name in STATIC_BUNDLES:
+            self._build(name)
+            yield name, self.storage
+
+
+def compress_file(path: Path) -> List[str]:
+    """Write .gz and .br variants of the file which are smaller than it
+
+    Args:
+        path (Path): _static file path_
+
+    Returns:
+        List[str]: _written encodings_
+    """
+    content = path.read_bytes()
+    if len(content) < MIN_COMPRESSED_SIZE:
+        return []
+    variants = {'gzip': gzip.compress(content, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants['br'] = brotli.compress(content, quality=11)
+    written = []
+    for encoding, compressed in variants.items():
+        if len(compressed) < len(content) * 0.95:
+            path.with_name(path.name + ENCODINGS[encoding]).write_bytes(compressed)
+            written.append(encoding)
+    return written
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Manifest storage writing compressed variants of the collected and hashed files"""
+
+    def stored_name(self, name: str) -> str:
+        try:
+            return super().stored_name(name)
+        except ValueError:  # not collected, e.g. the benchmarks run without collectstatic, linked without a hash
+            return name
+
+    def post_process(self, paths: Dict, dry_run: bool = False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        names = {*paths, *(self.hashed_files.get(self.hash_key(self.clean_name(name))) for name in paths)}
+        compressed = [
+            name for name in names
+            if name and name.endswith(COMPRESSED_EXTENSIONS) and compress_file(Path(self.path(name)))
+        ]
+        logger.info(f"Static files compressed: {len(compressed)}, brotli {'on' if brotli else 'off'}")
+
+
+def _accepted_encodings(accept_encoding: str) -> FrozenSet[str]:
+    """Get content codings of the Accept-Encoding header which are not refused with q=0"""
+    accepted = set()
+    for coding in accept_encoding.split(','):
+        name, _, params = coding.partition(';')
+        quality = params.strip().lower()
+        if not re.fullmatch(r'q\s*=\s*0(\.0*)?', quality):
+            accepted.add(name.strip().lower())
+    return frozenset(accepted)
+
+
+class StaticFilesMiddleware:
+    """Serve STATIC_ROOT files with the best precompressed variant and far-future caching of hashed names
+
+    Not used with DEBUG, when runserver serves static files, without STATIC_SERVE and for STATIC_URL on other hosts.
+    """
+
+    def __init__(self, get_response) -> None:
+        if settings.DEBUG or not STATIC_SERVE or not settings.STATIC_ROOT or not settings.STATIC_URL.startswith('/'):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.root = Path(settings.STATIC_ROOT)
+        self.prefix = settings.STATIC_URL
+        self._hashed_names: Optional[FrozenSet[str]] = None
+
+    @property
+    def hashed_names(self) -> FrozenSet[str]:
+        """Hashed names of the staticfiles manifest"""
+        if self._hashed_names is None:
+            self._hashed_names = frozenset(getattr(staticfiles_storage, 'hashed_files', {}).values())
+        return self._hashed_names
+
+    def _get_encoding(self, request: HttpRequest, name: str) -> Optional[str]:
+        """Get the preferred encoding the client accepts and the file has a variant for"""
+        accepted = _accepted_encodings(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        for encoding, suffix in ENCODINGS.items():
+            if encoding in accepted or '*' in accepted:
+                try:
+                    if Path(safe_join(self.root, name + suffix)).is_file():
+                        return encoding
+                except SuspiciousFileOperation:
+                    return None
+        return None
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if request.method not in ('GET', 'HEAD') or not request.path_info.startswith(self.prefix):
+            return self.get_response(request)
+        name = request.path_info[len(self.prefix):]
+        encoding = self._get_encoding(request, name)
+        response = serve(request, name + ENCODINGS.get(encoding, ''), document_root=self.root)
+        if encoding and response.status_code == 200:
+            response['Content-Type'] = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+            response['Content-Encoding'] = encoding
+        if name.endswith(COMPRESSED_EXTENSIONS):
+            patch_vary_headers(response, ['Accept-Encoding'])
+        if name in self.hashed_names:
+            response['Cache-Control'] = f'public, max-age={STATIC_IMMUTABLE_MAX_AGE}, immutable'
+        else:
+            response['Cache-Control'] = f'public, max-age={STATIC_MAX_AGE}'
+        return response
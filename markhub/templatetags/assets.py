@@ -0,0 +1,38 @@
+from django import template
+from django.contrib.staticfiles import finders
+from django.templatetags.static import static
+from django.utils.html import format_html_join
+from django.utils.safestring import SafeString
+
+from markhub.settings import STATIC_BUNDLES, STATIC_BUNDLES_ENABLED, VENDOR_ASSETS
+
+register = template.Library()
+
+
+def _asset_url(path: str) -> str:
+    """Get static url, vendored assets which are not downloaded yet are linked from the CDN"""
+    if path in VENDOR_ASSETS and not STATIC_BUNDLES_ENABLED and not finders.find(path):
+        return VENDOR_ASSETS[path]
+    return static(path)
+
+
+@register.simple_tag
+def bundle(name: str, **attributes: bool) -> SafeString:
+    """Link STATIC_BUNDLES bundle, or its sources without STATIC_BUNDLES_ENABLED
+
+        {% bundle 'bundles/base.js' defer=True %}
+
+    Args:
+        name (str): _bundle static path, .css or .js_
+        attributes (bool): _boolean attributes of script tags, e.g. async or defer_
+
+    Returns:
+        SafeString: _link or script tags_
+    """
+    urls = [static(name)] if STATIC_BUNDLES_ENABLED else [_asset_url(source) for source in STATIC_BUNDLES[name]]
+    if name.endswith('.css'):
+        return format_html_join('\n', '<link href="{}" type="text/css" media="all" rel="stylesheet" />',
+                                ((url,) for url in urls))
+    flags = ''.join(f' {attribute}' for attribute, enabled in attributes.items() if enabled)
+    return format_html_join('\n', '<script type="text/javascript" src="{}"{}></script>',
+                            ((url, flags) for url in urls))
@@ -0,0 +1,75 @@
+from hashlib import md5
+from typing import List
+
+from django import template
+from django.core.cache import cache
+from django.template.base import FilterExpression, NodeList, Parser, Token
+from django.utils import timezone
+
+from markhub.services.metrics import cache_stats
+from markhub.settings import FRAGMENT_CACHE_TIMEOUT, FRAGMENT_CACHE_VERSION
+
+register = template.Library()
+
+FRAGMENT_KEY = 'fragment_key'  # context variable set by the views, see BaseRepoView._add_fragment_key
+
+
+def get_fragment_cache_key(name: str, fragment_key: str, vary_on: List) -> str:
+    """Get cache key of the fragment rendered in the current timezone
+
+    Args:
+        name (str): _fragment name_
+        fragment_key (str): _user, repository, branch, commit or blob SHA and path of the page_
+        vary_on (List): _other values the fragment depends on_
+
+    Returns:
+        str: _cache key_
+    """
+    values = [fragment_key, timezone.get_current_timezone_name(), *vary_on]
+    return f'fragment:{name}:{md5(repr(values).encode()).hexdigest()}'
+
+
+class FragmentNode(template.Node):
+    def __init__(self, nodelist: NodeList, name: str, vary_on: List[FilterExpression]) -> None:
+        self.nodelist = nodelist
+        self.name = name
+        self.vary_on = vary_on
+
+    def render(self, context: template.Context) -> str:
+        if not (fragment_key := context.get(FRAGMENT_KEY)):
+            return self.nodelist.render(context)
+        key = get_fragment_cache_key(self.name, fragment_key, [var.resolve(context) for var in self.vary_on])
+        content = cache.get(key, version=FRAGMENT_CACHE_VERSION)
+        cache_stats.hit('fragment', content is not None)
+        if content is None:
+            content = self.nodelist.render(context)
+            cache.set(key, content, FRAGMENT_CACHE_TIMEOUT, version=FRAGMENT_CACHE_VERSION)
+        return content
+
+
+@register.tag
+def fragment(parser: Parser, token: Token) -> FragmentNode:
+    """Cache the template fragment by the page `fragment_key`, rendered as is on pages without it
+
+        {% fragment file-actions private published|yesno %} ... {% endfragment %}
+
+    The key contains the commit or blob SHA of the page, so the fragment is rendered again after the change
+    rather than after a timeout. Other context variables the fragment uses, like `private`, must be listed.
+    Request and user specific values like csrf tokens must stay out of fragments.
+
+    Args:
+        parser (Parser): _template parser_
+        token (Token): _tag with the fragment name and the variables it varies on besides the page_
+
+    Raises:
+        TemplateSyntaxError: _fragment name is missing_
+
+    Returns:
+        FragmentNode: _fragment node_
+    """
+    bits = token.split_contents()
+    if len(bits) < 2:
+        raise template.TemplateSyntaxError(f"'{bits[0]}' tag requires a fragment name")
+    nodelist = parser.parse(('endfragment',))
+    parser.delete_first_token()
+    return FragmentNode(nodelist, bits[1], [parser.compile_filter(bit) for bit in bits[2:]])
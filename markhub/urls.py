@@ -18,7 +18,9 @@ from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import include, path, re_path
 
-from .views import (FileView, HomeView, RepoView, ShareView, delete_file_ctr,
+from .services.image_uploader import markdown_uploader
+from .views import (FileView, HomeView, RepoView, SearchView, ShareView,
+                    asset_proxy, delete_file_ctr, get_branches, get_metrics,
                     get_webmanifest, new_file_ctr, publish_file_ctr,
                     unpublish_file_ctr, update_file_ctr)
 
@@ -26,6 +28,11 @@ urlpatterns = [
     path('admin/', admin.site.urls),
     path('accounts/', include('allauth.urls')),
     path('martor/', include('martor.urls')),
+    path('upload-image/', markdown_uploader, name='upload-image'),
+    path('metrics', get_metrics, name='metrics'),
+    re_path(r'^asset/(?P<username>[-a-zA-Z0-9_\.]+)/(?P<repo>[-a-zA-Z0-9_\.]+)/(?P<branch>[^/]+)/(?P<path>.+)$',
+            asset_proxy, name='asset'),
+    re_path(r'^branches/(?P<repo>[-a-zA-Z0-9_\.]+)/$', get_branches, name='branches'),
     re_path(r'^file/(?P<repo>[-a-zA-Z0-9_\.]+)/(?P<branch>[^/]+)/$', FileView.as_view(), name='base'),
     re_path(r'^file/(?P<repo>[-a-zA-Z0-9_\.]+)/(?P<branch>[^/]+)/(?P<path>.+)/$', FileView.as_view(), name='file'),
     re_path(r'^delete-file/(?P<repo>[-a-zA-Z0-9_\.]+)/(?P<path>.+)/$', delete_file_ctr, name='delete-file'),
@@ -33,6 +40,7 @@ urlpatterns = [
     re_path(r'^new-file/(?P<repo>[-a-zA-Z0-9_\.]+)/$', new_file_ctr, name='new-file'),
     re_path(r'^repo/(?P<repo>[-a-zA-Z0-9_\.]+)/(?P<branch>[^/]+)/(?P<path>.*)/$', RepoView.as_view(), name='repo'),
     re_path(r'^repo/(?P<repo>[-a-zA-Z0-9_\.]+)/$', RepoView.as_view(), name='repo'),
+    re_path(r'^search/(?P<repo>[-a-zA-Z0-9_\.]+)/(?P<branch>[^/]+)/$', SearchView.as_view(), name='search'),
     re_path(r'^update-file/(?P<repo>[-a-zA-Z0-9_\.]+)/(?P<path>.+)/$', update_file_ctr, name='update-file'),
     re_path(r'^publish/(?P<username>[-a-zA-Z0-9_\.]+)/(?P<repo>[-a-zA-Z0-9_\.]+)/(?P<branch>[^/]+)/(?P<path>.+)/$', 
             publish_file_ctr, name='publish'),
@@ -1,7 +1,10 @@
+import mimetypes
 from datetime import datetime
 from pathlib import Path, PurePosixPath
+from time import perf_counter
 from typing import Any, Dict, Optional, Tuple
-from urllib.error import HTTPError
+from urllib.error import HTTPError, URLError
+from urllib.parse import quote
 from urllib.request import urlopen
 
 from django.contrib import messages
@@ -9,24 +12,118 @@ from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.core.cache import cache
 from django.core.exceptions import PermissionDenied
-from django.http import FileResponse, Http404
+from django.http import FileResponse, Http404, JsonResponse
 from django.http.request import HttpRequest
 from django.http.response import HttpResponse
 from django.shortcuts import redirect, render
 from django.urls import reverse
 from django.utils.html import format_html
 from django.utils.safestring import mark_safe
+from django.views.decorators.http import require_GET
 from django.views.generic import TemplateView
 from github import GithubException, UnknownObjectException
 from loguru import logger
 
 from .forms import NewFileForm, UpdateFileForm
-from .models import PrivatePublish
+from .instrumentation import is_metrics_client
+from .models import PrivatePublish, SearchIndex
+from .services.admission import Throttled, admit_share
+from .services.asset_cache import asset_cache, is_blob_sha
+from .services.assets import (fetch_asset, get_asset_token, git_blob_sha,
+                              rewrite_relative_images)
 from .services.bootstrap_icons import FILETYPE_EXTENSIONS
-from .services.github_repository import (GitHubRepository, get_github_handler,
+from .services.github_repository import (CommitConflict, GitHubRepository,
+                                         get_github_handler,
                                          get_repository_or_error)
-from .services.markdown_render import markdownify                                         
-from .settings import (log_error_with_404, logger)
+from .services.headings import get_toc
+from .services.image_uploader import clear_staged_images, get_staged_images
+from .services.markdown_render import cached_markdownify
+from .services.math_render import has_math
+from .services.metrics import (GITHUB_DURATION, cache_stats, render_metrics,
+                               timed)
+from .services.prerender import MARKDOWN_SUFFIX
+from .services.search_index import search, update_search_index
+from .settings import (ASSET_CACHE_TIMEOUT, ASSET_IMMUTABLE_MAX_AGE,
+                       GITHUB_RAW_URL, SHARE_NOT_FOUND_CACHE_TIMEOUT,
+                       log_error_with_404, logger)
+
+
+@require_GET
+def asset_proxy(request: HttpRequest, username: str, repo: str, branch: str, path: str) -> HttpResponse:
+    """Serve repository image via the disk asset cache, relative images of markdown files are rewritten to it
+
+    The path is resolved to the blob SHA and redirected to the `?v=<blob SHA>` url, served as immutable.
+    Images are fetched with the user's own token, images of published files with the publish owner's token,
+    public ones without a token.
+
+    Args:
+        request (HttpRequest): _Django request instance_
+        username (str): _repository owner_
+        repo (str): _repository name_
+        branch (str): _branch name_
+        path (str): _image path in repository_
+
+    Raises:
+        Http404: _Image not found or the file is not an image_
+
+    Returns:
+        HttpResponse: _image response, redirect to the blob version or 502 when GitHub is unavailable_
+    """
+    content_type, _ = mimetypes.guess_type(path)
+    if not content_type or not content_type.startswith('image/'):
+        log_error_with_404(f"Not an image - {path}")
+    version = request.GET.get('v')
+    if version is not None and not is_blob_sha(version):
+        log_error_with_404(f"Not a blob version - {version!r}")
+    token = get_asset_token(request.user, username, repo, branch, path)
+    scope = 'private' if token else 'public'
+    # the cache is read only by the blob SHA the path resolves to with the caller's token
+    key = f"asset:{scope}:{username}/{repo}/{quote(branch)}/{quote(path)}"
+    cached = (sha := cache.get(key)) is not None and sha in asset_cache
+    cache_stats.hit('asset', cached)
+    if not cached:
+        try:
+            if token:
+                sha, content = fetch_asset(token, username, repo, branch, path)
+            else:
+                url = ShareView.GITHUB_USERCONTENT_TEMPLATE.format(
+                    username=username, repo=repo, branch=quote(branch), path=quote(path)
+                )
+                with timed('github', GITHUB_DURATION, method='GET', endpoint='raw'):
+                    content = urlopen(url).read()
+                sha = git_blob_sha(content)
+        except ValueError as e:  # http.client.InvalidURL
+            log_error_with_404(f"Image not found - {e}")
+        except (GithubException, URLError) as e:
+            if (e.status if isinstance(e, GithubException) else getattr(e, 'code', None)) == 404:
+                log_error_with_404(f"Image not found - {e}")
+            logger.error(f"Image fetch failed - {e}")
+            return HttpResponse(status=502)
+        asset_cache.set(sha, content)
+        cache.set(key, sha, ASSET_CACHE_TIMEOUT)
+    if version == sha and (content := asset_cache.get(sha)) is not None:
+        return _asset_response(content, content_type, scope)
+    response = redirect(f'{quote(request.path)}?v={sha}')
+    response['Cache-Control'] = f'{scope}, max-age={ASSET_CACHE_TIMEOUT}'
+    return response
+
+
+def _asset_response(content: bytes, content_type: str, scope: str) -> HttpResponse:
+    """Get immutable image response
+
+    Args:
+        content (bytes): _image content_
+        content_type (str): _image content type_
+        scope (str): _'public' or 'private' for Cache-Control_
+
+    Returns:
+        HttpResponse: _image response_
+    """
+    response = HttpResponse(content, content_type=content_type)
+    response['Cache-Control'] = f'{scope}, max-age={ASSET_IMMUTABLE_MAX_AGE}, immutable'
+    response['Content-Security-Policy'] = "default-src 'none'; style-src 'unsafe-inline'"
+    response['X-Content-Type-Options'] = 'nosniff'
+    return response
 
 
 @login_required
@@ -51,6 +148,47 @@ def delete_file_ctr(request: HttpRequest, repo: str, path: str) -> HttpResponse:
         return redirect('repo', repo=repo)
 
 
+@login_required
+@require_GET
+def get_branches(request: HttpRequest, repo: str) -> JsonResponse:
+    """Get repository branches matching the `q` parameter for the branch selector typeahead
+
+    Args:
+        request (HttpRequest): _request object_
+        repo (str): _repository name_
+
+    Raises:
+        Http404: _Repository or branches not found_
+
+    Returns:
+        JsonResponse: _{"branches": [...]}_
+    """
+    repository = get_repository_or_error(request, repo)
+    try:
+        branches = repository.search_branches(request.GET.get('q', '').strip())
+    except GithubException as e:
+        log_error_with_404(f"Branches not found - {e}")
+    return JsonResponse({'branches': branches})
+
+
+@require_GET
+def get_metrics(request: HttpRequest) -> HttpResponse:
+    """Get metrics in the Prometheus text format for staff users and METRICS_ALLOWED_IPS
+
+    Args:
+        request (HttpRequest): _request object_
+
+    Raises:
+        PermissionDenied: _not allowed user or address_
+
+    Returns:
+        HttpResponse: _metrics of the process_
+    """
+    if not is_metrics_client(request):
+        raise PermissionDenied
+    return HttpResponse(render_metrics(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
 def get_webmanifest(request: HttpRequest) -> FileResponse:
     """ _Get webmanifest file in the DEBUG mode_
 
@@ -84,11 +222,18 @@ def new_file_ctr(request: HttpRequest, repo: str, path: str = '') -> HttpRespons
         new_file_form = NewFileForm(request.POST)
         if new_file_form.is_valid():
             newfile_path: str = f'{path + "/" if path else ""}{new_file_form.cleaned_data["filename"]}'
-            messages.success(request, repository.create_file(
-                                        path=newfile_path, 
-                                        content=new_file_form.cleaned_data['content']
-            ))
-            return redirect('file', repo=repo, branch=repository.branch, path=newfile_path)
+            images = get_staged_images(request, new_file_form.cleaned_data['content'])
+            try:
+                messages.success(request, repository.create_file(
+                                            path=newfile_path, 
+                                            content=new_file_form.cleaned_data['content'],
+                                            images=images
+                ))
+            except CommitConflict as e:
+                messages.warning(request, str(e))  # the form is shown again with the entered content
+            else:
+                clear_staged_images(request, list(images))
+                return redirect('file', repo=repo, branch=repository.branch, path=newfile_path)
     else:
         new_file_form = NewFileForm()
     context['form'] = new_file_form
@@ -176,17 +321,27 @@ def update_file_ctr(request: HttpRequest, repo: str, path: str) -> HttpResponse:
         update_file_form = UpdateFileForm(request.POST)
         if update_file_form.is_valid():
             updated_content = update_file_form.cleaned_data['content']
-            if status := repository.update_file(path, updated_content):
-                if update_file_form.cleaned_data['republish']:
-                    context['content'] = updated_content
-                    context['owner'] = request.user
-                    PrivatePublish.publish_file(context)
-                messages.success(request, status)
-            return redirect('file', repo=repo, branch=repository.branch, path=path)
+            images = get_staged_images(request, updated_content)
+            try:
+                status = repository.update_file(path, updated_content, images=images,
+                                                sha=update_file_form.cleaned_data['sha'])
+            except CommitConflict as e:
+                messages.warning(request, str(e))  # the form is shown again with the entered content
+            else:
+                if status:
+                    clear_staged_images(request, list(images))
+                    if update_file_form.cleaned_data['republish']:
+                        context['content'] = updated_content
+                        context['owner'] = request.user
+                        PrivatePublish.publish_file(context)
+                    messages.success(request, status)
+                return redirect('file', repo=repo, branch=repository.branch, path=path)
     else:
+        contents = repository.get_contents(path, repository.branch)
         update_file_form = UpdateFileForm(data={
             'filename': path,
-            'content': repository.get_contents(path, repository.branch).decoded_content.decode('UTF-8'),
+            'content': contents.decoded_content.decode('UTF-8'),
+            'sha': contents.sha,
         })
     context['form'] = update_file_form
     return render(request, 'edit_file.html', context)
@@ -233,12 +388,27 @@ class BaseRepoView(LoginRequiredMixin, TemplateView):
 
     def post(self, request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
         """POST request handler to change current branch"""
-        if request.POST.get('selected_branch', False):
-            self.branch = request.POST.get('selected_branch')
-            self.repo.save_current_branch(request, self.branch)
+        if branch := request.POST.get('selected_branch', '').strip():
+            if self.repo.has_branch(branch):
+                self.branch = branch
+                self.repo.save_current_branch(request, self.branch)
+            else:
+                messages.warning(request, f"The '{self.repo.name}' repository doesn't have the '{branch}' branch")
         return self.get(request, *args, **kwargs)
 
-    def _add_file_contents(self, context: dict, path: str) -> None:
+    def _add_fragment_key(self, context: dict, sha: str) -> None:
+        """Add the key of cached template fragments to context, see markhub.templatetags.fragments
+
+        Args:
+            context (dict): template context
+            sha (str): commit SHA of the directory or blob SHA of the file the page shows
+        """
+        # the session branch of links and the branch of the url may differ
+        context['fragment_key'] = '{username}/{repo}/{branch}/{view_branch}@{sha}:{path}'.format(
+            **context, view_branch=self.branch, sha=sha
+        )
+
+    def _add_file_contents(self, context: dict, path: str) -> str:
         """Add file contents to context
 
         Args:
@@ -247,10 +417,14 @@ class BaseRepoView(LoginRequiredMixin, TemplateView):
 
         Raises:
             Http404: if file not found in repository
+
+        Returns:
+            str: file blob SHA
         """
         try:
             contents = self.repo.get_contents(path, context['branch'])
             context['contents'] = contents.decoded_content.decode('UTF-8')
+            context['toc'] = mark_safe(get_toc(context['contents']))
             context['html_url'] = contents.html_url
             if context.get('private'):
                 context['published'] = PrivatePublish.lookup_published_file(context)
@@ -265,6 +439,13 @@ class BaseRepoView(LoginRequiredMixin, TemplateView):
             context['decode_error'] = True
             context['contents'] = f"Unicode decode error during openning {self.path}"
             logger.error(context['contents'])
+        rendered, _ = cached_markdownify(context['contents'])
+        parent = str(PurePosixPath(path).parent)
+        context['rendered'] = mark_safe(rewrite_relative_images(
+            rendered, context['username'], context['repo'], context['branch'], '' if parent == '.' else parent
+        ))
+        context['has_math'] = has_math(rendered)
+        return contents.sha
 
     def _add_file_last_update(self, context: dict, path: str) -> Optional[datetime]:
         """Add file last update datetime to context
@@ -295,9 +476,10 @@ class RepoView(BaseRepoView):
     def get_context_data(self, **kwargs: Any) -> Dict[str, Any]:
         """Get context data for repository view"""
         context = super().get_context_data(**kwargs)
-        context['last_update'] = self.repo.handler.get_commit(self.branch).commit.committer.date
+        sha, context['last_update'] = self.repo.get_last_commit(self.branch)
+        self._add_fragment_key(context, sha)
         if not self.path:
-            contents = self.repo.handler.get_contents('', self.branch)
+            contents = self.repo.get_contents('', self.branch)
             readme_file = sorted([
                 item.name
                 for item in contents
@@ -308,7 +490,7 @@ class RepoView(BaseRepoView):
                 self._add_file_contents(context, context['readme_file'])
         else:
             try:
-                contents = self.repo.handler.get_dir_contents(self.path, self.branch)
+                contents = self.repo.get_dir_contents(self.path, self.branch)
             except (UnknownObjectException, GithubException) as e:
                 log_error_with_404(f"Path not found - {e}")
         if isinstance(contents, list):
@@ -316,12 +498,65 @@ class RepoView(BaseRepoView):
             context['repo_contents'] = contents
         elif contents:
             context['repo_contents'] = [contents]
+        last_commits = {}
+        if isinstance(contents, list):
+            last_commits = self.repo.get_last_commits(self.path, self.branch, contents)
+            # the listing is shown without the commit column until the background walk fills the cache
+            context['last_commits_pending'] = last_commits is None
+            last_commits = last_commits or {}
         for content in contents:
             extension = Path(content.name).suffix[1:]
             content.icon = f'bi-filetype-{extension}' if extension in FILETYPE_EXTENSIONS else 'bi-file-earmark'
+            content.last_commit = last_commits.get(content.name)
+            content.markdown = content.type != 'dir' and content.name.lower().endswith(MARKDOWN_SUFFIX)
+        if context['private']:
+            self._add_publish_times(context)
         context['html_url'] = f'{self.repo.handler.html_url}/tree/{self.branch}/{self.path if self.path else ""}'
         return context
 
+    def _add_publish_times(self, context: dict) -> None:
+        """Add publish times of the listed markdown files to context with one query
+
+        Args:
+            context (dict): template context
+        """
+        markdown_files = [content for content in context.get('repo_contents', []) if content.markdown]
+        # the listing shows the branch of the url, the session branch of links may differ
+        context['publish_times'] = PrivatePublish.lookup_publish_times(
+            {**context, 'branch': self.branch}, [content.path for content in markdown_files]
+        )
+        for content in markdown_files:
+            content.published = context['publish_times'].get(content.path)
+
+
+class SearchView(BaseRepoView):
+    """Repository full-text search view"""
+    template_name = 'search.html'
+
+    def get_context_data(self, **kwargs: Any) -> Dict[str, Any]:
+        """Get context data for search view"""
+        context = super().get_context_data(**kwargs)
+        context['branch'] = self.branch
+        context['query'] = self.request.GET.get('q', '').strip()
+        context['search_index'] = SearchIndex.lookup_index(context)
+        if context['query'] and context['search_index']:
+            started = perf_counter()
+            context['results'] = search(context['search_index'], context['query'])
+            context['search_time'] = (perf_counter() - started) * 1000
+        return context
+
+    def post(self, request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+        """POST request handler to build or update the search index"""
+        if request.POST.get('update_index', False):
+            try:
+                stats = update_search_index(self.repo.handler, self.branch)
+                messages.success(request, f'Search index of {self.branch} was updated: {stats}')
+            except GithubException as e:
+                logger.error(f"Search index was not updated - {e}")
+                messages.warning(request, f'Error was happened during indexing {self.branch}')
+            return redirect('search', repo=self.repo.name, branch=self.branch)
+        return super().post(request, *args, **kwargs)
+
 
 class FileView(BaseRepoView):
     """Repository file view"""
@@ -330,14 +565,14 @@ class FileView(BaseRepoView):
     def get_context_data(self, **kwargs: Any) -> Dict[str, Any]:
         """Get context data for file view"""
         context = super().get_context_data(**kwargs)
-        self._add_file_contents(context, self.path)
+        self._add_fragment_key(context, self._add_file_contents(context, self.path))
         self._add_file_last_update(context, self.path)
         return context
 
 class ShareView(TemplateView):
     """ Share page view """
     template_name = 'share.html'
-    GITHUB_USERCONTENT_TEMPLATE = 'https://raw.githubusercontent.com/{username}/{repo}/{branch}/{path}'
+    GITHUB_USERCONTENT_TEMPLATE = GITHUB_RAW_URL + '/{username}/{repo}/{branch}/{path}'
     GITHUB_URL_TEMPLATE = 'https://github.com/{username}/{repo}//blob/{branch}/{path}'
 
     def _add_file_content_and_toc(self, context: dict) -> Tuple[str, str]:
@@ -348,30 +583,52 @@ class ShareView(TemplateView):
         """
         content = ''
         if shared_file := PrivatePublish.lookup_published_file(context):
+            admit_share(self.request, '{username}/{repo}'.format(**context), cached=True)
             context['contents'] = mark_safe(shared_file.content)
             context['toc'] = mark_safe(shared_file.toc)
             context['private'] = True
         else:
             usercontent_url = ShareView.GITHUB_USERCONTENT_TEMPLATE.format(**context)
-            if cache.has_key(usercontent_url):
-                context['contents'], context['toc'] = cache.get(usercontent_url)    
+            cached = cache.get(usercontent_url)  # () for files not found in GitHub
+            cache_stats.hit('share', cached is not None)
+            admit_share(self.request, '{username}/{repo}'.format(**context), cached=cached is not None)
+            if cached == ():
+                raise Http404(f"Url not found - {usercontent_url}")
+            if cached is not None:
+                context['contents'], context['toc'] = cached
             else: 
                 try:
-                    content = urlopen(usercontent_url).read().decode('utf-8')
-                except HTTPError:
+                    with timed('github', GITHUB_DURATION, method='GET', endpoint='raw'):
+                        content = urlopen(usercontent_url).read().decode('utf-8')
+                except HTTPError as e:
+                    if e.code == 404:
+                        cache.set(usercontent_url, (), SHARE_NOT_FOUND_CACHE_TIMEOUT)
                     log_error_with_404(f"Url not found - {usercontent_url}")
                 except UnicodeDecodeError:
                     context['decode_error'] = True
                     context['contents'] = f"Unicode decode error during openning {context['path']}"
                     logger.error(context['contents'])
-                context['contents'], context['toc'] = (mark_safe(x) for x in markdownify(content))
+                context['contents'], context['toc'] = (mark_safe(x) for x in cached_markdownify(content))
                 if content:
                     cache.add(usercontent_url, (context['contents'], context['toc']))
             context['html_url'] = ShareView.GITHUB_URL_TEMPLATE.format(**context)
 
+    def get(self, request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+        """GET request handler answering requests which are not admitted with 429 or 503"""
+        try:
+            return super().get(request, *args, **kwargs)
+        except Throttled as e:
+            return e.response()
+
     def get_context_data(self, **kwargs: Any) -> Dict[str, Any]:
         """Get context data for share page view"""
         context = super().get_context_data(**kwargs)
         if all(x in context for x in ('username', 'repo', 'branch', 'path')):
             self._add_file_content_and_toc(context)
+            context['has_math'] = has_math(context['contents'])
+            parent = str(PurePosixPath(context['path']).parent)
+            context['contents'] = mark_safe(rewrite_relative_images(
+                context['contents'], context['username'], context['repo'], context['branch'],
+                '' if parent == '.' else parent
+            ))
         return context
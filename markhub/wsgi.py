@@ -9,8 +9,13 @@ https://docs.djangoproject.com/en/3.2/howto/deployment/wsgi/
 
 import os
 
+from django.conf import settings
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'markhub.settings')
 
 application = get_wsgi_application()
+
+if settings.WARM_UP:
+    from markhub.services.warmup import warm_up
+    warm_up()
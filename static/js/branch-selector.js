@@ -0,0 +1,42 @@
+// branch selector typeahead: branches are searched on the server while typing
+(function() {
+    var input = document.getElementById("branch_selector");
+    if (!input || input.disabled) {
+        return;
+    }
+    var options = document.getElementById(input.getAttribute("list"));
+    var timer = null;
+    var lastQuery = null;
+
+    function search() {
+        var query = input.value === input.defaultValue ? "" : input.value.trim();
+        if (query === lastQuery) {
+            return;
+        }
+        lastQuery = query;
+        fetch(input.dataset.url + "?q=" + encodeURIComponent(query), {credentials: "same-origin"})
+            .then(function(response) { return response.ok ? response.json() : {branches: []}; })
+            .then(function(data) {
+                if (query !== lastQuery) {
+                    return;
+                }
+                options.innerHTML = "";
+                data.branches.forEach(function(branch) {
+                    var option = document.createElement("option");
+                    option.value = branch;
+                    options.appendChild(option);
+                });
+            });
+    }
+
+    input.addEventListener("focus", search);
+    input.addEventListener("input", function() {
+        clearTimeout(timer);
+        timer = setTimeout(search, 200);
+    });
+    input.addEventListener("change", function() {
+        if (input.value.trim() && input.value !== input.defaultValue) {
+            input.form.submit();
+        }
+    });
+})();
@@ -1,9 +1,29 @@
+// client timezone: stored in the tz cookie (IANA names are cookie-safe), so the server renders timestamps in it,
+// timestamps of pages rendered in another timezone (the first visit) are localised here
 (function () {
-  let dateTimeElement = document.getElementById("last-update");
-  if (dateTimeElement) {
-    const inputFormat = 'YYYY/MM/DD HH:mm:ss ZZ';
-    const outputFormat = 'YYYY/MM/DD HH:mm:ss [GMT] Z';
-    const zone = moment.tz.guess();
-    dateTimeElement.innerText = moment(dateTimeElement.innerText, inputFormat).tz(zone).format(outputFormat);
+  var zone = window.Intl && Intl.DateTimeFormat().resolvedOptions().timeZone;
+  if (!zone || zone === document.documentElement.dataset.timezone) {
+    return;
   }
-  })();
+  document.cookie = "tz=" + zone + "; path=/; max-age=31536000; samesite=lax";
+
+  function pad(number) {
+    return (number < 10 ? "0" : "") + number;
+  }
+
+  // the server formats: Y/m/d H:i, with data-seconds Y/m/d H:i:s GMT O
+  document.querySelectorAll("time[datetime]").forEach(function (element) {
+    var date = new Date(element.getAttribute("datetime"));
+    if (isNaN(date)) {
+      return;
+    }
+    var text = date.getFullYear() + "/" + pad(date.getMonth() + 1) + "/" + pad(date.getDate()) + " " +
+      pad(date.getHours()) + ":" + pad(date.getMinutes());
+    if (element.hasAttribute("data-seconds")) {
+      var offset = -date.getTimezoneOffset();
+      text += ":" + pad(date.getSeconds()) + " GMT " + (offset < 0 ? "-" : "+") +
+        pad(Math.floor(Math.abs(offset) / 60)) + pad(Math.abs(offset) % 60);
+    }
+    element.textContent = text;
+  });
+})();